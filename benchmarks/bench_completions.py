@@ -0,0 +1,69 @@
+"""
+``LevelParser.get_completions()`` with 10,000 custom levels, alongside the
+linear scan that it replaced, and ``LogLevel.shell_complete()`` with and
+without a ``completion_limit``
+"""
+
+from __future__ import annotations
+from collections.abc import Callable, Iterator
+from harness import benchmark
+from click_loglevel.click import LogLevel
+from click_loglevel.core import LevelParser
+
+NLEVELS = 10_000
+PREFIXES = ["i", "subsys0420", "zzz"]
+
+
+def make_parser() -> LevelParser:
+    return LevelParser(extra={f"SUBSYS{i:05d}": 100 + i for i in range(NLEVELS)})
+
+
+def linear_completions(parser: LevelParser, incomplete: str) -> Iterator[str]:
+    # The pre-index implementation of `get_completions()`
+    incomplete = incomplete.upper()
+    for lv in parser.levels:
+        if lv.startswith(incomplete):
+            yield lv
+
+
+def completer(
+    func: Callable[[LevelParser, str], Iterator[str]], prefix: str
+) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        parser = make_parser()
+        return lambda: list(func(parser, prefix))
+
+    return setup
+
+
+for prefix in PREFIXES:
+    benchmark(f"completions[10k,{prefix!r}]")(
+        completer(LevelParser.get_completions, prefix)
+    )
+    benchmark(f"completions[10k,{prefix!r},linear-scan]")(
+        completer(linear_completions, prefix)
+    )
+
+
+def shell_completer(
+    prefix: str, limit: int | None, with_help: bool
+) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        lltype = LogLevel(
+            extra={f"SUBSYS{i:05d}": 100 + i for i in range(NLEVELS)},
+            completion_limit=limit,
+            completion_help=with_help,
+        )
+        return lambda: lltype.shell_complete(None, None, prefix)  # type: ignore[arg-type]
+
+    return setup
+
+
+for prefix in ["", "subsys0"]:
+    benchmark(f"shell_complete[10k,{prefix!r}]")(shell_completer(prefix, None, False))
+    benchmark(f"shell_complete[10k,{prefix!r},help]")(
+        shell_completer(prefix, None, True)
+    )
+    benchmark(f"shell_complete[10k,{prefix!r},limit=50,help]")(
+        shell_completer(prefix, 50, True)
+    )
@@ -0,0 +1,43 @@
+"""``load_level_config()`` on a large INI file, with & without the disk cache"""
+
+from __future__ import annotations
+from collections.abc import Callable
+from pathlib import Path
+import tempfile
+from harness import benchmark
+from click_loglevel.config import load_level_config
+from click_loglevel.core import LevelParser
+
+LOGGERS = 5000
+
+
+def make_config(dirpath: Path) -> Path:
+    path = dirpath / "levels.ini"
+    with path.open("w", encoding="utf-8") as fp:
+        print("[logger_root]\nlevel = INFO\n", file=fp)
+        for i in range(LOGGERS):
+            print(f"[logger_l{i}]\nqualname = app.mod{i}\nlevel = DEBUG\n", file=fp)
+    return path
+
+
+def loader(cached: bool) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        # Removed when `run()` is garbage-collected at exit
+        tmp = tempfile.TemporaryDirectory()
+        tmpdir = Path(tmp.name)
+        path = make_config(tmpdir)
+        cache_dir = tmpdir / "cache" if cached else None
+        parser = LevelParser()
+        load_level_config(parser, path, cache_dir)
+
+        def run() -> object:
+            assert tmp
+            return load_level_config(parser, path, cache_dir)
+
+        return run
+
+    return setup
+
+
+benchmark(f"load_level_config[{LOGGERS} loggers,uncached]", repeat=3)(loader(False))
+benchmark(f"load_level_config[{LOGGERS} loggers,cached]", repeat=3)(loader(True))
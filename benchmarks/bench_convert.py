@@ -0,0 +1,48 @@
+"""``LogLevel.convert()`` and ``AsyncLogLevel.convert()``"""
+
+from __future__ import annotations
+from collections.abc import Callable
+from typing import Any
+import asyncclick
+import click
+from harness import benchmark
+from click_loglevel import LogLevel
+from click_loglevel.asyncclick import AsyncLogLevel
+
+INPUTS = {
+    "name": "info",
+    "int": "15",
+    "invalid": "nosuchlevel",
+}
+
+
+def converter(
+    make: Callable[[], Any], errtype: type[Exception], value: str
+) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        lltype = make()
+
+        def run() -> object:
+            try:
+                return lltype.convert(value, None, None)
+            except errtype:
+                return None
+
+        return run
+
+    return setup
+
+
+for kind, value in INPUTS.items():
+    benchmark(f"LogLevel.convert[{kind}]")(
+        converter(LogLevel, click.BadParameter, value)
+    )
+    benchmark(f"AsyncLogLevel.convert[{kind}]")(
+        converter(AsyncLogLevel, asyncclick.BadParameter, value)
+    )
+    benchmark(f"LogLevel.convert[{kind},cache]")(
+        converter(lambda: LogLevel(cache_size=128), click.BadParameter, value)
+    )
+    benchmark(f"LogLevel.convert[{kind},level_info]")(
+        converter(lambda: LogLevel(level_info=True), click.BadParameter, value)
+    )
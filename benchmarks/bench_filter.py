@@ -0,0 +1,51 @@
+"""``LoggerLevelFilter`` compared with a linear scan of the same rules"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import logging
+from harness import benchmark
+from click_loglevel.loggers import LoggerLevelFilter
+
+RULES = {
+    **{f"thirdparty{i}.sub": logging.WARNING for i in range(50)},
+    "app": logging.DEBUG,
+    "": logging.INFO,
+}
+
+NAMES = ["app.db.pool", "thirdparty25.sub.conn", "unmatched.logger"]
+
+
+class LinearFilter(logging.Filter):
+    def __init__(self, rules: dict[str, int]) -> None:
+        super().__init__()
+        # Longest prefixes first, so that the first match wins
+        self.rules = sorted(rules.items(), key=lambda r: -len(r[0]))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        name = record.name
+        for prefix, level in self.rules:
+            if not prefix or name == prefix or name.startswith(prefix + "."):
+                return record.levelno >= level
+        return True
+
+
+def filtering(
+    make: Callable[[dict[str, int]], logging.Filter],
+) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        flt = make(RULES)
+        records = [
+            logging.LogRecord(name, logging.INFO, __file__, 1, "msg", None, None)
+            for name in NAMES
+        ]
+
+        def run() -> object:
+            return [flt.filter(r) for r in records]
+
+        return run
+
+    return setup
+
+
+benchmark("LoggerLevelFilter.filter[52 rules]")(filtering(LoggerLevelFilter))
+benchmark("LinearFilter.filter[52 rules]")(filtering(LinearFilter))
@@ -0,0 +1,75 @@
+"""
+Handling a batch of 100 requests that each make ten ``debug()`` calls and one
+``info()`` call, with the logger at ``INFO``, at ``DEBUG`` for everything
+("global DEBUG"), at ``INFO`` with a ``LevelOverride`` enabling ``DEBUG`` for
+one request in a hundred ("per-task DEBUG"), and at ``INFO`` while an override
+for another logger is entered ("override elsewhere"), which should leave the
+benchmarked logger's ``isEnabledFor()`` unwrapped
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import logging
+import os
+from harness import benchmark
+from click_loglevel.loggers import LevelOverride
+
+LOGGER = "bench.override"
+NREQUESTS = 100
+
+
+def make_logger(level: int) -> logging.Logger:
+    logger = logging.getLogger(LOGGER)
+    if not logger.handlers:
+        handler = logging.StreamHandler(open(os.devnull, "w"))
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+        )
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+    return logger
+
+
+def handle(logger: logging.Logger, i: int) -> None:
+    for j in range(10):
+        logger.debug("request %d: step %d", i, j)
+    logger.info("request %d: done", i)
+
+
+def requests(
+    level: int, override_every: int | None = None
+) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        logging.disable(logging.NOTSET)
+        logger = make_logger(level)
+
+        def run() -> None:
+            for i in range(NREQUESTS):
+                if override_every is not None and i % override_every == 0:
+                    with LevelOverride(logging.DEBUG, LOGGER):
+                        handle(logger, i)
+                else:
+                    handle(logger, i)
+
+        return run
+
+    return setup
+
+
+def requests_override_elsewhere() -> Callable[[], object]:
+    logging.disable(logging.NOTSET)
+    logger = make_logger(logging.INFO)
+
+    def run() -> None:
+        with LevelOverride(logging.DEBUG, "bench.elsewhere"):
+            for i in range(NREQUESTS):
+                handle(logger, i)
+
+    return run
+
+
+benchmark("requests[INFO]")(requests(logging.INFO))
+benchmark("requests[global DEBUG]")(requests(logging.DEBUG))
+benchmark("requests[per-task DEBUG,1%]")(requests(logging.INFO, 100))
+benchmark("requests[INFO,override elsewhere]")(requests_override_elsewhere)
@@ -0,0 +1,54 @@
+"""Construction of ``LevelParser`` and rendering of its metavar"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import click
+from harness import benchmark
+from click_loglevel import LogLevel
+from click_loglevel.core import LevelParser
+
+SIZES = [0, 100, 10_000]
+
+
+def extra_levels(n: int) -> dict[str, int]:
+    return {f"SUBSYS{i:05d}": 100 + i for i in range(n)}
+
+
+def constructor(n: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        extra = extra_levels(n)
+        return lambda: LevelParser(extra)
+
+    return setup
+
+
+def metavar(n: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        lltype = LogLevel(extra_levels(n))
+        param = click.Option(["--log-level"], type=lltype)
+        return lambda: lltype.get_metavar(param)
+
+    return setup
+
+
+for n in SIZES:
+    benchmark(f"LevelParser.__init__[{n}]")(constructor(n))
+    benchmark(f"LogLevel.get_metavar[{n}]")(metavar(n))
+
+
+@benchmark("LevelParser.get_completions[standard,'']")
+def completions_standard() -> Callable[[], object]:
+    parser = LevelParser()
+    return lambda: list(parser.get_completions(""))
+
+
+@benchmark("LevelParser.__init__[10000,abbrev]")
+def constructor_abbrev() -> Callable[[], object]:
+    extra = extra_levels(10_000)
+    return lambda: LevelParser(extra, abbrev=True)
+
+
+@benchmark("LevelParser.resolve[10000,abbrev,prefix]")
+def resolve_prefix() -> Callable[[], object]:
+    parser = LevelParser(extra_levels(10_000), abbrev=True)
+    return lambda: parser.resolve("subsys0420")
@@ -0,0 +1,64 @@
+"""
+Time to log a burst of DEBUG records with a slow handler attached directly to
+the logger vs. behind ``QueueLogging``, including draining the queue
+
+``SlowHandler`` stands in for a file or socket handler whose writes take
+100us; it sleeps rather than spins so that, like real I/O, it releases the GIL
+while waiting.  Between log calls, the caller waits on its own I/O for as long
+again, which is the time that the listener thread can use to emit the records.
+Each timed run starts a ``QueueLogging``, logs the burst, and stops it, so
+records still queued at the end of the burst count against the queued case.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import logging
+import time
+from harness import benchmark
+from click_loglevel.loggers import QueueLogging
+
+LATENCY = 100e-6
+BURST = 20
+
+
+class SlowHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+        time.sleep(LATENCY)
+
+
+def heavy_debug(queued: bool) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        name = f"bench.queue_logging.{'queued' if queued else 'blocking'}"
+        logger = logging.getLogger(name)
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(SlowHandler())
+
+        def burst() -> None:
+            for i in range(BURST):
+                logger.debug("request %d took %.3f s", i, 0.125)
+                time.sleep(LATENCY)
+
+        if queued:
+
+            def run() -> object:
+                with QueueLogging(name):
+                    burst()
+                return None
+
+        else:
+
+            def run() -> object:
+                burst()
+                return None
+
+        return run
+
+    return setup
+
+
+benchmark(f"Logger.debug x{BURST}[slow handler,blocking]", repeat=3)(heavy_debug(False))
+benchmark(f"Logger.debug x{BURST}[slow handler,QueueLogging]", repeat=3)(
+    heavy_debug(True)
+)
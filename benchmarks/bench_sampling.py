@@ -0,0 +1,80 @@
+"""
+``SamplingFilter`` compared with a filter calling ``random.random()`` for each
+record, on a batch of ``DEBUG`` records sampled at 1%, and the cost of
+creating & emitting the same batch of records at full ``DEBUG`` and at 1%
+sampling
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import logging
+import os
+import random
+from harness import benchmark
+from click_loglevel.loggers import SamplingFilter
+
+NRECORDS = 1000
+LOGGER = "bench.sampling"
+
+
+class RandomFilter(logging.Filter):
+    def __init__(self, level: int, base: int, rate: float) -> None:
+        super().__init__()
+        self.level = level
+        self.base = base
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.level <= record.levelno < self.base:
+            return True
+        return random.random() < self.rate
+
+
+def filtering(make: Callable[[], logging.Filter]) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        flt = make()
+        records = [
+            logging.LogRecord(LOGGER, logging.DEBUG, __file__, 1, "msg", None, None)
+            for _ in range(NRECORDS)
+        ]
+
+        def run() -> object:
+            return [flt.filter(r) for r in records]
+
+        return run
+
+    return setup
+
+
+def logging_debug(sampled: bool) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        logger = logging.getLogger(LOGGER)
+        logger.propagate = False
+        logger.handlers.clear()
+        handler = logging.StreamHandler(open(os.devnull, "w"))
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+        )
+        if sampled:
+            handler.addFilter(SamplingFilter(logging.DEBUG, logging.INFO, 1, 100))
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        logging.disable(logging.NOTSET)
+
+        def run() -> None:
+            for i in range(NRECORDS):
+                logger.debug("record %d", i)
+
+        return run
+
+    return setup
+
+
+benchmark("SamplingFilter.filter[1%]")(
+    filtering(lambda: SamplingFilter(logging.DEBUG, logging.INFO, 1, 100))
+)
+benchmark("RandomFilter.filter[1%]")(
+    filtering(lambda: RandomFilter(logging.DEBUG, logging.INFO, 0.01))
+)
+benchmark("Logger.debug[1000 records,full]")(logging_debug(False))
+benchmark("Logger.debug[1000 records,sampled 1%]")(logging_debug(True))
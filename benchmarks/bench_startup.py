@@ -0,0 +1,40 @@
+"""End-to-end startup of the scripts in ``test/data/``"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import os
+from harness import benchmark, run_script
+
+SCRIPTS = [
+    "dict-extra.py",
+    "list-extra.py",
+    "dict-extra-async.py",
+    "list-extra-async.py",
+]
+
+
+def normal(script: str) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        return lambda: run_script(script, "--log-level", "INFO")
+
+    return setup
+
+
+def completing(script: str) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        env = dict(os.environ)
+        # Click 8.2+ replaces dots in the program name with underscores when
+        # forming the variable name; earlier versions do not.
+        for stem in [script, script.replace(".", "_")]:
+            var = "_" + stem.replace("-", "_").upper() + "_COMPLETE"
+            env[var] = "bash_complete"
+        env["COMP_WORDS"] = f"{script} --log-level N"
+        env["COMP_CWORD"] = "2"
+        return lambda: run_script(script, env=env)
+
+    return setup
+
+
+for script in SCRIPTS:
+    benchmark(f"startup[{script}]", repeat=3)(normal(script))
+    benchmark(f"startup[{script},complete]", repeat=3)(completing(script))
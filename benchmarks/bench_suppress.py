@@ -0,0 +1,53 @@
+"""
+Suppressed ``Logger.debug()`` calls with & without ``apply_level(floor=True)``
+
+The "cold" benchmarks clear the logger's ``isEnabledFor()`` cache before every
+call, as happens to every logger whenever any logger's level is changed; the
+"warm" ones measure the steady state.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import logging
+from types import SimpleNamespace
+from harness import benchmark
+from click_loglevel import LogLevel
+from click_loglevel.loggers import apply_level
+
+LOGGER = "bench.suppress.deeply.nested.logger"
+
+
+def suppressed(
+    applied: bool, cold: bool
+) -> Callable[[], Callable[[], Callable[[], object]]]:
+    def setup() -> Callable[[], object]:
+        logger = logging.getLogger(LOGGER)
+        logging.getLogger("bench").setLevel(logging.INFO)
+        logging.disable(logging.NOTSET)
+        if applied:
+            ctx = SimpleNamespace(resilient_parsing=False)
+            param = SimpleNamespace(type=LogLevel())
+            apply_level("bench", floor=True)(ctx, param, logging.INFO)
+        cache = logger._cache  # type: ignore[attr-defined]
+
+        if cold:
+
+            def run() -> object:
+                cache.clear()
+                return logger.debug("suppressed %s", "message")
+
+        else:
+
+            def run() -> object:
+                return logger.debug("suppressed %s", "message")
+
+        return run
+
+    return setup
+
+
+for applied in [False, True]:
+    for cold in [False, True]:
+        label = "apply_level" if applied else "setLevel"
+        temp = "cold" if cold else "warm"
+        benchmark(f"Logger.debug[suppressed,{label},{temp}]")(suppressed(applied, cold))
@@ -0,0 +1,44 @@
+"""
+Parsing & completion from several threads sharing one ``LevelParser``
+
+On a free-threaded build of Python, the multithreaded benchmarks should take
+about as long as the single-threaded one, as the parser's lookups take no
+locks; with the GIL, they take about ``THREADS`` times as long.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from harness import benchmark
+from click_loglevel.core import LevelParser
+
+THREADS = 4
+OPS = 1000
+
+
+def threaded(nthreads: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        parser = LevelParser(extra={"VERBOSE": 15, "NOTICE": 25}, abbrev=True)
+        # Not shut down; the idle worker threads exit with the process
+        pool = ThreadPoolExecutor(max_workers=nthreads)
+
+        def work() -> None:
+            for _ in range(OPS):
+                parser.resolve("verbose")
+                parser.resolve("25")
+                parser.parse("warn")
+                for _ in parser.get_completions("n"):
+                    pass
+
+        def run() -> object:
+            for fut in [pool.submit(work) for _ in range(nthreads)]:
+                fut.result()
+            return None
+
+        return run
+
+    return setup
+
+
+benchmark("LevelParser.threaded[1 thread]")(threaded(1))
+benchmark(f"LevelParser.threaded[{THREADS} threads]")(threaded(THREADS))
@@ -0,0 +1,53 @@
+"""
+Minimal benchmark registry used by ``benchmarks/run.py``.
+
+A benchmark is a function decorated with ``@benchmark`` that performs any
+setup it needs and then returns a zero-argument callable; the callable is what
+gets timed.  Benchmark modules are the ``bench_*.py`` files in this directory.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+import subprocess
+import sys
+
+BENCH_DIR = Path(__file__).parent
+REPO_DIR = BENCH_DIR.parent
+DATA_DIR = REPO_DIR / "test" / "data"
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    #: Number of timing runs; the fastest is reported
+    repeat: int = 5
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str, repeat: int = 5
+) -> Callable[[Callable[[], Callable[[], object]]], Callable[[], Callable[[], object]]]:
+    def decorator(
+        func: Callable[[], Callable[[], object]],
+    ) -> Callable[[], Callable[[], object]]:
+        if name in REGISTRY:
+            raise ValueError(f"Duplicate benchmark name: {name!r}")
+        REGISTRY[name] = Benchmark(name=name, setup=func, repeat=repeat)
+        return func
+
+    return decorator
+
+
+def run_script(script: str, *args: str, env: dict[str, str] | None = None) -> None:
+    """Run one of the scripts in :file:`test/data/` in a fresh interpreter"""
+    subprocess.run(
+        [sys.executable, str(DATA_DIR / script), *args],
+        stdout=subprocess.DEVNULL,
+        env=env,
+        check=True,
+    )
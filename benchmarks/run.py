@@ -0,0 +1,130 @@
+"""
+Run the click-loglevel benchmark suite.
+
+Usage::
+
+    python benchmarks/run.py [-k SUBSTRING] [--save FILE] [--compare FILE]
+
+Each benchmark's best per-call time is printed and (by default) saved as JSON
+to ``benchmarks/results/<timestamp>-<commit>.json``.  Pass ``--compare`` with
+an earlier results file to print the change for each benchmark; the script
+exits with status 1 if any benchmark got slower by more than ``--threshold``
+percent.
+"""
+
+from __future__ import annotations
+import argparse
+from datetime import datetime, timezone
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from harness import BENCH_DIR, REGISTRY, REPO_DIR
+
+
+def load_benchmarks() -> None:
+    for path in sorted(BENCH_DIR.glob("bench_*.py")):
+        importlib.import_module(path.stem)
+
+
+def git_commit() -> str:
+    r = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=REPO_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    return r.stdout.strip() if r.returncode == 0 else "unknown"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run click-loglevel benchmarks")
+    parser.add_argument(
+        "-k", dest="pattern", help="Only run benchmarks whose names contain PATTERN"
+    )
+    parser.add_argument("--save", help="Write results to this file")
+    parser.add_argument(
+        "--no-save", action="store_true", help="Do not write a results file"
+    )
+    parser.add_argument("--compare", help="Compare against an earlier results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Slowdown (in percent) reported as a regression [default: 10]",
+    )
+    args = parser.parse_args()
+
+    load_benchmarks()
+    commit = git_commit()
+    results: dict[str, dict[str, float | int]] = {}
+    for name, bench in REGISTRY.items():
+        if args.pattern is not None and args.pattern not in name:
+            continue
+        timer = timeit.Timer(bench.setup())
+        number, _ = timer.autorange()
+        times = [t / number for t in timer.repeat(repeat=bench.repeat, number=number)]
+        results[name] = {
+            "best": min(times),
+            "mean": sum(times) / len(times),
+            "number": number,
+            "repeat": bench.repeat,
+        }
+        print(f"{name:50} {format_time(min(times)):>12}", flush=True)
+
+    if not args.no_save:
+        if args.save is not None:
+            outfile = args.save
+        else:
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            outdir = BENCH_DIR / "results"
+            outdir.mkdir(exist_ok=True)
+            outfile = str(outdir / f"{stamp}-{commit}.json")
+        with open(outfile, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "commit": commit,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "python": sys.version,
+                    "implementation": platform.python_implementation(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                fp,
+                indent=4,
+            )
+        print(f"Results saved to {outfile}")
+
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as fp:
+            old = json.load(fp)
+        print(f"\nComparison against {old['commit']} ({args.compare}):")
+        regressed = False
+        for name, res in results.items():
+            try:
+                before = old["results"][name]["best"]
+            except KeyError:
+                print(f"{name:50} {'(new)':>12}")
+                continue
+            change = (res["best"] - before) / before * 100
+            mark = ""
+            if change > args.threshold:
+                mark = "  REGRESSION"
+                regressed = True
+            print(f"{name:50} {change:+11.1f}%{mark}")
+        return 1 if regressed else 0
+    return 0
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,10 +17,19 @@ Visit <https://github.com/jwodder/click-loglevel> for more information.
 """
 
 from __future__ import annotations
-from collections.abc import Iterable, Mapping
-import click
-from click.shell_completion import CompletionItem
-from .core import LevelParser
+
+# `typing` is comparatively expensive to import, and the only thing needed
+# from it here is a constant that type checkers special-case by name.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from typing import Any
+    from .asyncclick import AsyncLevelConfigFile as AsyncLevelConfigFile  # noqa: F401
+    from .asyncclick import AsyncLogLevel as AsyncLogLevel  # noqa: F401
+    from .asyncclick import AsyncLoggerLevels as AsyncLoggerLevels  # noqa: F401
+    from .click import LevelConfigFile, LoggerLevels, LogLevel
+    from .core import LevelInfo, LevelParser, SampledLevel
+    from .loggers import LoggerLevelPlan
 
 __version__ = "0.8.0.dev1"
 __author__ = "John Thorvald Wodder II"
@@ -28,47 +37,45 @@ __author_email__ = "click-loglevel@varonathe.org"
 __license__ = "MIT"
 __url__ = "https://github.com/jwodder/click-loglevel"
 
-__all__ = ["LogLevel"]
-
-
-class LogLevel(click.ParamType):
-    """
-    A Click parameter type that accepts the standard logging level names (case
-    insensitive) and converts them to their corresponding numeric values.  It
-    also accepts integer values and leaves them as-is.
-
-    Custom log levels can be added by passing them as the ``extra`` argument to
-    the constructor.  ``extra`` can be either an iterable of level names (in
-    which case the levels must have already been defined — typically at the
-    module level — by calling ``logging.addLevelName()``) or a mapping from
-    level names to their corresponding values.  All custom log levels will be
-    recognized case insensitively; if two different level names differ only in
-    case, the result is undefined.
-    """
+__all__ = [
+    "LevelConfigFile",
+    "LevelInfo",
+    "LevelParser",
+    "LogLevel",
+    "LoggerLevelPlan",
+    "LoggerLevels",
+    "SampledLevel",
+]
 
-    name = "log-level"
+# The public classes are only imported on first access so that `import
+# click_loglevel` by itself does not pull in click or asyncclick.
+_LAZY_ATTRS = {
+    "AsyncLogLevel": "asyncclick",
+    "AsyncLevelConfigFile": "asyncclick",
+    "AsyncLoggerLevels": "asyncclick",
+    "LevelConfigFile": "click",
+    "LevelInfo": "core",
+    "LevelParser": "core",
+    "LogLevel": "click",
+    "LoggerLevelPlan": "loggers",
+    "LoggerLevels": "click",
+    "SampledLevel": "core",
+}
 
-    def __init__(self, extra: Iterable[str] | Mapping[str, int] | None = None) -> None:
-        self.parser = LevelParser(extra)
 
-    def convert(
-        self, value: str | int, param: click.Parameter | None, ctx: click.Context | None
-    ) -> int:
-        try:
-            return int(value)
-        except ValueError:
-            assert isinstance(value, str)
-            try:
-                return self.parser.parse(value)
-            except KeyError:
-                self.fail(f"{value!r}: invalid log level", param, ctx)
+def __getattr__(name: str) -> Any:
+    try:
+        modname = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    # `importlib.import_module()` would add an import of `importlib` (which
+    # is not loaded at interpreter startup) and hide the submodule from
+    # `python -X importtime`.
+    module = __import__(f"{__name__}.{modname}", fromlist=[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
-    def get_metavar(
-        self, param: click.Parameter, ctx: click.Context | None = None  # noqa: U100
-    ) -> str:
-        return self.parser.metavar
 
-    def shell_complete(
-        self, _ctx: click.Context, _param: click.Parameter, incomplete: str
-    ) -> list[CompletionItem]:
-        return [CompletionItem(c) for c in self.parser.get_completions(incomplete)]
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -0,0 +1,157 @@
+"""
+Command-line utilities for click-loglevel
+
+Run ``python -m click_loglevel --help`` for details.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator, Sequence
+from importlib import import_module
+from typing import Any
+import click
+from . import __version__
+from .completion import SHELLS, completion_script
+from .control import send_level
+from .core import LevelParser, get_level_parser
+
+
+@click.group()
+@click.version_option(__version__, "-V", "--version", message="%(version)s")
+def main() -> None:
+    """Command-line utilities for click-loglevel"""
+    pass
+
+
+@main.command()
+@click.option(
+    "--shell", type=click.Choice(SHELLS), required=True, help="Shell to generate for"
+)
+@click.option("--prog", "prog_name", required=True, help="Name of the program")
+@click.option(
+    "--from",
+    "source",
+    metavar="MODULE:ATTR",
+    help=(
+        "Take the log level options and names from a Click command, a LogLevel"
+        " instance, or a LevelParser"
+    ),
+)
+@click.option(
+    "-o",
+    "--option",
+    "options",
+    multiple=True,
+    help=(
+        "Name of an option that takes a log level; can be given multiple times."
+        "  Defaults to --log-level, or to every log level option when --from"
+        " names a command."
+    ),
+)
+@click.option(
+    "-e",
+    "--extra",
+    multiple=True,
+    metavar="NAME=VALUE",
+    help="Custom log level to complete (can be given multiple times)",
+)
+def completion(
+    shell: str,
+    prog_name: str,
+    source: str | None,
+    options: tuple[str, ...],
+    extra: tuple[str, ...],
+) -> None:
+    """
+    Output a static shell completion script for log level options.
+
+    The script completes log level values from a list of names baked into it,
+    so that pressing TAB after a log level option does not have to start
+    Python.  Completion of anything else is passed on to the program's own
+    Click completion function, so the script should be sourced after that of
+    the program.
+    """
+    targets: list[tuple[Sequence[str], LevelParser]] = []
+    if source is not None:
+        obj = load_object(source)
+        if isinstance(obj, click.Command) or hasattr(obj, "params"):
+            targets.extend(
+                (opts, parser)
+                for opts, parser in command_targets(obj)
+                if not options or set(opts) & set(options)
+            )
+            if not targets:
+                raise click.UsageError(f"No log level options found in {source}")
+        else:
+            parser = (
+                obj if isinstance(obj, LevelParser) else getattr(obj, "parser", None)
+            )
+            if not isinstance(parser, LevelParser):
+                raise click.UsageError(
+                    f"{source} is not a command, LogLevel, or LevelParser"
+                )
+            targets.append((options or ("--log-level",), parser))
+    else:
+        extra_levels: dict[str, int] = {}
+        for e in extra:
+            name, _, value = e.partition("=")
+            try:
+                extra_levels[name] = int(value)
+            except ValueError:
+                raise click.BadParameter(
+                    f"{e!r}: expected NAME=VALUE", param_hint="--extra"
+                ) from None
+        targets.append((options or ("--log-level",), get_level_parser(extra_levels)))
+    click.echo(completion_script(shell, prog_name, targets), nl=False)
+
+
+@main.command("set-level")
+@click.option(
+    "--timeout",
+    type=float,
+    default=5,
+    show_default=True,
+    help="Seconds to wait for a reply",
+)
+@click.argument("socket_path", metavar="SOCKET", type=click.Path(dir_okay=False))
+@click.argument("level", required=False)
+def set_level(socket_path: str, level: str | None, timeout: float) -> None:
+    """
+    Change the log level of a running program.
+
+    Sends LEVEL to the level control socket at SOCKET of a program that uses
+    click_loglevel.control and prints the name of the program's new level.  If
+    LEVEL is omitted, the program's current level is printed instead.
+    """
+    try:
+        click.echo(send_level(socket_path, level, timeout=timeout))
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    except OSError as e:
+        raise click.ClickException(f"Could not connect to {socket_path}: {e}")
+
+
+def load_object(spec: str) -> Any:
+    modname, colon, attr = spec.partition(":")
+    if not colon or not attr:
+        raise click.BadParameter(f"{spec!r}: expected MODULE:ATTR", param_hint="--from")
+    obj: Any = import_module(modname)
+    for a in attr.split("."):
+        obj = getattr(obj, a)
+    return obj
+
+
+def command_targets(cmd: Any) -> Iterator[tuple[Sequence[str], LevelParser]]:
+    """
+    Yield the option names and ``LevelParser`` of every log level option in
+    ``cmd`` and (if it is a group) its subcommands
+    """
+    for param in cmd.params:
+        parser = getattr(param.type, "parser", None)
+        if isinstance(parser, LevelParser) and param.type.name == "log-level":
+            yield (param.opts + param.secondary_opts, parser)
+    for sub in getattr(cmd, "commands", {}).values():
+        yield from command_targets(sub)
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -0,0 +1,127 @@
+from __future__ import annotations
+from collections.abc import Callable, Sequence
+import logging
+from typing import Any, TypeVar
+import click
+from click.shell_completion import CompletionItem
+from .core import LogLevelMixin, verbosity_decorator
+from .loggers import LevelConfigFileMixin, LoggerLevelsMixin
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class LogLevel(LogLevelMixin, click.ParamType):
+    """
+    A Click parameter type that accepts the standard logging level names (case
+    insensitive) and converts them to their corresponding numeric values.  It
+    also accepts integer values and leaves them as-is.
+
+    Custom log levels can be added by passing them as the ``extra`` argument to
+    the constructor.  ``extra`` can be either an iterable of level names (in
+    which case the levels must have already been defined — typically at the
+    module level — by calling ``logging.addLevelName()``) or a mapping from
+    level names to their corresponding values.  All custom log levels will be
+    recognized case insensitively; if two different level names differ only in
+    case, the result is undefined.
+
+    If ``live`` is true, levels defined with ``logging.addLevelName()`` after
+    the parameter type is constructed are recognized as well.
+
+    If ``metavar_limit`` is set, at most that many level names are listed in
+    ``--help`` output, followed by a count of the remaining names.
+
+    If ``abbrev`` is true, any unambiguous prefix of a level name (e.g.,
+    ``deb`` for ``DEBUG``) is accepted as well.  ``aliases`` can be set to a
+    mapping from additional names to the level names they stand for;
+    ``click_loglevel.core.STANDARD_ALIASES`` maps ``WARN`` to ``WARNING`` and
+    ``FATAL`` to ``CRITICAL``.  Both are matched case insensitively.
+
+    If ``level_info`` is true, values are converted to ``LevelInfo`` objects
+    instead of plain integers.  A ``LevelInfo`` is an ``int`` subclass that
+    also carries the canonical name of the level.
+
+    If ``cache_size`` is set, conversion results (including failures) for up
+    to that many distinct raw values are kept in an LRU cache, which is
+    available as the ``cache`` attribute for inspecting its statistics.
+
+    If ``plugin_group`` is set, levels provided by installed distributions as
+    entry points in that group are recognized as well; see
+    ``click_loglevel.plugins``.  A plugin is only imported once its level is
+    first used.
+
+    If ``completion_limit`` is set, shell completion returns at most that many
+    level names, ranked with the standard levels first, then the names used
+    most often, then the rest in sorted order.  Usage counts come from
+    ``completion_usage``, a callable returning a mapping from uppercased level
+    names to counts; if it also has a ``record()`` method, as a
+    ``click_loglevel.usage.LevelUsage`` store does, each level name given for
+    the parameter is passed to it.  Without ``completion_usage``, the counts
+    collected by ``click_loglevel.instrument`` are used.  If
+    ``completion_help`` is true, each completion carries the numeric value of
+    its level as help text.
+
+    If ``sampling`` is true, a level can be followed by ``@`` and a sampling
+    rate, given as a percentage or a fraction (e.g., ``DEBUG@1%`` or
+    ``DEBUG@1/1000``), which is converted to a ``SampledLevel``: records at
+    the next level up and above are meant to be kept in full, and only the
+    given fraction of the records in between.  Pass
+    ``callback=click_loglevel.loggers.apply_level()`` to the option to apply
+    the sampling with a ``SamplingFilter``.
+    """
+
+    completion_item = CompletionItem
+
+
+class LoggerLevels(LoggerLevelsMixin, click.ParamType):
+    """
+    A Click parameter type that accepts a comma-separated list of
+    ``LOGGER=LEVEL`` entries (e.g., ``root=INFO,sqlalchemy=WARNING,app.db=DEBUG``)
+    and converts it to a ``LoggerLevelPlan``; call the plan's ``apply()``
+    method to set the levels on the corresponding loggers.  Levels are
+    recognized the same way as by ``LogLevel``, including custom levels passed
+    via ``extra``.  An entry without a logger name, or with a logger name of
+    ``root``, applies to the root logger.  ``live``, ``abbrev``, and ``aliases``
+    have the same meanings as for ``LogLevel``.
+    """
+
+    completion_item = CompletionItem
+
+
+class LevelConfigFile(LevelConfigFileMixin, click.ParamType):
+    """
+    A Click parameter type that takes the path to a TOML, INI, or JSON file of
+    per-logger levels (see ``click_loglevel.config``) and converts it to a
+    ``LoggerLevelPlan``.  Every level in the file is validated the same way as
+    by ``LogLevel``, including custom levels passed via ``extra``; ``live``,
+    ``abbrev``, and ``aliases`` have the same meanings as for ``LogLevel``.
+
+    Compiled files are cached on disk in ``cache_dir`` (default:
+    ``click_loglevel.config.default_cache_dir()``), with a single entry per
+    file that records its modification time and size, so that loading an
+    unchanged file does not parse it again.  Pass ``cache_dir=False`` to
+    disable the cache.
+    """
+
+    completion_item = CompletionItem
+
+
+def verbosity_options(
+    param: str = "log_level",
+    *,
+    default: int = logging.WARNING,
+    verbose: Sequence[str] = ("-v", "--verbose"),
+    quiet: Sequence[str] = ("-q", "--quiet"),
+) -> Callable[[F], F]:
+    """
+    Decorator that adds ``-v``/``--verbose`` and ``-q``/``--quiet`` counting
+    options to a command with a ``LogLevel`` option whose parameter name is
+    ``param``.  Each ``-v`` moves the level one step down and each ``-q`` one
+    step up through the levels recognized by the ``LogLevel`` (including any
+    custom levels), and the result is passed to the command as the value of
+    ``param``.  Stepping starts from the value given for ``param`` (or its
+    default) or, if it has neither, from ``default``.  The option names can be
+    changed with ``verbose`` and ``quiet``.
+
+    Apply this decorator below the command decorator, like ``click.option()``.
+    """
+    return verbosity_decorator(click, param, default, verbose, quiet)
@@ -0,0 +1,149 @@
+"""
+Generation of static shell completion scripts for log level options
+
+The generated scripts complete the values of log level options from a list of
+level names baked into the script itself, so that pressing TAB after such an
+option does not start a Python interpreter.  Completion of everything else is
+delegated to the completion function from the program's own Click-generated
+completion script, if it has been loaded; the static script should therefore be
+sourced after the Click one.
+"""
+
+from __future__ import annotations
+from collections.abc import Sequence
+import re
+import shlex
+from .core import LevelParser
+
+SHELLS = ("bash", "zsh", "fish")
+
+
+def completion_script(
+    shell: str, prog_name: str, targets: Sequence[tuple[Sequence[str], LevelParser]]
+) -> str:
+    """
+    Return a completion script for ``shell`` (``"bash"``, ``"zsh"``, or
+    ``"fish"``) for the program ``prog_name``.  ``targets`` is a sequence of
+    ``(option names, parser)`` pairs; the values of each option are completed
+    with the level names recognized by the corresponding ``LevelParser``.
+
+    :raises ValueError: if ``shell`` is not supported
+    """
+    if shell == "bash":
+        return _bash_script(prog_name, targets)
+    elif shell == "zsh":
+        return _zsh_script(prog_name, targets)
+    elif shell == "fish":
+        return _fish_script(prog_name, targets)
+    else:
+        raise ValueError(f"Unsupported shell: {shell!r}")
+
+
+def click_function_name(prog_name: str) -> str:
+    """
+    Return the name of the shell function that Click's bash & zsh completion
+    scripts define for ``prog_name``
+    """
+    safe_name = re.sub(r"\W*", "", prog_name.replace("-", "_"), flags=re.ASCII)
+    return f"_{safe_name}_completion"
+
+
+def _level_words(parser: LevelParser) -> str:
+    return " ".join(shlex.quote(name) for name in parser.sorted_names)
+
+
+def _bash_script(
+    prog_name: str, targets: Sequence[tuple[Sequence[str], LevelParser]]
+) -> str:
+    click_func = click_function_name(prog_name)
+    func = click_func.removesuffix("_completion") + "_loglevel_completion"
+    cases = "".join(
+        f"        {'|'.join(shlex.quote(o) for o in options)})\n"
+        f"            words=({_level_words(parser)})\n"
+        f"            ;;\n"
+        for options, parser in targets
+    )
+    return f"""\
+# Static completion of log levels for {prog_name}, generated by click-loglevel.
+# Source this after the Click completion script for {prog_name}.
+{func}() {{
+    local cur=${{COMP_WORDS[COMP_CWORD]}}
+    local prev=${{COMP_WORDS[COMP_CWORD-1]}}
+    local words=()
+    if [[ $prev == "=" && $COMP_CWORD -ge 2 ]]; then
+        prev=${{COMP_WORDS[COMP_CWORD-2]}}
+    elif [[ $cur == "=" ]]; then
+        cur=""
+    fi
+    case "$prev" in
+{cases}    esac
+    if (( ${{#words[@]}} )); then
+        COMPREPLY=($(compgen -W "${{words[*]}}" -- "${{cur^^}}"))
+        return 0
+    fi
+    if declare -F {click_func} >/dev/null; then
+        {click_func} "$@"
+    fi
+}}
+
+complete -o nosort -F {func} {shlex.quote(prog_name)}
+"""
+
+
+def _zsh_script(
+    prog_name: str, targets: Sequence[tuple[Sequence[str], LevelParser]]
+) -> str:
+    click_func = click_function_name(prog_name)
+    func = click_func.removesuffix("_completion") + "_loglevel_completion"
+    inline_cases = "".join(
+        f"        ({'|'.join(shlex.quote(o) for o in options)})=*)\n"
+        f"            compset -P '*='\n"
+        f"            compadd -M 'm:{{a-z}}={{A-Z}}' -- {_level_words(parser)}\n"
+        f"            return\n"
+        f"            ;;\n"
+        for options, parser in targets
+    )
+    cases = "".join(
+        f"        {'|'.join(shlex.quote(o) for o in options)})\n"
+        f"            compadd -M 'm:{{a-z}}={{A-Z}}' -- {_level_words(parser)}\n"
+        f"            return\n"
+        f"            ;;\n"
+        for options, parser in targets
+    )
+    return f"""\
+# Static completion of log levels for {prog_name}, generated by click-loglevel.
+# Source this after the Click completion script for {prog_name}.
+{func}() {{
+    case "$PREFIX" in
+{inline_cases}    esac
+    case "${{words[CURRENT-1]}}" in
+{cases}    esac
+    if (( $+functions[{click_func}] )); then
+        {click_func} "$@"
+    fi
+}}
+
+compdef {func} {shlex.quote(prog_name)}
+"""
+
+
+def _fish_script(
+    prog_name: str, targets: Sequence[tuple[Sequence[str], LevelParser]]
+) -> str:
+    lines = [
+        f"# Static completion of log levels for {prog_name}, generated by"
+        " click-loglevel.",
+        f"# Source this after the Click completion script for {prog_name}.",
+    ]
+    for options, parser in targets:
+        args = [f"complete -c {shlex.quote(prog_name)}"]
+        for opt in options:
+            if opt.startswith("--"):
+                args.append(f"-l {shlex.quote(opt[2:])}")
+            elif len(opt) == 2:
+                args.append(f"-s {shlex.quote(opt[1:])}")
+            else:
+                args.append(f"-o {shlex.quote(opt[1:])}")
+        args.append("-x -a " + shlex.quote(" ".join(parser.sorted_names)))
+        lines.append(" ".join(args))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,257 @@
+"""
+Loading per-logger levels from configuration files
+
+``load_level_config()`` reads the logger levels from a TOML, INI, or JSON
+file, validates each level with a ``LevelParser``, and returns a
+``LoggerLevelPlan``.  The recognized layouts are:
+
+- TOML & JSON: the ``logging.config.dictConfig()`` schema (``root.level`` and
+  ``loggers.<name>.level``) and/or a ``levels`` table mapping logger names
+  directly to levels
+
+- INI: the ``logging.config.fileConfig()`` schema (``[logger_root]`` and
+  ``[logger_*]`` sections with ``level`` & ``qualname`` keys) and/or a
+  ``[levels]`` section mapping logger names directly to levels
+
+Compiled results can be cached on disk, one entry per configuration file,
+recording the file's modification time and size (along with the parser's
+levels), so that loading an unchanged file just reads a small JSON document.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator
+import configparser
+from functools import lru_cache
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+from typing import Any
+from .core import LevelParser
+from .loggers import ROOT_NAME, LoggerLevelPlan
+
+#: Version of the on-disk cache format; bump when it changes
+CACHE_VERSION = 3
+
+TOML_SUFFIXES = (".toml",)
+INI_SUFFIXES = (".ini", ".cfg", ".conf")
+JSON_SUFFIXES = (".json",)
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the directory used for caching compiled level configurations:
+    :file:`click-loglevel/` under ``$XDG_CACHE_HOME`` or :file:`~/.cache`
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(base, "click-loglevel")
+
+
+def load_level_config(
+    parser: LevelParser,
+    path: str | os.PathLike[str],
+    cache_dir: str | os.PathLike[str] | None = None,
+) -> LoggerLevelPlan:
+    """
+    Read the logger levels from the configuration file at ``path`` and
+    resolve them with ``parser``.  The format is determined by the file's
+    extension.  If ``cache_dir`` is given, compiled results are stored in &
+    loaded from that directory; problems with the cache itself are ignored.
+
+    :raises ValueError: if the file cannot be parsed, is of an unsupported
+        type, or contains invalid levels; the message describes all of the
+        invalid levels
+    :raises OSError: if the file cannot be read
+    """
+    path = Path(path)
+    st = path.stat()
+    cache_file: Path | None = None
+    if cache_dir is not None:
+        cache_file = Path(cache_dir, _cache_name(path) + ".json")
+        stamp = _cache_stamp(parser, st)
+        plan = _read_cache(cache_file, stamp)
+        if plan is not None:
+            return plan
+    plan = _compile(parser, path)
+    if cache_file is not None:
+        # Replaces the entry for an older version of the file
+        _write_cache(cache_file, stamp, plan)
+    return plan
+
+
+def _compile(parser: LevelParser, path: Path) -> LoggerLevelPlan:
+    suffix = path.suffix.lower()
+    try:
+        if suffix in TOML_SUFFIXES:
+            entries = _dict_entries(_load_toml(path))
+        elif suffix in JSON_SUFFIXES:
+            with path.open(encoding="utf-8") as fp:
+                entries = _dict_entries(json.load(fp))
+        elif suffix in INI_SUFFIXES:
+            cfg = configparser.ConfigParser(interpolation=None)
+            # Logger names are case sensitive
+            cfg.optionxform = str  # type: ignore[assignment,method-assign]
+            with path.open(encoding="utf-8") as fp:
+                # `read_file()` consumes the file line by line
+                cfg.read_file(fp)
+            entries = _ini_entries(cfg)
+        else:
+            raise ValueError(f"{path}: unsupported configuration file type")
+        levels: dict[str, int] = {}
+        errors: list[str] = []
+        for name, value in entries:
+            if name == ROOT_NAME:
+                name = ""
+            # JSON & TOML booleans are `int`s to Python but not levels
+            if isinstance(value, (str, int)) and not isinstance(value, bool):
+                lv = parser.resolve(value)
+            else:
+                lv = None
+            if lv is None:
+                if isinstance(value, str):
+                    msg = parser.error_message(value.strip())
+                else:
+                    msg = f"{value!r}: invalid log level"
+                errors.append(f"logger {name or ROOT_NAME!r}: {msg}")
+            else:
+                # Reinsert so that the order reflects the last assignment
+                levels.pop(name, None)
+                levels[name] = lv
+    except (ValueError, configparser.Error) as e:
+        # `json.JSONDecodeError` and `tomllib.TOMLDecodeError` are subclasses
+        # of `ValueError`
+        if str(e).startswith(f"{path}:"):
+            raise
+        raise ValueError(f"{path}: {e}") from e
+    if errors:
+        raise ValueError(f"{path}: " + "; ".join(errors))
+    return LoggerLevelPlan(tuple(levels.items()))
+
+
+def _load_toml(path: Path) -> Any:
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ValueError(
+                "reading TOML files requires Python 3.11+ or the tomli package"
+            ) from None
+    with path.open("rb") as fp:
+        return tomllib.load(fp)
+
+
+def _dict_entries(data: Any) -> Iterator[tuple[str, Any]]:
+    if not isinstance(data, dict):
+        raise ValueError("expected a table/object at the top level")
+    root = data.get("root")
+    if isinstance(root, dict) and "level" in root:
+        yield ("", root["level"])
+    loggers = data.get("loggers")
+    if isinstance(loggers, dict):
+        yield from _logger_entries(loggers, "")
+    levels = data.get("levels")
+    if isinstance(levels, dict):
+        yield from _level_entries(levels, "")
+
+
+# An unquoted dotted key in TOML, as in `[loggers.app.db]` or `app.db = "INFO"`
+# under `[levels]`, gives nested tables, which are joined back into dotted
+# logger names below
+
+
+def _logger_entries(loggers: dict[str, Any], prefix: str) -> Iterator[tuple[str, Any]]:
+    for name, cfg in loggers.items():
+        if isinstance(cfg, dict):
+            if "level" in cfg:
+                yield (prefix + name, cfg["level"])
+            # None of dictConfig()'s keys for a logger take a table, so any
+            # other table is the configuration of a child logger
+            children = {k: v for k, v in cfg.items() if isinstance(v, dict)}
+            yield from _logger_entries(children, prefix + name + ".")
+
+
+def _level_entries(levels: dict[str, Any], prefix: str) -> Iterator[tuple[str, Any]]:
+    for name, level in levels.items():
+        if isinstance(level, dict):
+            yield from _level_entries(level, prefix + name + ".")
+        else:
+            yield (prefix + name, level)
+
+
+def _ini_entries(cfg: configparser.ConfigParser) -> Iterator[tuple[str, Any]]:
+    for section in cfg.sections():
+        if section == "logger_root":
+            if "level" in cfg[section]:
+                yield ("", cfg[section]["level"])
+        elif section.startswith("logger_"):
+            sect = cfg[section]
+            if "level" in sect:
+                yield (sect.get("qualname", section[7:]), sect["level"])
+    if cfg.has_section("levels"):
+        yield from cfg["levels"].items()
+
+
+def _cache_name(path: Path) -> str:
+    key = repr((CACHE_VERSION, str(path.resolve())))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _cache_stamp(parser: LevelParser, st: os.stat_result) -> list[Any]:
+    # A list, as that is what it comes back from JSON as
+    return [
+        st.st_mtime_ns,
+        st.st_size,
+        _parser_fingerprint(parser._current_tables(), parser),
+    ]
+
+
+@lru_cache(maxsize=16)
+def _parser_fingerprint(_tables: object, parser: LevelParser) -> str:
+    # Keyed on the parser's current tables so that a `LiveLevelParser` that
+    # has picked up new levels gets a new fingerprint
+    key = repr(
+        (
+            sorted(parser.levels.items()),
+            sorted(parser.aliases.items()),
+            parser.abbrev,
+        )
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _read_cache(cache_file: Path, stamp: list[Any]) -> LoggerLevelPlan | None:
+    try:
+        with cache_file.open(encoding="utf-8") as fp:
+            data = json.load(fp)
+        if data["stamp"] != stamp:
+            return None
+        return LoggerLevelPlan(tuple((str(n), int(lv)) for n, lv in data["levels"]))
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def _write_cache(cache_file: Path, stamp: list[Any], plan: LoggerLevelPlan) -> None:
+    _write_json(cache_file, {"stamp": stamp, "levels": [list(e) for e in plan.levels]})
+
+
+def _write_json(path: Path, data: Any) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and then rename it so that concurrent
+        # readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                json.dump(data, fp)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
@@ -0,0 +1,260 @@
+"""
+Changing the log level of a running process
+
+A ``LevelControl`` owns the level of one logger (the root logger by default)
+and lets it be changed after startup in two ways:
+
+- ``SIGUSR1`` moves the level one step down (more verbose) and ``SIGUSR2``
+  moves it one step up (less verbose) through the levels recognized by a
+  ``LevelParser``.
+
+- A Unix domain socket accepts one line per connection containing any level
+  value that the ``LevelParser`` understands, sets the level to it, and
+  replies with the name of the new level.  An empty line just queries the
+  current level.  ``send_level()`` (and ``python -m click_loglevel set-level``)
+  is the matching client.
+
+Use ``level_control()`` to attach a ``LevelControl`` to a ``LogLevel`` or
+``AsyncLogLevel`` option.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import errno
+import logging
+import os
+import signal
+import socket
+import socketserver
+import stat
+from threading import Thread
+from typing import Any
+from .core import LevelParser
+
+#: Maximum length of a request line read from the control socket
+MAX_REQUEST = 1024
+
+
+class LevelControl:
+    """
+    Runtime control of the level of the logger named ``logger`` (the empty
+    string for the root logger).  Level values are resolved & stepped through
+    with ``parser``.  If ``signals`` is true (and the platform has
+    ``SIGUSR1``), ``start()`` installs handlers for ``SIGUSR1`` and
+    ``SIGUSR2``, which must happen in the main thread.  If ``socket_path`` is
+    set, ``start()`` also starts serving the control socket at that path in a
+    daemon thread.
+    """
+
+    def __init__(
+        self,
+        parser: LevelParser,
+        logger: str = "",
+        *,
+        socket_path: str | os.PathLike[str] | None = None,
+        signals: bool = True,
+    ) -> None:
+        self.parser = parser
+        self.logger = logging.getLogger(logger or None)
+        self.socket_path = os.fspath(socket_path) if socket_path is not None else None
+        self.signals = signals and hasattr(signal, "SIGUSR1")
+        self._old_handlers: dict[int, Any] = {}
+        self._server: socketserver.UnixStreamServer | None = None
+        self._thread: Thread | None = None
+
+    def __enter__(self) -> LevelControl:
+        self.start()
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.stop()
+
+    @property
+    def level(self) -> int:
+        """The current level of the controlled logger"""
+        return self.logger.level
+
+    def set_level(self, level: int) -> None:
+        self.logger.setLevel(level)
+
+    def step(self, steps: int) -> int:
+        """
+        Move the level ``steps`` places up (or down, if negative) through the
+        parser's recognized levels, starting from the logger's effective
+        level, and return the new level.  The level is
+        never stepped down to ``NOTSET``, as that would make the logger defer
+        to its parent's level instead of logging everything.
+        """
+        level = self.parser.step(self.logger.getEffectiveLevel(), steps)
+        if level > logging.NOTSET:
+            self.set_level(level)
+        return self.level
+
+    def handle_request(self, line: str) -> str:
+        """
+        Process a single request line from the control socket and return the
+        reply line (without a trailing newline)
+        """
+        line = line.strip()
+        if line:
+            level = self.parser.resolve(line)
+            if level is None:
+                return "error: " + self.parser.error_message(line)
+            self.set_level(level)
+        return self.level_name(self.level)
+
+    def level_name(self, level: int) -> str:
+        """
+        Return the name of ``level`` among the parser's recognized levels, or
+        ``"Level N"`` if it has none
+        """
+        info = self.parser.info(level)
+        assert info is not None
+        if self.parser.levels.get(info.name.upper()) == level:
+            return info.name
+        return f"Level {level}"
+
+    def start(self) -> None:
+        """
+        Install the signal handlers and start serving the control socket.  A
+        socket left at ``socket_path`` by a previous process is replaced.  If
+        either step fails, nothing is left installed or running.
+
+        :raises ValueError: if ``signals`` is true and ``start()`` is not
+            called from the main thread
+        :raises FileExistsError: if something other than a socket exists at
+            ``socket_path``
+        """
+        # The signal handlers go first, as `signal.signal()` fails outside
+        # the main thread, and there is nothing to clean up at that point
+        if self.signals and not self._old_handlers:
+            for signum, steps in [(signal.SIGUSR1, -1), (signal.SIGUSR2, 1)]:
+                try:
+                    self._old_handlers[signum] = signal.signal(
+                        signum, self._signal_handler(steps)
+                    )
+                except BaseException:
+                    self._restore_signals()
+                    raise
+        if self.socket_path is not None and self._server is None:
+            try:
+                self._start_server(self.socket_path)
+            except BaseException:
+                self._restore_signals()
+                raise
+
+    def _start_server(self, socket_path: str) -> None:
+        try:
+            st = os.lstat(socket_path)
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(st.st_mode):
+                raise FileExistsError(
+                    errno.EEXIST, "File exists and is not a socket", socket_path
+                )
+            # Remove a socket left behind by a previous process
+            os.unlink(socket_path)
+        server = socketserver.UnixStreamServer(socket_path, self._request_handler())
+        thread = Thread(
+            target=server.serve_forever, name="click-loglevel-control", daemon=True
+        )
+        thread.start()
+        self._server = server
+        self._thread = thread
+
+    def stop(self) -> None:
+        """
+        Restore the previous signal handlers and stop serving the control
+        socket.  Calling ``stop()`` more than once is harmless.
+        """
+        self._restore_signals()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            assert self._thread is not None
+            self._thread.join()
+            self._server = None
+            self._thread = None
+            assert self.socket_path is not None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+    def _restore_signals(self) -> None:
+        for signum, handler in self._old_handlers.items():
+            signal.signal(signum, handler)
+        self._old_handlers.clear()
+
+    def _signal_handler(self, steps: int) -> Callable[[int, Any], None]:
+        def handler(_signum: int, _frame: Any) -> None:
+            self.step(steps)
+
+        return handler
+
+    def _request_handler(self) -> type[socketserver.StreamRequestHandler]:
+        control = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline(MAX_REQUEST).decode("utf-8", "replace")
+                reply = control.handle_request(line)
+                self.wfile.write(reply.encode("utf-8") + b"\n")
+
+        return Handler
+
+
+def send_level(
+    socket_path: str | os.PathLike[str],
+    level: str | int | None = None,
+    timeout: float | None = 5,
+) -> str:
+    """
+    Ask the process serving the control socket at ``socket_path`` to set its
+    level to ``level`` and return the name of the resulting level.  If
+    ``level`` is ``None``, the current level is returned without changing it.
+
+    :raises ValueError: if the process rejected the level
+    :raises OSError: if the socket could not be reached
+    """
+    request = "" if level is None else str(level)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(os.fspath(socket_path))
+        sock.sendall(request.encode("utf-8") + b"\n")
+        with sock.makefile("rb") as fp:
+            reply = fp.readline().decode("utf-8").rstrip("\n")
+    if reply.startswith("error: "):
+        raise ValueError(reply.removeprefix("error: "))
+    return reply
+
+
+def level_control(
+    logger: str = "",
+    *,
+    socket_path: str | os.PathLike[str] | None = None,
+    signals: bool = True,
+) -> Callable[[Any, Any, int | None], int | None]:
+    """
+    Return a callback for a ``LogLevel`` or ``AsyncLogLevel`` option that sets
+    the level of the logger named ``logger`` to the option's value and starts
+    a ``LevelControl`` for it, using the option type's ``LevelParser``.  The
+    control is stopped when the command's context is closed, and it is
+    stored in ``ctx.meta["click_loglevel.control"]`` for the command to use.
+    Nothing is started during shell completion.
+    """
+
+    def callback(ctx: Any, param: Any, value: int | None) -> int | None:
+        if ctx.resilient_parsing:
+            return value
+        parser = param.type.parser
+        if value is not None:
+            logging.getLogger(logger or None).setLevel(value)
+        control = LevelControl(parser, logger, socket_path=socket_path, signals=signals)
+        control.start()
+        ctx.meta["click_loglevel.control"] = control
+        ctx.call_on_close(control.stop)
+        return value
+
+    return callback
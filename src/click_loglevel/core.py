@@ -1,30 +1,1138 @@
 from __future__ import annotations
-from collections.abc import Iterable, Iterator, Mapping
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from functools import lru_cache, wraps
+from itertools import chain, islice
 import logging
+from os.path import commonprefix
+import sys
+from threading import Lock
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NamedTuple, NoReturn, TypeVar, cast
+
+if TYPE_CHECKING:
+    from .loggers import LevelOverride
 
 LEVELS = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
+#: Aliases for the standard levels that ``logging`` also defines
+STANDARD_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class ParseResult(NamedTuple):
+    """The result of resolving a single value with ``LevelParser.parse_many()``"""
+
+    #: The input value
+    value: str | int
+    #: The corresponding numeric level, or ``None`` if ``value`` is invalid
+    level: int | None
+    #: An error message if ``value`` is invalid, else ``None``
+    error: str | None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+#: Maximum number of ``LevelInfo`` objects for unnamed levels that a
+#: ``LevelParser`` keeps
+INFO_CACHE_SIZE = 1024
+
+
+class LevelInfo(int):
+    """
+    A numeric log level that also carries the name of the level.  It behaves
+    as an ``int`` in every respect (comparisons, arithmetic, hashing,
+    ``str()``, passing to ``Logger.setLevel()``, etc.), with the addition of
+    a ``name`` attribute and a ``value`` property.
+
+    For a level given by name (including via an alias or abbreviation),
+    ``name`` is the canonical name of that level.  For a level given as an
+    integer, ``name`` is the name of the level with that value or, if there is
+    none, of the nearest level below it.
+
+    Instances are immutable.  (Subclasses of ``int`` cannot have non-empty
+    ``__slots__``, so the name is stored in an instance dictionary that is
+    protected against modification.)  Use ``LevelParser.info()`` to obtain
+    instances; it returns the same object for the same level every time.
+    """
+
+    name: str
+
+    def __new__(cls, name: str, value: int) -> LevelInfo:
+        self = super().__new__(cls, value)
+        object.__setattr__(self, "name", name)
+        return self
+
+    @property
+    def value(self) -> int:
+        """The level as a plain ``int``"""
+        return int(self)
+
+    def __repr__(self) -> str:
+        return f"LevelInfo({self.name!r}, {int(self)})"
+
+    def __str__(self) -> str:
+        # `int` only defines `__repr__()`, which `str()` would otherwise use
+        return int.__repr__(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (LevelInfo, (self.name, int(self)))
+
+    def __setattr__(self, name: str, _value: Any) -> None:
+        raise AttributeError(f"Cannot set {name!r} on immutable LevelInfo")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Cannot delete {name!r} from immutable LevelInfo")
+
+
+class SampledLevel(int):
+    """
+    A numeric log level with a sampling rate, as produced from values like
+    ``DEBUG@1%`` or ``DEBUG@1/1000``.  As an ``int``, it is the level to set
+    on a logger so that the sampled records are created at all.  Records at
+    ``base`` and above are meant to be kept in full, while only the fraction
+    ``rate_numerator / rate_denominator`` of the records from the level up to
+    ``base`` should be kept; ``click_loglevel.loggers.SamplingFilter`` does
+    this.
+
+    Instances are immutable, like ``LevelInfo``.
+    """
+
+    base: int
+    rate_numerator: int
+    rate_denominator: int
+
+    def __new__(
+        cls, value: int, base: int, rate_numerator: int, rate_denominator: int
+    ) -> SampledLevel:
+        self = super().__new__(cls, value)
+        object.__setattr__(self, "base", base)
+        object.__setattr__(self, "rate_numerator", rate_numerator)
+        object.__setattr__(self, "rate_denominator", rate_denominator)
+        return self
+
+    @property
+    def rate(self) -> float:
+        """The fraction of the records below ``base`` to keep"""
+        return self.rate_numerator / self.rate_denominator
+
+    def __repr__(self) -> str:
+        return (
+            f"SampledLevel({int(self)}, base={self.base},"
+            f" rate='{self.rate_numerator}/{self.rate_denominator}')"
+        )
+
+    def __str__(self) -> str:
+        return int.__repr__(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (
+            SampledLevel,
+            (int(self), self.base, self.rate_numerator, self.rate_denominator),
+        )
+
+    def __setattr__(self, name: str, _value: Any) -> None:
+        raise AttributeError(f"Cannot set {name!r} on immutable SampledLevel")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Cannot delete {name!r} from immutable SampledLevel")
+
+
+def parse_sampling_rate(rate: str) -> tuple[int, int] | None:
+    """
+    Parse a sampling rate given as a percentage (``1%``, ``0.5%``) or a
+    fraction (``1/1000``) into a reduced ``(numerator, denominator)`` pair,
+    returning ``None`` if it is invalid or not in the range (0, 1]
+    """
+    from fractions import Fraction
+
+    rate = rate.strip()
+    try:
+        if rate.endswith("%"):
+            frac = Fraction(rate[:-1].strip()) / 100
+        elif "/" in rate:
+            num, _, den = rate.partition("/")
+            if not (num.strip().isdecimal() and den.strip().isdecimal()):
+                return None
+            frac = Fraction(int(num), int(den))
+        else:
+            return None
+    except (ValueError, ZeroDivisionError):
+        return None
+    if not 0 < frac <= 1:
+        return None
+    return (frac.numerator, frac.denominator)
+
+
+class _Tables:
+    """
+    One generation of a ``LevelParser``'s lookup tables.  The tables are
+    never modified once built; a ``LiveLevelParser`` replaces the whole
+    object instead.  The only later writes are to the caches at the end,
+    which are filled idempotently (every thread computes the same value) so
+    that concurrent readers never need a lock.
+    """
+
+    __slots__ = (
+        "levels",
+        "levels_view",
+        "level_names",
+        "sorted_names",
+        "sorted_values",
+        "extended",
+        "metavar",
+        "infos",
+        "names_by_value",
+    )
+
+    def __init__(
+        self,
+        levels: dict[str, int],
+        level_names: tuple[str, ...],
+        sorted_names: tuple[str, ...],
+        extended: dict[str, int],
+    ) -> None:
+        #: Mapping from uppercased level names to values
+        self.levels = levels
+        self.levels_view: Mapping[str, int] = MappingProxyType(levels)
+        #: Level names in definition order & original case, for the metavar
+        self.level_names = level_names
+        #: Sorted index of the (uppercased) level names, used for answering
+        #: prefix queries with a binary search instead of a full scan
+        self.sorted_names = sorted_names
+        #: The distinct level values in ascending order
+        self.sorted_values: tuple[int, ...] = tuple(sorted(set(levels.values())))
+        #: Additional names accepted by `resolve()` — aliases & (if `abbrev`
+        #: is set) unambiguous prefixes — mapped to their levels
+        self.extended = extended
+        # Caches:
+        self.metavar: str | None = None
+        #: `LevelInfo` objects handed out by `info()`, keyed by uppercased
+        #: canonical name, with the other spellings of the same level that
+        #: have been looked up (aliases, abbreviations, & values) mapped to
+        #: the same objects, plus values without names of their own
+        self.infos: dict[str | int, LevelInfo] = {}
+        self.names_by_value: dict[int, str] | None = None
+
+
+def _registered_level(name: str) -> int:
+    """
+    Return the value of the level registered under ``name`` with
+    ``logging.addLevelName()``
+
+    :raises ValueError: if no level is registered under ``name``
+    """
+    value = logging.getLevelName(name)
+    if not isinstance(value, int):
+        raise ValueError(f"{name!r} is not a registered log level name")
+    return value
+
 
 class LevelParser:
-    def __init__(self, extra: Iterable[str] | Mapping[str, int] | None = None) -> None:
-        self.levels: dict[str, int] = {lv: getattr(logging, lv) for lv in LEVELS}
+    """
+    The table of recognized level names behind ``LogLevel`` and
+    ``AsyncLogLevel``.
+
+    Instances are immutable after construction: the configuration and tables
+    are exposed through read-only properties, and the mappings are read-only
+    views.  As a result, an instance can be shared between any number of
+    threads, including on free-threaded builds of Python, without locking.
+    Use ``get_level_parser()`` to obtain a shared instance for a given
+    ``extra``.
+    """
+
+    __slots__ = ("_abbrev", "_aliases", "_metavar_limit", "_tables")
+
+    def __init__(
+        self,
+        extra: Iterable[str] | Mapping[str, int] | None = None,
+        *,
+        metavar_limit: int | None = None,
+        abbrev: bool = False,
+        aliases: Mapping[str, str] | None = None,
+    ) -> None:
+        self._metavar_limit = metavar_limit
+        self._abbrev = abbrev
+        self._aliases: Mapping[str, str] = MappingProxyType(
+            {k.upper(): v.upper() for k, v in (aliases or {}).items()}
+        )
+        levels: dict[str, int] = {lv: getattr(logging, lv) for lv in LEVELS}
         level_names = list(LEVELS)
         if extra is not None:
             if isinstance(extra, Mapping):
                 for lv, value in extra.items():
-                    self.levels[lv.upper()] = value
+                    levels[lv.upper()] = value
                 level_names.extend(extra.keys())
             else:
                 for lv in extra:
-                    self.levels[lv.upper()] = logging.getLevelName(lv)
+                    levels[lv.upper()] = _registered_level(lv)
                     level_names.append(lv)
-        self.metavar = "[" + "|".join(level_names) + "]"
+        for alias, target in self._aliases.items():
+            if target not in levels:
+                raise ValueError(f"Alias {alias!r} refers to unknown level {target!r}")
+        self._tables = self._build_tables(levels, level_names, sorted(levels))
+
+    def _build_tables(
+        self, levels: dict[str, int], level_names: list[str], sorted_names: list[str]
+    ) -> _Tables:
+        extended: dict[str, int] = {}
+        if self._abbrev:
+            # In sorted order, the names sharing the longest prefix with a
+            # given name are its neighbors, so the shortest unique prefix of a
+            # name is one character longer than the longest prefix it has in
+            # common with either neighbor.
+            common = [0] * (len(sorted_names) + 1)
+            for i in range(1, len(sorted_names)):
+                common[i] = len(commonprefix([sorted_names[i - 1], sorted_names[i]]))
+            for i, name in enumerate(sorted_names):
+                for n in range(max(common[i], common[i + 1]) + 1, len(name)):
+                    extended[name[:n]] = levels[name]
+        for alias, target in self._aliases.items():
+            extended[alias] = levels[target]
+        return _Tables(levels, tuple(level_names), tuple(sorted_names), extended)
+
+    def _current_tables(self) -> _Tables:
+        return self._tables
+
+    @property
+    def metavar_limit(self) -> int | None:
+        """
+        The maximum number of level names to list in ``metavar``; further
+        names are summarized as "... N more".  ``None`` means no limit.
+        """
+        return self._metavar_limit
+
+    @property
+    def abbrev(self) -> bool:
+        """Whether unambiguous prefixes of level names are accepted"""
+        return self._abbrev
+
+    @property
+    def aliases(self) -> Mapping[str, str]:
+        """Read-only mapping from uppercased alias names to level names"""
+        return self._aliases
+
+    @property
+    def levels(self) -> Mapping[str, int]:
+        """Read-only mapping from uppercased level names to values"""
+        return self._tables.levels_view
+
+    @property
+    def sorted_names(self) -> tuple[str, ...]:
+        """The uppercased level names in sorted order"""
+        return self._tables.sorted_names
+
+    @property
+    def sorted_values(self) -> tuple[int, ...]:
+        """The distinct numeric values of the recognized levels, ascending"""
+        return self._tables.sorted_values
+
+    @property
+    def metavar(self) -> str:
+        """
+        The level names joined with ``|`` and enclosed in brackets, for use in
+        ``--help`` output.  This is computed on first access and then cached.
+        """
+        t = self._tables
+        if t.metavar is None:
+            names = t.level_names
+            limit = self._metavar_limit
+            if limit is not None and len(names) > limit:
+                shown = [*names[:limit], f"... {len(names) - limit} more"]
+            else:
+                shown = list(names)
+            t.metavar = "[" + "|".join(shown) + "]"
+        return t.metavar
 
     def parse(self, value: str) -> int:
-        return self.levels[value.upper()]
+        t = self._tables
+        key = value.upper()
+        try:
+            return t.levels[key]
+        except KeyError:
+            return t.extended[key]
+
+    def resolve(self, value: str | int) -> int | None:
+        """
+        Convert a level name (case insensitive) or an integer (either as an
+        ``int`` or a string) to a numeric level, returning ``None`` if
+        ``value`` is neither.  No exceptions are raised & caught along the
+        way, even for invalid input.
+        """
+        if isinstance(value, int):
+            return value
+        elif value.isdecimal():
+            return int(value)
+        t = self._tables
+        key = value.upper()
+        lv = t.levels.get(key)
+        if lv is None:
+            lv = t.extended.get(key)
+        if lv is not None:
+            return lv
+        s = value.strip()
+        digits = s[1:] if s[:1] in ("+", "-") else s
+        if digits.isdecimal():
+            return int(s)
+        elif "_" in digits and digits.replace("_", "").isdecimal():
+            # Let `int()` decide whether the underscores are placed validly
+            try:
+                return int(s)
+            except ValueError:
+                return None
+        else:
+            return None
+
+    def resolve_sampled(self, value: str | int) -> int | None:
+        """
+        Like ``resolve()``, but also accept a level followed by ``@`` and a
+        sampling rate (e.g., ``DEBUG@1%`` or ``DEBUG@1/1000``), which is
+        converted to a ``SampledLevel``.  Records at the next recognized
+        level above the given one and higher are kept in full; a level with
+        no recognized level above it cannot be sampled and gives ``None``, as
+        does ``NOTSET`` (or lower), which does not set a threshold to sample
+        below.
+        """
+        if isinstance(value, str) and "@" in value:
+            level, _, rate = value.partition("@")
+            lv = self.resolve(level.strip())
+            frac = parse_sampling_rate(rate)
+            if lv is None or lv <= logging.NOTSET or frac is None:
+                return None
+            base = self.step(lv, 1)
+            if base <= lv:
+                return None
+            return SampledLevel(lv, base, *frac)
+        return self.resolve(value)
+
+    def is_name(self, value: str) -> bool:
+        """
+        Return whether ``value`` is a level name (or, if enabled, an alias or
+        abbreviation) recognized by the parser, case insensitively
+        """
+        t = self._tables
+        key = value.upper()
+        return key in t.levels or key in t.extended
+
+    def info(self, value: str | int) -> LevelInfo | None:
+        """
+        Like ``resolve()``, but return a ``LevelInfo`` carrying the level's
+        canonical name.  The ``LevelInfo`` objects are created on first use
+        and then reused, so converting the same level again does not allocate;
+        every spelling of a named level (including its value) gives the same
+        object.  A ``LevelInfo`` passed in is returned unchanged.
+        """
+        lv = self.resolve(value)
+        if lv is None:
+            return None
+        elif isinstance(lv, LevelInfo):
+            return lv
+        t = self._tables
+        key: str | int
+        if isinstance(value, str):
+            key = value.upper()
+            if key not in t.levels and key not in t.extended:
+                key = lv
+        else:
+            key = lv
+        li = t.infos.get(key)
+        if li is not None:
+            return li
+        if isinstance(key, str):
+            name = self._canonical_name(t, key)
+        else:
+            name = self._name_for_value(t, lv)
+            if t.levels.get(name.upper()) != lv:
+                # A value without a name of its own
+                li = LevelInfo(name, lv)
+                if len(t.infos) < INFO_CACHE_SIZE:
+                    li = t.infos.setdefault(lv, li)
+                return li
+        # Every spelling of a named level (alias, abbreviation, or value) is
+        # mapped to the object cached under its canonical name, with
+        # `setdefault()` ensuring that racing threads all get the same object
+        li = t.infos.setdefault(name.upper(), LevelInfo(name, lv))
+        return t.infos.setdefault(key, li)
+
+    def _canonical_name(self, t: _Tables, key: str) -> str:
+        if key in self._aliases:
+            key = self._aliases[key]
+        elif key not in t.levels:
+            # An unambiguous prefix, which has exactly one completion
+            i = bisect_left(t.sorted_names, key)
+            key = t.sorted_names[i]
+        # Prefer the name as originally spelled in `extra`
+        for name in reversed(t.level_names):
+            if name.upper() == key:
+                return name
+        return key  # pragma: no cover
+
+    def _name_for_value(self, t: _Tables, value: int) -> str:
+        names = t.names_by_value
+        if names is None:
+            names = {}
+            for name in t.level_names:
+                names.setdefault(t.levels[name.upper()], name)
+            t.names_by_value = names
+        try:
+            return names[value]
+        except KeyError:
+            values = t.sorted_values
+            i = max(bisect_right(values, value) - 1, 0)
+            return names[values[i]]
+
+    def parse_many(self, values: Iterable[str | int]) -> Iterator[ParseResult]:
+        """
+        Resolve each item of ``values`` (which may be any iterable, including
+        a lazy stream) with ``resolve()``, yielding a ``ParseResult`` for each
+        one.  Invalid values do not stop the iteration; instead, their results
+        have ``None`` for the level and an error message.
+        """
+        resolve = self.resolve
+        for v in values:
+            lv = resolve(v)
+            if lv is None:
+                yield ParseResult(v, None, self.error_message(v))
+            else:
+                yield ParseResult(v, lv, None)
+
+    def error_message(self, value: str | int) -> str:
+        """Return the error message for a value that failed to resolve"""
+        if self._abbrev and isinstance(value, str) and value:
+            candidates = list(islice(self.get_completions(value), 6))
+            if len(candidates) > 1:
+                if len(candidates) > 5:
+                    candidates[5] = "..."
+                return (
+                    f"{value!r}: ambiguous log level; could be"
+                    f" {', '.join(candidates)}"
+                )
+        return f"{value!r}: invalid log level"
+
+    def step(self, level: int, steps: int) -> int:
+        """
+        Return the recognized level that is ``steps`` places above ``level``
+        (or below it, if ``steps`` is negative) in numeric order, stopping at
+        the lowest & highest levels.  ``level`` need not be a recognized
+        level itself; one step from an unrecognized value goes to the nearest
+        recognized level in that direction.
+        """
+        values = self._tables.sorted_values
+        if steps < 0:
+            i = bisect_left(values, level) + steps
+        elif steps > 0:
+            i = bisect_right(values, level) - 1 + steps
+        else:
+            return level
+        return values[min(max(i, 0), len(values) - 1)]
 
     def get_completions(self, incomplete: str) -> Iterator[str]:
+        """
+        Yield all level names that start with ``incomplete`` (case
+        insensitive) in sorted order
+        """
         incomplete = incomplete.upper()
-        for lv in self.levels:
-            if lv.startswith(incomplete):
-                yield lv
+        names = self._tables.sorted_names
+        for i in range(bisect_left(names, incomplete), len(names)):
+            if not names[i].startswith(incomplete):
+                break
+            yield names[i]
+
+    def ranked_completions(
+        self,
+        incomplete: str,
+        limit: int | None = None,
+        usage: Mapping[str, int] | None = None,
+    ) -> Iterator[str]:
+        """
+        Yield the level names that start with ``incomplete`` (case
+        insensitive), stopping after ``limit`` names if it is set.  The
+        standard levels come first, in order of severity, followed by the
+        other names in descending order of ``usage`` (a mapping from
+        uppercased level names to counts) and then the remaining names in
+        sorted order.  If ``usage`` is ``None``, the counts collected by
+        ``click_loglevel.instrument`` (if it has been enabled) are used.
+
+        Only the matching names that are actually yielded are looked at, so
+        a small ``limit`` stays cheap no matter how many levels match.  The
+        ranking of the last ``usage`` mapping given is remembered, so it should
+        be treated as a snapshot and not modified afterwards.
+        """
+        if usage is None:
+            from .instrument import snapshot
+
+            usage = snapshot().names
+        key = incomplete.upper()
+        completions = self.get_completions(incomplete)
+        levels = self.levels
+        ranked = [name for name in LEVELS if name.startswith(key)]
+        ranked.extend(
+            name
+            for name in _usage_order(usage)
+            if name.startswith(key) and name in levels and name not in LEVELS
+        )
+        seen = set(ranked)
+        names = chain(ranked, (n for n in completions if n not in seen))
+        return names if limit is None else islice(names, limit)
+
+
+#: The last ``usage`` mapping given to ``ranked_completions()`` and its names
+#: in descending order of usage, so that completing repeatedly against the same
+#: counts only sorts them once
+_last_usage_order: tuple[Mapping[str, int], list[str]] | None = None
+
+
+def _usage_order(usage: Mapping[str, int]) -> list[str]:
+    global _last_usage_order
+    last = _last_usage_order
+    if last is not None and last[0] is usage:
+        return last[1]
+    order = [name for name, _ in sorted(usage.items(), key=lambda kv: (-kv[1], kv[0]))]
+    _last_usage_order = (usage, order)
+    return order
+
+
+#: Number of calls to ``logging.addLevelName()`` since
+#: ``_install_registry_hook()`` was called
+_registry_version = 0
+_registry_lock = Lock()
+_registry_hooked = False
+
+
+def _install_registry_hook() -> None:
+    """
+    Wrap ``logging.addLevelName()`` so that every call increments
+    ``_registry_version``.  Only code that looks up ``logging.addLevelName``
+    after this runs (as opposed to code that did ``from logging import
+    addLevelName`` earlier) is seen.
+    """
+    global _registry_hooked
+    with _registry_lock:
+        if _registry_hooked:
+            return
+        add_level_name = logging.addLevelName
+
+        @wraps(add_level_name)
+        def hooked(level: int, levelName: str) -> None:
+            global _registry_version
+            add_level_name(level, levelName)
+            with _registry_lock:
+                _registry_version += 1
+
+        logging.addLevelName = hooked
+        _registry_hooked = True
+
+
+def _registered_levels() -> dict[str, int]:
+    """
+    Return a mapping from the names of the levels registered with
+    ``logging`` (as spelled when registered) to their values, leaving out
+    the aliases ``WARN`` and ``FATAL``
+    """
+    if sys.version_info >= (3, 11):
+        mapping = logging.getLevelNamesMapping()
+    else:
+        mapping = dict(logging._nameToLevel)
+    return {k: v for k, v in mapping.items() if k not in STANDARD_ALIASES}
+
+
+class LiveLevelParser(LevelParser):
+    """
+    A ``LevelParser`` that also recognizes the levels registered with
+    ``logging.addLevelName()``, both before and after it was constructed.
+    Levels in ``extra`` take precedence over registered levels of the same
+    name at construction.
+
+    Calls to ``addLevelName()`` increment a global counter; each lookup
+    compares the counter with the value at the parser's last sync and, only
+    if it changed, merges the registered levels that are new or have new
+    values into a copy of the tables, which then replaces the old tables in
+    a single assignment.
+    """
+
+    __slots__ = ("_registered", "_synced")
+
+    def __init__(
+        self,
+        extra: Iterable[str] | Mapping[str, int] | None = None,
+        *,
+        metavar_limit: int | None = None,
+        abbrev: bool = False,
+        aliases: Mapping[str, str] | None = None,
+    ) -> None:
+        _install_registry_hook()
+        super().__init__(
+            extra, metavar_limit=metavar_limit, abbrev=abbrev, aliases=aliases
+        )
+        with _registry_lock:
+            self._synced = _registry_version
+            self._registered = _registered_levels()
+            levels = self._tables.levels
+            seed = [
+                (value, name)
+                for name, value in self._registered.items()
+                if name.upper() not in levels
+            ]
+            if seed:
+                self._merge(seed)
+
+    @property
+    def levels(self) -> Mapping[str, int]:
+        self._check_registry()
+        return super().levels
+
+    @property
+    def sorted_names(self) -> tuple[str, ...]:
+        self._check_registry()
+        return super().sorted_names
+
+    @property
+    def sorted_values(self) -> tuple[int, ...]:
+        self._check_registry()
+        return super().sorted_values
+
+    @property
+    def metavar(self) -> str:
+        self._check_registry()
+        return super().metavar
+
+    def _check_registry(self) -> None:
+        if _registry_version != self._synced:
+            self._sync()
+
+    def _current_tables(self) -> _Tables:
+        self._check_registry()
+        return self._tables
+
+    def _sync(self) -> None:
+        with _registry_lock:
+            if _registry_version == self._synced:
+                return
+            current = _registered_levels()
+            new = [
+                (value, name)
+                for name, value in current.items()
+                if self._registered.get(name) != value
+            ]
+            self._registered = current
+            self._synced = _registry_version
+            if new:
+                self._merge(new)
+
+    def _merge(self, new: Iterable[tuple[int, str]]) -> None:
+        # Must be called with `_registry_lock` held
+        t = self._tables
+        levels = dict(t.levels)
+        level_names = list(t.level_names)
+        sorted_names = list(t.sorted_names)
+        for value, name in new:
+            key = name.upper()
+            if key not in levels:
+                level_names.append(name)
+                insort(sorted_names, key)
+            levels[key] = value
+        # Readers that already fetched the old tables finish their lookups
+        # with them; later lookups see the new ones.
+        self._tables = self._build_tables(levels, level_names, sorted_names)
+
+    def parse(self, value: str) -> int:
+        self._check_registry()
+        return super().parse(value)
+
+    def resolve(self, value: str | int) -> int | None:
+        self._check_registry()
+        return super().resolve(value)
+
+    def is_name(self, value: str) -> bool:
+        self._check_registry()
+        return super().is_name(value)
+
+    def info(self, value: str | int) -> LevelInfo | None:
+        self._check_registry()
+        return super().info(value)
+
+    def step(self, level: int, steps: int) -> int:
+        self._check_registry()
+        return super().step(level, steps)
+
+    def get_completions(self, incomplete: str) -> Iterator[str]:
+        self._check_registry()
+        return super().get_completions(incomplete)
+
+
+def get_level_parser(
+    extra: Iterable[str] | Mapping[str, int] | None = None,
+    *,
+    live: bool = False,
+    metavar_limit: int | None = None,
+    abbrev: bool = False,
+    aliases: Mapping[str, str] | None = None,
+    plugin_group: str | None = None,
+) -> LevelParser:
+    """
+    Return a ``LevelParser`` for the given ``extra`` levels, reusing a
+    previously-constructed instance if one exists for an equivalent
+    configuration.
+
+    ``extra`` is normalized to a tuple of ``(name, value)`` pairs before the
+    cache lookup, with the values of bare level names resolved against
+    ``logging``'s level registry.  As a result, passing an iterable of names
+    and passing the equivalent mapping share a parser, and a call to
+    ``logging.addLevelName()`` that changes the value of a name in ``extra``
+    results in a new cache key (and thus a new parser) rather than a stale one.
+    The least recently used parsers are evicted once the cache holds 128
+    entries.
+
+    If ``live`` is true, the returned parser is a ``LiveLevelParser``.  If
+    ``plugin_group`` is set, the returned parser is a
+    ``click_loglevel.plugins.PluginLevelParser`` for that entry point group
+    (which is always live).  The remaining arguments are passed through to the
+    parser's constructor.
+    """
+    if extra is None:
+        key: tuple[tuple[str, int], ...] = ()
+    elif isinstance(extra, Mapping):
+        key = tuple(extra.items())
+    else:
+        key = tuple((lv, _registered_level(lv)) for lv in extra)
+    alias_key = tuple(aliases.items()) if aliases is not None else None
+    return _cached_parser(key, live, metavar_limit, abbrev, alias_key, plugin_group)
+
+
+@lru_cache(maxsize=128)
+def _cached_parser(
+    extra: tuple[tuple[str, int], ...],
+    live: bool,
+    metavar_limit: int | None,
+    abbrev: bool,
+    aliases: tuple[tuple[str, str], ...] | None,
+    plugin_group: str | None = None,
+) -> LevelParser:
+    if plugin_group is not None:
+        from .plugins import PluginLevelParser
+
+        return PluginLevelParser(
+            plugin_group,
+            dict(extra),
+            metavar_limit=metavar_limit,
+            abbrev=abbrev,
+            aliases=dict(aliases) if aliases is not None else None,
+        )
+    cls = LiveLevelParser if live else LevelParser
+    return cls(
+        dict(extra),
+        metavar_limit=metavar_limit,
+        abbrev=abbrev,
+        aliases=dict(aliases) if aliases is not None else None,
+    )
+
+
+class CacheStats(NamedTuple):
+    """Statistics for a ``ConvertCache``"""
+
+    #: Number of lookups answered from the cache
+    hits: int
+    #: Number of lookups that had to be computed
+    misses: int
+    #: Maximum number of entries
+    maxsize: int
+    #: Current number of entries
+    size: int
+
+
+class ConvertCache:
+    """
+    A bounded LRU cache mapping raw values to ``ParseResult`` objects giving
+    the results of converting them with a ``LogLevel`` or ``AsyncLogLevel``.
+    Failures are cached along with their error messages.  If ``level_info``
+    is true, successful results hold ``LevelInfo`` objects.
+
+    Use ``get_convert_cache()`` to obtain a cache; ``LogLevel`` and
+    ``AsyncLogLevel`` instances with equivalent arguments share both their
+    ``LevelParser`` and their cache.  Those instances only look up values that
+    their parser does not recognize, as building the error messages for them
+    is the only part of a conversion that is slower than a cache lookup.
+    When the parser is a ``LiveLevelParser`` and new levels are registered,
+    the cache is emptied on the next lookup.  The cache is safe to use from
+    multiple threads.
+    """
+
+    def __init__(
+        self, parser: LevelParser, maxsize: int = 128, level_info: bool = False
+    ) -> None:
+        self.parser = parser
+        self.maxsize = maxsize
+        self.level_info = level_info
+        self._lock = Lock()
+        self._tables = parser._current_tables()
+        # Statistics from before the last time the cache was emptied
+        self._old_hits = 0
+        self._old_misses = 0
+        # `typed=True` keeps `LevelInfo`s apart from equal `int`s
+        self._cached = lru_cache(maxsize=maxsize, typed=True)(self._convert)
+
+    def _convert(self, value: str | int) -> ParseResult:
+        p = self.parser
+        lv = p.info(value) if self.level_info else p.resolve(value)
+        if lv is None:
+            return ParseResult(value, None, p.error_message(value))
+        else:
+            return ParseResult(value, lv, None)
+
+    def lookup(self, value: str | int) -> ParseResult:
+        """Return the (possibly cached) result of converting ``value``"""
+        if self.parser._current_tables() is not self._tables:
+            self.clear()
+        return self._cached(value)
+
+    def clear(self) -> None:
+        """Empty the cache, keeping the statistics"""
+        with self._lock:
+            info = self._cached.cache_info()
+            self._old_hits += info.hits
+            self._old_misses += info.misses
+            self._cached.cache_clear()
+            self._tables = self.parser._current_tables()
+
+    def stats(self) -> CacheStats:
+        info = self._cached.cache_info()
+        return CacheStats(
+            hits=self._old_hits + info.hits,
+            misses=self._old_misses + info.misses,
+            maxsize=self.maxsize,
+            size=info.currsize,
+        )
+
+
+@lru_cache(maxsize=128)
+def get_convert_cache(
+    parser: LevelParser, maxsize: int = 128, level_info: bool = False
+) -> ConvertCache:
+    """
+    Return the ``ConvertCache`` for the given parser & arguments, creating it
+    on first use
+    """
+    return ConvertCache(parser, maxsize, level_info)
+
+
+#: Parameter names of the options added by ``verbosity_options()``
+VERBOSE_PARAM = "click_loglevel_verbose"
+QUIET_PARAM = "click_loglevel_quiet"
+
+
+def step_level(
+    command: Any, param: str, value: int | None, steps: int, default: int
+) -> int:
+    """
+    Step ``value`` (or ``default``, if ``value`` is ``None``) by ``steps``
+    through the levels recognized by the ``LevelParser`` of ``command``'s
+    parameter named ``param``.  If the parameter's type has ``level_info``
+    set, the result is a ``LevelInfo``.  Used by ``verbosity_options()``.
+
+    :raises ValueError: if ``command`` has no log level parameter named
+        ``param``
+    """
+    for p in command.params:
+        if p.name == param:
+            parser = getattr(p.type, "parser", None)
+            if isinstance(parser, LevelParser):
+                break
+    else:
+        raise ValueError(f"Command has no log level parameter named {param!r}")
+    level = parser.step(default if value is None else value, steps)
+    if getattr(p.type, "level_info", False):
+        info = parser.info(level)
+        assert info is not None
+        return info
+    return level
+
+
+def verbosity_decorator(
+    click_module: Any,
+    param: str,
+    default: int,
+    verbose: Sequence[str],
+    quiet: Sequence[str],
+) -> Callable[[F], F]:
+    """
+    Return the decorator behind ``verbosity_options()``, with options &
+    contexts created by ``click_module`` (either ``click`` or ``asyncclick``)
+    """
+
+    def decorator(f: F) -> F:
+        @wraps(f)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            steps = kwargs.pop(QUIET_PARAM) - kwargs.pop(VERBOSE_PARAM)
+            if steps:
+                ctx = click_module.get_current_context()
+                kwargs[param] = step_level(
+                    ctx.command, param, kwargs.get(param), steps, default
+                )
+            return f(*args, **kwargs)
+
+        wrapper = click_module.option(
+            *quiet,
+            QUIET_PARAM,
+            count=True,
+            help="Decrease verbosity (can be repeated)",
+        )(wrapper)
+        wrapper = click_module.option(
+            *verbose,
+            VERBOSE_PARAM,
+            count=True,
+            help="Increase verbosity (can be repeated)",
+        )(wrapper)
+        return cast(F, wrapper)
+
+    return decorator
+
+
+class LogLevelMixin:
+    """
+    The framework-independent implementation of ``LogLevel`` and
+    ``AsyncLogLevel``.  Subclasses also inherit from the ``ParamType`` of
+    their framework and set ``completion_item`` to its ``CompletionItem``
+    class.
+    """
+
+    name = "log-level"
+
+    completion_item: Any
+
+    if TYPE_CHECKING:
+
+        def fail(
+            self, message: str, param: Any = None, ctx: Any = None
+        ) -> NoReturn: ...
+
+    def __init__(
+        self,
+        extra: Iterable[str] | Mapping[str, int] | None = None,
+        *,
+        live: bool = False,
+        metavar_limit: int | None = None,
+        abbrev: bool = False,
+        aliases: Mapping[str, str] | None = None,
+        level_info: bool = False,
+        cache_size: int | None = None,
+        plugin_group: str | None = None,
+        completion_limit: int | None = None,
+        completion_help: bool = False,
+        completion_usage: Callable[[], Mapping[str, int]] | None = None,
+        sampling: bool = False,
+    ) -> None:
+        self.parser = get_level_parser(
+            extra,
+            live=live,
+            metavar_limit=metavar_limit,
+            abbrev=abbrev,
+            aliases=aliases,
+            plugin_group=plugin_group,
+        )
+        self.level_info = level_info
+        self.cache: ConvertCache | None = None
+        if cache_size is not None:
+            self.cache = get_convert_cache(self.parser, cache_size, level_info)
+        self.completion_limit = completion_limit
+        self.completion_help = completion_help
+        self.completion_usage = completion_usage
+        self._record_usage: Callable[[str], object] | None = getattr(
+            completion_usage, "record", None
+        )
+        self.sampling = sampling
+
+    def convert(self, value: str | int, param: Any, ctx: Any) -> int:
+        lv: int | None
+        if self.sampling and isinstance(value, str) and "@" in value:
+            lv = self.parser.resolve_sampled(value)
+            if lv is None:
+                level, _, rate = value.partition("@")
+                lv = self.parser.resolve(level.strip())
+                if lv is None or parse_sampling_rate(rate) is None:
+                    msg = "invalid sampled log level; expected LEVEL@N% or LEVEL@N/M"
+                elif lv <= logging.NOTSET:
+                    msg = "NOTSET cannot be sampled"
+                else:
+                    msg = "no higher log level to keep in full"
+                self.fail(f"{value!r}: {msg}", param, ctx)
+            return lv
+        if self.level_info:
+            lv = self.parser.info(value)
+        else:
+            lv = self.parser.resolve(value)
+        if lv is None:
+            if self.cache is not None:
+                # Only failures go through the cache, as a valid value takes
+                # fewer lookups to convert than to find in the cache
+                error = self.cache.lookup(value).error
+                assert error is not None
+            else:
+                error = self.parser.error_message(value)
+            self.fail(error, param, ctx)
+        if self._record_usage is not None and isinstance(value, str):
+            self._record(value, param, ctx)
+        return lv
+
+    def _record(self, value: str, param: Any, ctx: Any) -> None:
+        # Only names that the user actually gave are counted, not defaults
+        # or values parsed for shell completion
+        if ctx is not None:
+            if ctx.resilient_parsing:
+                return
+            if param is not None and param.name is not None:
+                source = ctx.get_parameter_source(param.name)
+                if source is not None and source.name in ("DEFAULT", "DEFAULT_MAP"):
+                    return
+        if self.parser.is_name(value):
+            info = self.parser.info(value)
+            assert info is not None and self._record_usage is not None
+            self._record_usage(info.name)
+
+    def parse_many(self, values: Iterable[str | int]) -> Iterator[ParseResult]:
+        """
+        Resolve every item of ``values`` (which may be a lazy iterator) in a
+        single pass, yielding a ``ParseResult`` for each one.  Invalid values
+        are reported in their results rather than raised, so that all errors
+        in a batch can be collected at once.
+        """
+        return self.parser.parse_many(values)
+
+    def override(self, value: str | int, logger: str = "") -> LevelOverride:
+        """
+        Return a ``LevelOverride`` that enables logging at the level given by
+        ``value`` (anything this type accepts) on the logger named ``logger``
+        and its descendants for the current task only.  It can be used as a
+        context manager or as a decorator of plain or ``async`` functions.
+
+        :raises ValueError: if ``value`` is not a valid level
+        """
+        from .loggers import LevelOverride
+
+        lv = self.parser.resolve(value)
+        if lv is None:
+            raise ValueError(self.parser.error_message(value))
+        return LevelOverride(lv, logger)
+
+    def get_metavar(self, param: Any, ctx: Any = None) -> str:  # noqa: U100
+        return self.parser.metavar
+
+    def shell_complete(self, _ctx: Any, _param: Any, incomplete: str) -> list[Any]:
+        names: Iterator[str]
+        if self.completion_limit is None:
+            names = self.parser.get_completions(incomplete)
+        else:
+            usage = self.completion_usage() if self.completion_usage else None
+            names = self.parser.ranked_completions(
+                incomplete, self.completion_limit, usage
+            )
+        if self.completion_help:
+            # Only the names actually returned get help text
+            levels = self.parser.levels
+            return [
+                self.completion_item(c, help=str(levels[c]) if c in levels else None)
+                for c in names
+            ]
+        return [self.completion_item(c) for c in names]
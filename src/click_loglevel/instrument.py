@@ -0,0 +1,286 @@
+"""
+Opt-in usage counters and timing for ``LevelParser`` and the parameter types
+built on it
+
+Instrumentation is process-wide.  ``enable()`` replaces ``LevelParser``'s
+``parse()``, ``parse_many()``, and ``get_completions()`` methods and the
+``convert()`` method of ``LogLevel`` and ``AsyncLogLevel`` with wrappers that
+record each call, and ``disable()`` puts the original methods back, so when
+instrumentation is off there is no overhead at all.  Calls to ``convert()``
+and the items given to ``parse_many()`` are reported as "convert" events.
+Only these entry points are wrapped, not the methods that they use
+internally, so each value is counted once.
+"""
+
+from __future__ import annotations
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import wraps
+import threading
+from threading import Lock
+from time import perf_counter
+from typing import Any, NamedTuple
+from .core import LevelParser, LogLevelMixin, ParseResult
+
+
+class Event(NamedTuple):
+    """A single instrumented call, as passed to a hook"""
+
+    #: ``"parse"``, ``"convert"``, or ``"complete"``
+    kind: str
+    #: The value passed to the method (for ``"convert"`` events from
+    #: ``parse_many()``, the item)
+    value: Any
+    #: The method's result: the level (``None`` for a failed ``"convert"`` or
+    #: ``"parse"``) or, for ``"complete"``, the list of completions
+    result: Any
+    #: Time taken by the call, in seconds
+    elapsed: float
+
+
+@dataclass
+class Stats:
+    """A snapshot of the counters collected while instrumentation is enabled"""
+
+    #: Number of successful calls to ``LevelParser.parse()``
+    parse_hits: int = 0
+    #: Number of calls to ``LevelParser.parse()`` that raised ``KeyError``
+    parse_misses: int = 0
+    #: Number of conversions of level names
+    convert_named: int = 0
+    #: Number of conversions of integers & numeric strings
+    convert_numeric: int = 0
+    #: Number of values that failed to convert
+    convert_failures: int = 0
+    #: How many times each level (by uppercased canonical name) was parsed or
+    #: converted by name
+    names: Counter[str] = field(default_factory=Counter)
+    #: Number of calls to ``get_completions()``
+    completion_calls: int = 0
+    #: Total number of completion candidates returned
+    completion_candidates: int = 0
+    #: Total time spent in ``get_completions()``, in seconds
+    completion_time: float = 0.0
+
+    def copy(self) -> Stats:
+        return Stats(
+            parse_hits=self.parse_hits,
+            parse_misses=self.parse_misses,
+            convert_named=self.convert_named,
+            convert_numeric=self.convert_numeric,
+            convert_failures=self.convert_failures,
+            names=Counter(self.names),
+            completion_calls=self.completion_calls,
+            completion_candidates=self.completion_candidates,
+            completion_time=self.completion_time,
+        )
+
+
+_lock = Lock()
+_stats = Stats()
+_hook: Callable[[Event], None] | None = None
+_originals: dict[tuple[type, str], Any] = {}
+
+
+def enable(hook: Callable[[Event], None] | None = None) -> None:
+    """
+    Start recording calls.  If ``hook`` is given, it is also called with an
+    ``Event`` after each instrumented call.  Calling ``enable()`` again while
+    instrumentation is already on just replaces the hook.
+    """
+    global _hook
+    with _lock:
+        _hook = hook
+        if _originals:
+            return
+        for (cls, name), wrapper in _WRAPPERS.items():
+            _originals[cls, name] = cls.__dict__[name]
+            setattr(cls, name, wrapper(_originals[cls, name]))
+
+
+def disable() -> None:
+    """
+    Stop recording calls and restore the original methods.  The counters are
+    kept until ``reset()`` is called.
+    """
+    global _hook
+    with _lock:
+        for (cls, name), method in _originals.items():
+            setattr(cls, name, method)
+        _originals.clear()
+        _hook = None
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def snapshot() -> Stats:
+    """Return a copy of the current counters"""
+    with _lock:
+        return _stats.copy()
+
+
+def reset() -> None:
+    """Zero all counters"""
+    global _stats
+    with _lock:
+        _stats = Stats()
+
+
+def _canonical_name(parser: LevelParser, value: Any) -> str | None:
+    """
+    Return the uppercased canonical name of the level that ``value`` names,
+    or ``None`` if it is not a level name (or a sampled level name)
+    """
+    if not isinstance(value, str):
+        return None
+    name = value.partition("@")[0].strip() if "@" in value else value
+    if not parser.is_name(name):
+        return None
+    info = parser.info(name)
+    assert info is not None
+    return info.name.upper()
+
+
+def _count_convert(parser: LevelParser, value: Any, result: int | None) -> None:
+    name = None if result is None else _canonical_name(parser, value)
+    with _lock:
+        if result is None:
+            _stats.convert_failures += 1
+        elif name is not None:
+            _stats.convert_named += 1
+            _stats.names[name] += 1
+        else:
+            _stats.convert_numeric += 1
+
+
+class _Local(threading.local):
+    #: Whether the current thread is inside an instrumented call, whose own
+    #: uses of the other instrumented methods are not counted
+    busy = False
+
+
+_local = _Local()
+
+
+def _wrap_parse(
+    method: Callable[[LevelParser, str], int],
+) -> Callable[[LevelParser, str], int]:
+    @wraps(method)
+    def parse(self: LevelParser, value: str) -> int:
+        if _local.busy:
+            return method(self, value)
+        start = perf_counter()
+        _local.busy = True
+        try:
+            result = method(self, value)
+        except KeyError:
+            elapsed = perf_counter() - start
+            with _lock:
+                _stats.parse_misses += 1
+            _emit("parse", value, None, elapsed)
+            raise
+        finally:
+            _local.busy = False
+        elapsed = perf_counter() - start
+        name = _canonical_name(self, value)
+        with _lock:
+            _stats.parse_hits += 1
+            if name is not None:
+                _stats.names[name] += 1
+        _emit("parse", value, result, elapsed)
+        return result
+
+    return parse
+
+
+def _wrap_parse_many(
+    method: Callable[[LevelParser, Iterable[str | int]], Iterator[ParseResult]],
+) -> Callable[[LevelParser, Iterable[str | int]], Iterator[ParseResult]]:
+    @wraps(method)
+    def parse_many(
+        self: LevelParser, values: Iterable[str | int]
+    ) -> Iterator[ParseResult]:
+        results = method(self, values)
+        while True:
+            if _local.busy:
+                yield from results
+                return
+            start = perf_counter()
+            _local.busy = True
+            try:
+                r = next(results)
+            except StopIteration:
+                return
+            finally:
+                _local.busy = False
+            elapsed = perf_counter() - start
+            _count_convert(self, r.value, r.level)
+            _emit("convert", r.value, r.level, elapsed)
+            yield r
+
+    return parse_many
+
+
+def _wrap_convert(
+    method: Callable[[LogLevelMixin, str | int, Any, Any], int],
+) -> Callable[[LogLevelMixin, str | int, Any, Any], int]:
+    @wraps(method)
+    def convert(self: LogLevelMixin, value: str | int, param: Any, ctx: Any) -> int:
+        if _local.busy:
+            return method(self, value, param, ctx)
+        start = perf_counter()
+        result: int | None = None
+        _local.busy = True
+        try:
+            result = method(self, value, param, ctx)
+            return result
+        finally:
+            # A failed conversion raises the framework's `BadParameter`, and
+            # leaves `result` as `None`
+            _local.busy = False
+            elapsed = perf_counter() - start
+            _count_convert(self.parser, value, result)
+            _emit("convert", value, result, elapsed)
+
+    return convert
+
+
+def _wrap_get_completions(
+    method: Callable[[LevelParser, str], Iterator[str]],
+) -> Callable[[LevelParser, str], Iterator[str]]:
+    @wraps(method)
+    def get_completions(self: LevelParser, incomplete: str) -> Iterator[str]:
+        if _local.busy:
+            return method(self, incomplete)
+        start = perf_counter()
+        _local.busy = True
+        try:
+            result = list(method(self, incomplete))
+        finally:
+            _local.busy = False
+        elapsed = perf_counter() - start
+        with _lock:
+            _stats.completion_calls += 1
+            _stats.completion_candidates += len(result)
+            _stats.completion_time += elapsed
+        _emit("complete", incomplete, result, elapsed)
+        return iter(result)
+
+    return get_completions
+
+
+_WRAPPERS: dict[tuple[type, str], Callable[[Any], Any]] = {
+    (LevelParser, "parse"): _wrap_parse,
+    (LevelParser, "parse_many"): _wrap_parse_many,
+    (LevelParser, "get_completions"): _wrap_get_completions,
+    (LogLevelMixin, "convert"): _wrap_convert,
+}
+
+
+def _emit(kind: str, value: Any, result: Any, elapsed: float) -> None:
+    hook = _hook
+    if hook is not None:
+        hook(Event(kind, value, result, elapsed))
@@ -0,0 +1,771 @@
+from __future__ import annotations
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from functools import wraps
+import inspect
+from itertools import count, cycle
+import logging
+import os
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Literal, NoReturn, TypeVar, cast
+from .core import LEVELS, LevelParser, SampledLevel, get_level_parser
+
+if TYPE_CHECKING:
+    from logging.handlers import QueueHandler, QueueListener
+
+#: Logger name that may be used in a spec to refer to the root logger
+ROOT_NAME = "root"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+#: Largest sampling denominator for which ``SamplingFilter`` precomputes its
+#: repeating pattern of decisions instead of computing each one
+SAMPLING_PATTERN_LIMIT = 10_000
+
+
+@dataclass(frozen=True)
+class LoggerLevelPlan:
+    """
+    A compiled assignment of levels to loggers, as produced by
+    ``LoggerLevels``.  The root logger is represented by the empty string.
+    """
+
+    #: ``(logger name, level)`` pairs in the order they will be applied
+    levels: tuple[tuple[str, int], ...]
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        return iter(self.levels)
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def apply(self) -> None:
+        """
+        Set the level of each logger in the plan.  The loggers' cached
+        ``isEnabledFor()`` results are invalidated once at the end instead of
+        once per logger as with ``Logger.setLevel()``.
+        """
+        manager = logging.Logger.manager
+        for name, level in self.levels:
+            logging.getLogger(name or None).level = level
+        if self.levels:
+            manager._clear_cache()  # type: ignore[attr-defined]
+
+    def filter(self) -> LoggerLevelFilter:
+        """
+        Return a ``LoggerLevelFilter`` that applies the plan's levels as
+        per-logger thresholds instead of setting them on the loggers
+        """
+        return LoggerLevelFilter(dict(self.levels))
+
+
+class _TrieNode:
+    __slots__ = ("children", "level")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.level: int | None = None
+
+
+class LoggerLevelFilter(logging.Filter):
+    """
+    A ``logging`` filter that applies a different minimum level to the
+    records of each logger hierarchy, e.g., ``{"urllib3": logging.WARNING,
+    "app": logging.DEBUG}``.  A record passes if its level is at least that
+    of the rule for the longest matching prefix of its logger's name (compared
+    by dotted components, so ``app`` matches ``app.db`` but not ``apple``).
+    The rule for ``""`` (the root logger) applies to loggers not matched by
+    any other rule; records of loggers matched by no rule at all pass.
+
+    The rules are stored in a trie of dotted name components, and the
+    threshold for each logger name is computed on first use and then
+    memoized, so that filtering a record costs a single dict lookup no matter
+    how many rules there are.  Attach the filter to a handler to filter
+    records from all loggers, as filters attached to loggers are not applied
+    to records propagated from their descendants.
+    """
+
+    def __init__(self, rules: Mapping[str, int]) -> None:
+        super().__init__()
+        self._root = _TrieNode()
+        for name, level in rules.items():
+            node = self._root
+            if name and name != ROOT_NAME:
+                for part in name.split("."):
+                    node = node.children.setdefault(part, _TrieNode())
+            node.level = level
+        self._thresholds: dict[str, int] = {}
+
+    def threshold(self, name: str) -> int:
+        """Return the minimum level for records from the logger ``name``"""
+        try:
+            return self._thresholds[name]
+        except KeyError:
+            pass
+        node = self._root
+        level = node.level
+        if name and name != ROOT_NAME:
+            for part in name.split("."):
+                child = node.children.get(part)
+                if child is None:
+                    break
+                node = child
+                if node.level is not None:
+                    level = node.level
+        threshold = level if level is not None else logging.NOTSET
+        self._thresholds[name] = threshold
+        return threshold
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        try:
+            threshold = self._thresholds[record.name]
+        except KeyError:
+            threshold = self.threshold(record.name)
+        return record.levelno >= threshold
+
+
+class SamplingFilter(logging.Filter):
+    """
+    A filter that passes records at ``base`` and above unchanged and keeps
+    only ``numerator`` out of every ``denominator`` records from ``level`` up
+    to ``base``.  Records below ``level`` are passed unchanged as well, as are
+    records from loggers other than the logger named ``name`` and its
+    descendants if ``name`` is set.
+
+    The decisions follow a fixed repeating pattern rather than a random
+    number, so exactly the requested fraction is kept over each run of
+    ``denominator`` records (the first record of each run is always kept).
+    Each logger has its own position in the pattern, so that records from
+    loggers that take turns, such as a query logger & a connection pool
+    logger, are sampled alike instead of the pattern lining up with the turns.
+    For denominators up to ``SAMPLING_PATTERN_LIMIT``, the pattern is
+    precomputed and each decision is a single ``next()`` on an
+    ``itertools.cycle``; above that, it is computed from a counter.
+    Attach the filter to handlers, as filters on a logger do not see records
+    propagated from its descendants.
+    """
+
+    def __init__(
+        self,
+        level: int,
+        base: int,
+        numerator: int = 1,
+        denominator: int = 1,
+        name: str = "",
+    ) -> None:
+        super().__init__(name)
+        self.level = level
+        self.base = base
+        self.numerator = numerator
+        self.denominator = denominator
+        self._pattern: tuple[bool, ...] | None = None
+        if denominator <= SAMPLING_PATTERN_LIMIT:
+            self._pattern = tuple(
+                (i * numerator) % denominator < numerator for i in range(denominator)
+            )
+        #: The function making the next decision for each logger name
+        self._deciders: dict[str, Callable[[], bool]] = {}
+
+    def _decider(self, name: str) -> Callable[[], bool]:
+        # `next()` on a `cycle` or `count` is atomic under the GIL, and
+        # `setdefault()` makes threads racing on a new logger share a decider
+        decide: Callable[[], bool]
+        if self._pattern is not None:
+            decide = cycle(self._pattern).__next__
+        else:
+            counter = count()
+            numerator, denominator = self.numerator, self.denominator
+
+            def decide() -> bool:
+                return (next(counter) * numerator) % denominator < numerator
+
+        return self._deciders.setdefault(name, decide)
+
+    @classmethod
+    def for_level(cls, level: SampledLevel, name: str = "") -> SamplingFilter:
+        """
+        Return a filter implementing the sampling of ``level`` for the logger
+        named ``name`` and its descendants
+        """
+        return cls(
+            int(level), level.base, level.rate_numerator, level.rate_denominator, name
+        )
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.level <= record.levelno < self.base:
+            return True
+        elif self.nlen and not super().filter(record):
+            # A record from outside the sampled loggers
+            return True
+        try:
+            decide = self._deciders[record.name]
+        except KeyError:
+            decide = self._decider(record.name)
+        return decide()
+
+
+def parse_logger_levels(parser: LevelParser, spec: str) -> LoggerLevelPlan:
+    """
+    Parse a comma-separated list of ``LOGGER=LEVEL`` entries into a
+    ``LoggerLevelPlan``, resolving each level with ``parser``.  An entry
+    without a logger name, or with a logger name of ``root``, sets the level of
+    the root logger.  If a logger is named more than once, the last entry wins.
+
+    :raises ValueError: if any entries are invalid; the message describes all
+        of them
+    """
+    levels: dict[str, int] = {}
+    errors: list[str] = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, eq, value = entry.rpartition("=")
+        name = name.strip()
+        if eq and not name:
+            errors.append(f"{entry!r}: missing logger name")
+            continue
+        if name == ROOT_NAME:
+            name = ""
+        lv = parser.resolve(value.strip())
+        if lv is None:
+            errors.append(parser.error_message(value.strip()))
+        else:
+            # Reinsert so that the order reflects the last assignment
+            levels.pop(name, None)
+            levels[name] = lv
+    if errors:
+        raise ValueError("; ".join(errors))
+    return LoggerLevelPlan(tuple(levels.items()))
+
+
+def complete_logger_levels(parser: LevelParser, incomplete: str) -> Iterator[str]:
+    """
+    Complete the level in the last entry of a partial ``LOGGER=LEVEL,...``
+    spec.  Nothing is completed until the last entry contains an ``=``.
+    """
+    head, eq, level = incomplete.rpartition("=")
+    if eq and "," not in level:
+        for lv in parser.get_completions(level):
+            yield head + eq + lv
+
+
+class LoggerLevelsMixin:
+    """
+    The framework-independent implementation of ``LoggerLevels`` and
+    ``AsyncLoggerLevels``.  Subclasses also inherit from the ``ParamType`` of
+    their framework and set ``completion_item`` to its ``CompletionItem``
+    class.
+    """
+
+    name = "logger-levels"
+
+    completion_item: Any
+
+    if TYPE_CHECKING:
+
+        def fail(
+            self, message: str, param: Any = None, ctx: Any = None
+        ) -> NoReturn: ...
+
+    def __init__(
+        self,
+        extra: Iterable[str] | Mapping[str, int] | None = None,
+        *,
+        live: bool = False,
+        abbrev: bool = False,
+        aliases: Mapping[str, str] | None = None,
+    ) -> None:
+        self.parser = get_level_parser(extra, live=live, abbrev=abbrev, aliases=aliases)
+
+    def convert(
+        self, value: str | LoggerLevelPlan, param: Any, ctx: Any
+    ) -> LoggerLevelPlan:
+        if isinstance(value, LoggerLevelPlan):
+            return value
+        try:
+            return parse_logger_levels(self.parser, value)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+    def get_metavar(self, param: Any, ctx: Any = None) -> str:  # noqa: U100
+        return "LOGGER=LEVEL,..."
+
+    def shell_complete(self, _ctx: Any, _param: Any, incomplete: str) -> list[Any]:
+        return [
+            self.completion_item(c)
+            for c in complete_logger_levels(self.parser, incomplete)
+        ]
+
+
+class LevelConfigFileMixin:
+    """
+    The framework-independent implementation of ``LevelConfigFile`` and
+    ``AsyncLevelConfigFile``.  Subclasses also inherit from the ``ParamType``
+    of their framework and set ``completion_item`` to its ``CompletionItem``
+    class.
+    """
+
+    name = "level-config"
+
+    completion_item: Any
+
+    if TYPE_CHECKING:
+
+        def fail(
+            self, message: str, param: Any = None, ctx: Any = None
+        ) -> NoReturn: ...
+
+    def __init__(
+        self,
+        extra: Iterable[str] | Mapping[str, int] | None = None,
+        *,
+        live: bool = False,
+        abbrev: bool = False,
+        aliases: Mapping[str, str] | None = None,
+        cache_dir: str | os.PathLike[str] | Literal[False] | None = None,
+    ) -> None:
+        self.parser = get_level_parser(extra, live=live, abbrev=abbrev, aliases=aliases)
+        self.cache_dir = cache_dir
+
+    def convert(
+        self, value: str | os.PathLike[str] | LoggerLevelPlan, param: Any, ctx: Any
+    ) -> LoggerLevelPlan:
+        if isinstance(value, LoggerLevelPlan):
+            return value
+        # Imported here so that merely defining a command stays cheap
+        from .config import default_cache_dir, load_level_config
+
+        cache_dir: str | os.PathLike[str] | None
+        if self.cache_dir is None:
+            cache_dir = default_cache_dir()
+        elif self.cache_dir is False:
+            cache_dir = None
+        else:
+            cache_dir = self.cache_dir
+        try:
+            return load_level_config(self.parser, value, cache_dir)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+        except OSError as e:
+            self.fail(f"{os.fsdecode(value)!r}: {e.strerror}", param, ctx)
+
+    def get_metavar(self, param: Any, ctx: Any = None) -> str:  # noqa: U100
+        return "FILE"
+
+    def shell_complete(self, _ctx: Any, _param: Any, incomplete: str) -> list[Any]:
+        return [self.completion_item(incomplete, type="file")]
+
+
+def set_level_floor(level: int) -> None:
+    """
+    Make ``level`` a hard floor for all logging in the process: calls at lower
+    levels are suppressed by ``logging.disable()`` regardless of the levels
+    of individual loggers.  A ``level`` of ``NOTSET`` or lower removes the
+    floor.
+    """
+    logging.disable(max(level - 1, logging.NOTSET))
+
+
+def prime_logger_caches(levels: Iterable[int]) -> int:
+    """
+    Fill the ``isEnabledFor()`` caches of the root logger and of every logger
+    that currently exists for each of ``levels``, so that the first call at
+    each level on each logger does not have to take the ``logging`` lock and
+    walk the logger hierarchy.  Returns the number of loggers primed.
+
+    The caches are cleared again by any later call to ``Logger.setLevel()``,
+    ``logging.disable()``, or ``LoggerLevelPlan.apply()``, so this should be
+    called after all levels have been configured.
+    """
+    levels = tuple(levels)
+    loggers = [logging.getLogger()]
+    loggers.extend(
+        lgr
+        for lgr in list(logging.Logger.manager.loggerDict.values())
+        if isinstance(lgr, logging.Logger)
+    )
+    for lgr in loggers:
+        for lv in levels:
+            lgr.isEnabledFor(lv)
+    return len(loggers)
+
+
+def apply_level(
+    logger: str = "", *, floor: bool | None = None, prime: bool = True
+) -> Callable[[Any, Any, int | None], int | None]:
+    """
+    Return a callback for a ``LogLevel`` or ``AsyncLogLevel`` option that
+    sets the level of the logger named ``logger`` (the root logger by
+    default) to the option's value.  If ``floor`` is true, the value is also
+    made a process-wide floor with ``set_level_floor()``; as the floor
+    applies to every logger, ``floor`` defaults to true only when ``logger``
+    is the root logger.  If ``prime`` is
+    true, ``prime_logger_caches()`` is then called for all of the levels
+    recognized by the option's type.  If the value is a ``SampledLevel``, a
+    ``SamplingFilter`` for it is added to each handler that the logger's
+    records reach, i.e., the handlers of the logger and (as far as
+    propagation goes) of its ancestors, so handlers have to be configured
+    before the callback runs.  The filters sample only the records of the
+    logger & its descendants, and they replace those added for the logger by
+    an earlier call.  Nothing is done during shell completion or if the
+    option has no value.
+    """
+
+    def callback(ctx: Any, param: Any, value: int | None) -> int | None:
+        if ctx.resilient_parsing or value is None:
+            return value
+        lgr = logging.getLogger(logger or None)
+        lgr.setLevel(value)
+        _set_sampling(lgr, value if isinstance(value, SampledLevel) else None)
+        if floor or (floor is None and lgr is logging.root):
+            set_level_floor(value)
+        if prime:
+            parser = getattr(param.type, "parser", None)
+            if isinstance(parser, LevelParser):
+                levels: Iterable[int] = parser.sorted_values
+            else:
+                levels = (getattr(logging, lv) for lv in LEVELS)
+            prime_logger_caches(levels)
+        return value
+
+    return callback
+
+
+def _set_sampling(lgr: logging.Logger, level: SampledLevel | None) -> None:
+    # The filter name is the one `logging.Filter` matches against, i.e., the
+    # empty string for the root logger
+    name = "" if lgr is logging.root else lgr.name
+    c: logging.Logger | None = lgr
+    while c is not None:
+        for h in c.handlers:
+            for f in list(h.filters):
+                if isinstance(f, SamplingFilter) and f.name == name:
+                    h.removeFilter(f)
+            if level is not None:
+                # Each handler gets its own filter so that each one keeps the
+                # requested fraction of the records it sees
+                h.addFilter(SamplingFilter.for_level(level, name))
+        c = c.parent if c.propagate else None
+
+
+class QueueLogging:
+    """
+    Moves the work of emitting the records of a logger (the root logger by
+    default) off of the calling thread: ``start()`` attaches a
+    ``QueueHandler`` to the logger and starts a ``QueueListener`` that passes
+    the queued records to the real handlers in a background thread, and
+    ``stop()`` processes any records still queued, stops the thread, and
+    restores the logger's handlers.
+
+    If ``handlers`` is given, those handlers are fed by the queue and the
+    logger's existing handlers are left in place.  Otherwise, the logger's
+    existing handlers are moved behind the queue.  If the logger has none, a
+    ``StreamHandler`` writing to ``sys.stderr`` is used for the root logger,
+    while a named logger is left alone, as its records already reach its
+    ancestors' handlers through propagation.  If ``level`` is
+    given, it is set on the logger by ``start()``.  Handler levels are
+    respected by the listener.
+    """
+
+    def __init__(
+        self,
+        logger: str = "",
+        handlers: Iterable[logging.Handler] | None = None,
+        *,
+        level: int | None = None,
+    ) -> None:
+        self.logger = logging.getLogger(logger or None)
+        self.handlers = list(handlers) if handlers is not None else None
+        self.level = level
+        self._moved: list[logging.Handler] = []
+        self._queue_handler: QueueHandler | None = None
+        self._listener: QueueListener | None = None
+
+    def __enter__(self) -> QueueLogging:
+        self.start()
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        # Imported here so that importing this module stays cheap
+        from logging.handlers import QueueHandler, QueueListener
+        from queue import SimpleQueue
+
+        if self._listener is not None:
+            return
+        if self.level is not None:
+            self.logger.setLevel(self.level)
+        if self.handlers is not None:
+            targets = self.handlers
+        elif self.logger.handlers:
+            self._moved = list(self.logger.handlers)
+            for h in self._moved:
+                self.logger.removeHandler(h)
+            targets = self._moved
+        elif self.logger is logging.root:
+            targets = [logging.StreamHandler()]
+        else:
+            return
+        q: SimpleQueue[logging.LogRecord] = SimpleQueue()
+        self._queue_handler = QueueHandler(q)
+        self._listener = QueueListener(q, *targets, respect_handler_level=True)
+        self.logger.addHandler(self._queue_handler)
+        self._listener.start()
+
+    def stop(self) -> None:
+        """
+        Emit all records still in the queue, stop the background thread, and
+        restore the logger's original handlers.  Calling ``stop()`` more than
+        once is harmless.
+        """
+        if self._listener is None:
+            return
+        assert self._queue_handler is not None
+        self.logger.removeHandler(self._queue_handler)
+        self._listener.stop()
+        for h in self._moved:
+            self.logger.addHandler(h)
+        self._moved = []
+        self._queue_handler = None
+        self._listener = None
+
+
+#: The active override, as a ``(level, logger name, logger name + ".")``
+#: triple, or ``None``
+_override: ContextVar[tuple[int, str, str] | None] = ContextVar(
+    "click_loglevel_override", default=None
+)
+_override_lock = Lock()
+#: Number of root-logger ``LevelOverride``s currently entered, across all
+#: threads & tasks
+_override_depth = 0
+#: The original & wrapped ``Logger.isEnabledFor()`` while the wrapper is in
+#: place
+_override_hook: tuple[Any, Any] | None = None
+#: Number of ``LevelOverride``s currently entered for each named logger
+_override_targets: dict[str, int] = {}
+#: The loggers whose own ``isEnabledFor`` attribute has been replaced by
+#: ``_logger_hook()``, by name, along with the attribute replaced
+_hooked_loggers: dict[str, tuple[logging.Logger, Any]] = {}
+#: The original & wrapped ``Manager.getLogger()`` while named overrides are
+#: entered
+_get_logger_hook: tuple[Any, Any] | None = None
+
+
+def _honors_override(name: str, level: int) -> bool:
+    ov = _override.get()
+    return (
+        ov is not None
+        and level >= ov[0]
+        and (not ov[1] or name == ov[1] or name.startswith(ov[2]))
+    )
+
+
+def _enter_override(logger: str) -> None:
+    global _override_depth
+    with _override_lock:
+        if not logger:
+            if _override_depth == 0:
+                _install_override_hook()
+            _override_depth += 1
+        elif logger in _override_targets:
+            _override_targets[logger] += 1
+        else:
+            _override_targets[logger] = 1
+            _hook_loggers(logger)
+
+
+def _exit_override(logger: str) -> None:
+    global _override_depth
+    with _override_lock:
+        if not logger:
+            _override_depth -= 1
+            if _override_depth == 0:
+                _remove_override_hook()
+        else:
+            _override_targets[logger] -= 1
+            if _override_targets[logger] == 0:
+                del _override_targets[logger]
+                _unhook_loggers()
+
+
+def _install_override_hook() -> None:
+    """
+    Wrap ``Logger.isEnabledFor()`` so that it also honors the override in
+    ``_override``.  Must be called with ``_override_lock`` held.
+    """
+    global _override_hook
+    if _override_hook is not None:
+        return
+    is_enabled_for = logging.Logger.isEnabledFor
+
+    @wraps(is_enabled_for)
+    def hooked(self: logging.Logger, level: int) -> bool:
+        return _honors_override(self.name, level) or is_enabled_for(self, level)
+
+    logging.Logger.isEnabledFor = hooked  # type: ignore[method-assign]
+    _override_hook = (is_enabled_for, hooked)
+
+
+def _remove_override_hook() -> None:
+    """
+    Put back the ``Logger.isEnabledFor()`` that ``_install_override_hook()``
+    wrapped.  Must be called with ``_override_lock`` held.
+    """
+    global _override_hook
+    if _override_hook is None:
+        return
+    is_enabled_for, hooked = _override_hook
+    # If something else has wrapped the method since, removing our wrapper
+    # would remove theirs as well, so it stays in place
+    if logging.Logger.isEnabledFor is hooked:
+        logging.Logger.isEnabledFor = is_enabled_for  # type: ignore[method-assign]
+        _override_hook = None
+
+
+def _overridden(name: str) -> bool:
+    # Whether the logger named `name` is covered by an entered named override
+    return any(
+        name == target or name.startswith(target + ".") for target in _override_targets
+    )
+
+
+def _hook_loggers(target: str) -> None:
+    """
+    Make the logger named ``target`` and its descendants honor the override
+    in ``_override``, including those created later.  Must be called with
+    ``_override_lock`` held.
+    """
+    global _get_logger_hook
+    prefix = target + "."
+    for name, lgr in list(logging.Logger.manager.loggerDict.items()):
+        if (name == target or name.startswith(prefix)) and isinstance(
+            lgr, logging.Logger
+        ):
+            _hook_logger(lgr)
+    if _get_logger_hook is None:
+        get_logger = logging.Manager.getLogger
+
+        @wraps(get_logger)
+        def hooked(self: logging.Manager, name: str) -> logging.Logger:
+            lgr = get_logger(self, name)
+            if name not in _hooked_loggers and _override_targets:
+                with _override_lock:
+                    if _overridden(name):
+                        _hook_logger(lgr)
+            return lgr
+
+        logging.Manager.getLogger = hooked  # type: ignore[method-assign]
+        _get_logger_hook = (get_logger, hooked)
+
+
+def _hook_logger(lgr: logging.Logger) -> None:
+    """
+    Replace the ``isEnabledFor`` attribute of ``lgr`` alone with a wrapper
+    that honors the override in ``_override``, so that loggers outside any
+    named override keep the plain method.  Must be called with
+    ``_override_lock`` held.
+    """
+    if lgr.name in _hooked_loggers:
+        return
+    is_enabled_for = lgr.isEnabledFor
+
+    def hooked(level: int) -> bool:
+        return _honors_override(lgr.name, level) or is_enabled_for(level)
+
+    previous = lgr.__dict__.get("isEnabledFor")
+    lgr.isEnabledFor = hooked  # type: ignore[method-assign]
+    _hooked_loggers[lgr.name] = (lgr, previous)
+
+
+def _unhook_loggers() -> None:
+    """
+    Restore the ``isEnabledFor`` attributes of the loggers no longer covered
+    by any named override.  Must be called with ``_override_lock`` held.
+    """
+    global _get_logger_hook
+    for name, (lgr, previous) in list(_hooked_loggers.items()):
+        if not _overridden(name):
+            if previous is None:
+                del lgr.isEnabledFor
+            else:
+                lgr.isEnabledFor = previous  # type: ignore[method-assign]
+            del _hooked_loggers[name]
+    if not _override_targets and _get_logger_hook is not None:
+        get_logger, hooked = _get_logger_hook
+        if logging.Manager.getLogger is hooked:
+            logging.Manager.getLogger = get_logger  # type: ignore[method-assign]
+            _get_logger_hook = None
+
+
+class LevelOverride:
+    """
+    A context manager & decorator that, for the code running inside it,
+    enables logging at ``level`` and above on the logger named ``logger``
+    (the root logger, and thus every logger, by default) and its descendants,
+    regardless of the loggers' configured levels and of any
+    ``set_level_floor()``.
+
+    The override is stored in a ``contextvars.ContextVar``, so it applies
+    only to the current thread or ``asyncio`` task (and to tasks created from
+    within it while it is entered), and concurrent requests handled by other
+    tasks keep the normal levels.  It is honored by wrappers around
+    ``isEnabledFor()`` that are only in place while an override is entered
+    somewhere in the process, and only on the loggers that it covers: the
+    overridden logger & its descendants, or for the root logger, the
+    ``Logger.isEnabledFor()`` method of every logger.  Other logging calls
+    cost nothing extra.  Records let through by an override
+    are still subject to the levels & filters of the handlers, so handlers
+    that should receive them need a level of ``NOTSET`` or lower than
+    ``level``.
+
+    As a decorator, ``LevelOverride`` wraps both plain and ``async``
+    functions, applying a fresh copy of itself to each call.  An instance
+    used with ``with`` must not be entered by several tasks at once.
+    """
+
+    def __init__(self, level: int, logger: str = "") -> None:
+        self.level = level
+        self.logger = "" if logger == ROOT_NAME else logger
+        self._tokens: list[Token[tuple[int, str, str] | None]] = []
+
+    def __enter__(self) -> LevelOverride:
+        _enter_override(self.logger)
+        self._tokens.append(_override.set((self.level, self.logger, self.logger + ".")))
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        _override.reset(self._tokens.pop())
+        _exit_override(self.logger)
+
+    def __call__(self, func: F) -> F:
+        level, logger = self.level, self.logger
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapped(*args: Any, **kwargs: Any) -> Any:
+                with LevelOverride(level, logger):
+                    return await func(*args, **kwargs)
+
+            return cast(F, async_wrapped)
+        else:
+
+            @wraps(func)
+            def wrapped(*args: Any, **kwargs: Any) -> Any:
+                with LevelOverride(level, logger):
+                    return func(*args, **kwargs)
+
+            return cast(F, wrapped)
+
+
+def current_override() -> tuple[int, str] | None:
+    """
+    Return the level & logger name of the ``LevelOverride`` active in the
+    current context, or ``None`` if there is none
+    """
+    ov = _override.get()
+    return None if ov is None else (ov[0], ov[1])
@@ -0,0 +1,226 @@
+"""
+Custom levels provided by entry-point plugins
+
+Installed distributions can contribute custom levels to a ``LevelParser`` by
+declaring entry points in a group chosen by the application, e.g.::
+
+    [project.entry-points."myapp.log_levels"]
+    TRACE = "myapp_trace.levels"
+    VERBOSE = "myapp_extras.levels:VERBOSE"
+
+The name of each entry point is the name of a level.  The object it refers to
+is either the level's integer value or (as for a bare module) anything whose
+import registers the level with ``logging.addLevelName()``.
+
+A ``PluginLevelParser`` only reads the names & object references of the entry
+points at first, and this index is cached on disk, one entry per group,
+together with the entries of ``sys.path`` & their modification times, so that
+scanning the metadata of every installed distribution does not slow down each
+launch.  A plugin is only
+imported when a value that the parser does not otherwise recognize is the
+name of one of its entry points.  Completion offers the names of unloaded
+plugin levels without importing anything.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+import hashlib
+from heapq import merge
+import os
+from pathlib import Path
+import sys
+from threading import Lock
+from typing import Any
+from .core import LiveLevelParser, _registry_lock
+
+#: Version of the on-disk index format; bump when it changes
+CACHE_VERSION = 2
+
+
+def discover_levels(
+    group: str, cache_dir: str | os.PathLike[str] | None = None
+) -> dict[str, tuple[str, str]]:
+    """
+    Return a mapping from the uppercased names of the entry points in
+    ``group`` to pairs of the names as spelled in the metadata and the
+    entry points' object references.  If ``cache_dir`` is given, the index is
+    stored in & loaded from that directory; problems with the cache itself
+    are ignored.  If several distributions declare the same name, the first
+    one found on ``sys.path`` wins.
+    """
+    cache_file: Path | None = None
+    if cache_dir is not None:
+        cache_file = Path(cache_dir, "plugins", _cache_name(group) + ".json")
+        stamp = _cache_stamp()
+        index = _read_cache(cache_file, stamp)
+        if index is not None:
+            return index
+    from importlib.metadata import entry_points
+
+    index = {}
+    for ep in entry_points(group=group):
+        index.setdefault(ep.name.upper(), (ep.name, ep.value))
+    if cache_file is not None:
+        from .config import _write_json
+
+        # Replaces the entry from before something was installed or removed
+        _write_json(cache_file, {"stamp": stamp, "entry_points": list(index.values())})
+    return index
+
+
+def _cache_name(group: str) -> str:
+    key = repr((CACHE_VERSION, group))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _cache_stamp() -> list[list[Any]]:
+    # Lists, as that is what they come back from JSON as
+    paths: list[list[Any]] = []
+    for p in sys.path:
+        try:
+            # Installing or removing a distribution adds or removes a
+            # `*.dist-info` directory, which changes the mtime of its parent
+            mtime: int | None = os.stat(p or ".").st_mtime_ns
+        except OSError:
+            mtime = None
+        paths.append([p, mtime])
+    return paths
+
+
+def _read_cache(
+    cache_file: Path, stamp: list[list[Any]]
+) -> dict[str, tuple[str, str]] | None:
+    import json
+
+    try:
+        with cache_file.open(encoding="utf-8") as fp:
+            data = json.load(fp)
+        if data["stamp"] != stamp:
+            return None
+        return {
+            str(name).upper(): (str(name), str(value))
+            for name, value in data["entry_points"]
+        }
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+class PluginLevelParser(LiveLevelParser):
+    """
+    A ``LiveLevelParser`` that also recognizes the levels provided by the
+    entry points in ``group``, importing each plugin only when its level is
+    first looked up by name.
+
+    The index of entry points is read on the first lookup that misses (or the
+    first completion) rather than on construction.  ``cache_dir`` is the
+    directory for the on-disk index; ``None`` uses
+    ``click_loglevel.config.default_cache_dir()``, and ``False`` disables the
+    cache.
+
+    Until a plugin level has been loaded, it is not listed in ``metavar``, is
+    not stepped through by ``step()``, and cannot be abbreviated.  Errors
+    raised while importing a plugin propagate to the caller, and a plugin
+    that failed to load is not tried again.
+    """
+
+    __slots__ = ("_cache_dir", "_group", "_index", "_loaded", "_plugin_lock")
+
+    def __init__(
+        self,
+        group: str,
+        extra: Iterable[str] | Mapping[str, int] | None = None,
+        *,
+        cache_dir: str | os.PathLike[str] | None | bool = None,
+        metavar_limit: int | None = None,
+        abbrev: bool = False,
+        aliases: Mapping[str, str] | None = None,
+    ) -> None:
+        self._group = group
+        self._cache_dir = cache_dir
+        self._index: tuple[dict[str, tuple[str, str]], tuple[str, ...]] | None = None
+        self._loaded: frozenset[str] = frozenset()
+        self._plugin_lock = Lock()
+        super().__init__(
+            extra, metavar_limit=metavar_limit, abbrev=abbrev, aliases=aliases
+        )
+
+    @property
+    def group(self) -> str:
+        """The name of the entry point group that plugins are read from"""
+        return self._group
+
+    def _get_index(self) -> tuple[dict[str, tuple[str, str]], tuple[str, ...]]:
+        index = self._index
+        if index is None:
+            if self._cache_dir is None:
+                from .config import default_cache_dir
+
+                cache_dir: str | os.PathLike[str] | None = default_cache_dir()
+            elif self._cache_dir is False:
+                cache_dir = None
+            else:
+                assert not isinstance(self._cache_dir, bool)
+                cache_dir = self._cache_dir
+            levels = discover_levels(self._group, cache_dir)
+            # Assigned as a single object so that racing threads never see a
+            # half-built index
+            index = self._index = (levels, tuple(sorted(levels)))
+        return index
+
+    def _load_plugin(self, value: str) -> bool:
+        """
+        If ``value`` names an entry point that has not been loaded yet, load
+        it and merge in its level, returning true; otherwise, return false
+        """
+        key = value.upper()
+        if key in self._loaded:
+            return False
+        entry = self._get_index()[0].get(key)
+        if entry is None:
+            return False
+        with self._plugin_lock:
+            if key in self._loaded:
+                # Another thread loaded it while we waited
+                return True
+            from importlib.metadata import EntryPoint
+
+            name, ref = entry
+            try:
+                obj = EntryPoint(name=name, value=ref, group=self._group).load()
+            finally:
+                # A plugin that fails to import is not retried
+                self._loaded = self._loaded | {key}
+        self._check_registry()
+        if isinstance(obj, int) and key not in self._tables.levels:
+            with _registry_lock:
+                self._merge([(obj, name)])
+        return True
+
+    def parse(self, value: str) -> int:
+        try:
+            return super().parse(value)
+        except KeyError:
+            if not self._load_plugin(value):
+                raise
+            return super().parse(value)
+
+    def resolve(self, value: str | int) -> int | None:
+        lv = super().resolve(value)
+        if lv is None and isinstance(value, str) and self._load_plugin(value):
+            lv = super().resolve(value)
+        return lv
+
+    def get_completions(self, incomplete: str) -> Iterator[str]:
+        names = self._get_index()[1]
+        key = incomplete.upper()
+        pending = []
+        for i in range(bisect_left(names, key), len(names)):
+            if not names[i].startswith(key):
+                break
+            pending.append(names[i])
+        prev = None
+        for name in merge(super().get_completions(incomplete), pending):
+            if name != prev:
+                yield name
+                prev = name
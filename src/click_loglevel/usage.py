@@ -0,0 +1,115 @@
+"""
+Persistent counts of the level names that users give
+
+Shells run a separate process for each completion request, so counts kept in
+memory (such as those collected by ``click_loglevel.instrument``) are always
+empty there.  A ``LevelUsage`` keeps the counts in a small JSON file instead,
+so that they survive from the invocations of a program to its completions.
+Pass one as the ``completion_usage`` argument of ``LogLevel`` or
+``AsyncLogLevel`` to both record the level names given on the command line
+and rank completions by them.
+"""
+
+from __future__ import annotations
+import atexit
+from collections import Counter
+from collections.abc import Mapping
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from types import MappingProxyType
+from typing import Any
+from .config import _write_json, default_cache_dir
+
+
+class LevelUsage:
+    """
+    Counts of the level names used by the program ``name``, stored in
+    :file:`usage/{name}.json` under ``cache_dir`` (default:
+    ``click_loglevel.config.default_cache_dir()``).  Calling an instance
+    returns the current counts, keyed by uppercased level name, as a
+    read-only mapping; the same mapping is returned until the counts change,
+    so that it only has to be ranked once.
+
+    Counts added with ``record()`` are kept in memory and written to the file
+    by ``flush()``, which is called by ``close()`` and when the interpreter
+    exits, so that a program records all of its level names with a single
+    write.  Concurrent updates from several processes can lose counts, which
+    only makes the ranking slightly less precise.  Problems reading or writing
+    the file are ignored.
+    """
+
+    def __init__(
+        self, name: str, cache_dir: str | os.PathLike[str] | None = None
+    ) -> None:
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        self.path = Path(cache_dir, "usage", name + ".json")
+        self._lock = Lock()
+        #: Counts recorded since the last flush
+        self._pending: Counter[str] = Counter()
+        #: Incremented whenever ``_pending`` changes
+        self._version = 0
+        #: The file's stat & ``_version`` that ``_counts`` was built from
+        self._key: tuple[Any, int] | None = None
+        self._counts: Mapping[str, int] = MappingProxyType({})
+        self._at_exit = False
+
+    def __call__(self) -> Mapping[str, int]:
+        with self._lock:
+            key = (self._stamp(), self._version)
+            if key != self._key:
+                counts = self._read()
+                for k, n in self._pending.items():
+                    counts[k] = counts.get(k, 0) + n
+                self._counts = MappingProxyType(counts)
+                self._key = key
+            return self._counts
+
+    def record(self, name: str) -> None:
+        """Add one to the count for the level name ``name``"""
+        with self._lock:
+            self._pending[name.upper()] += 1
+            self._version += 1
+            if not self._at_exit:
+                atexit.register(self.close)
+                self._at_exit = True
+
+    def flush(self) -> None:
+        """Add the counts recorded since the last flush to the file"""
+        with self._lock:
+            if not self._pending:
+                return
+            counts = self._read()
+            for k, n in self._pending.items():
+                counts[k] = counts.get(k, 0) + n
+            _write_json(self.path, {"counts": counts})
+            self._pending.clear()
+            self._version += 1
+
+    def close(self) -> None:
+        """
+        Flush the recorded counts.  Calling ``close()`` more than once is
+        harmless, and counts can still be recorded afterwards.
+        """
+        self.flush()
+        with self._lock:
+            if self._at_exit:
+                atexit.unregister(self.close)
+                self._at_exit = False
+
+    def _stamp(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read(self) -> dict[str, int]:
+        try:
+            with self.path.open(encoding="utf-8") as fp:
+                data = json.load(fp)
+            return {str(k): int(v) for k, v in data["counts"].items()}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return {}
@@ -0,0 +1,205 @@
+from __future__ import annotations
+import shutil
+import subprocess
+import click
+from click.testing import CliRunner
+import pytest
+from click_loglevel import LogLevel
+from click_loglevel.__main__ import main
+from click_loglevel.completion import completion_script
+from click_loglevel.core import LevelParser
+
+
+@click.group()
+@click.option("-l", "--log-level", type=LogLevel(extra={"VERBOSE": 15}))
+def cli(log_level: int | None) -> None:
+    pass
+
+
+@cli.command()
+@click.option("--sub-level", type=LogLevel(extra={"NOTICE": 25}))
+@click.option("--name")
+def sub(sub_level: int | None, name: str | None) -> None:
+    pass
+
+
+LEVEL_TYPE = LogLevel(extra={"QUIET": 60})
+
+
+def bash_complete(script: str, words: list[str]) -> list[str]:
+    """
+    Source ``script`` in bash and return the completions for the last word of
+    ``words``
+    """
+    code = (
+        script
+        + "COMP_WORDS=("
+        + " ".join(f"'{w}'" for w in words)
+        + ")\nCOMP_CWORD=$(( ${#COMP_WORDS[@]} - 1 ))\n"
+        + "COMPREPLY=()\n_my_prog_loglevel_completion\n"
+        + 'printf "%s\\n" "${COMPREPLY[@]}"\n'
+    )
+    r = subprocess.run(
+        ["bash", "--norc", "--noprofile"],
+        input=code,
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return [w for w in r.stdout.splitlines() if w]
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="bash not installed")
+@pytest.mark.parametrize(
+    "words,completions",
+    [
+        (
+            ["my-prog", "--log-level", ""],
+            ["CRITICAL", "DEBUG", "ERROR", "INFO", "NOTSET", "VERBOSE", "WARNING"],
+        ),
+        (["my-prog", "--log-level", "v"], ["VERBOSE"]),
+        (["my-prog", "-l", "IN"], ["INFO"]),
+        (["my-prog", "--log-level", "=", "de"], ["DEBUG"]),
+        (
+            ["my-prog", "--log-level", "="],
+            ["CRITICAL", "DEBUG", "ERROR", "INFO", "NOTSET", "VERBOSE", "WARNING"],
+        ),
+        (["my-prog", "--other", "de"], []),
+    ],
+)
+def test_bash_script(words: list[str], completions: list[str]) -> None:
+    script = completion_script(
+        "bash", "my-prog", [(["-l", "--log-level"], LevelParser({"VERBOSE": 15}))]
+    )
+    assert bash_complete(script, words) == completions
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="bash not installed")
+def test_bash_script_delegates() -> None:
+    script = completion_script("bash", "my-prog", [(["--log-level"], LevelParser())])
+    script = "_my_prog_completion() { COMPREPLY=(delegated); }\n" + script
+    assert bash_complete(script, ["my-prog", "--name", "x"]) == ["delegated"]
+
+
+def test_zsh_script() -> None:
+    script = completion_script(
+        "zsh", "my-prog", [(["-l", "--log-level"], LevelParser())]
+    )
+    assert "compdef _my_prog_loglevel_completion my-prog\n" in script
+    assert (
+        "compadd -M 'm:{a-z}={A-Z}' -- CRITICAL DEBUG ERROR INFO NOTSET WARNING\n"
+        in script
+    )
+    assert "        -l|--log-level)\n" in script
+    assert "        (-l|--log-level)=*)\n" in script
+    assert "(( $+functions[_my_prog_completion] ))" in script
+
+
+def test_fish_script() -> None:
+    script = completion_script(
+        "fish", "my-prog", [(["-l", "--log-level", "-lvl"], LevelParser())]
+    )
+    assert script.splitlines()[-1] == (
+        "complete -c my-prog -s l -l log-level -o lvl -x -a"
+        " 'CRITICAL DEBUG ERROR INFO NOTSET WARNING'"
+    )
+
+
+def test_unsupported_shell() -> None:
+    with pytest.raises(ValueError):
+        completion_script("tcsh", "my-prog", [(["--log-level"], LevelParser())])
+
+
+def test_cli_extra() -> None:
+    r = CliRunner().invoke(
+        main,
+        ["completion", "--shell", "fish", "--prog", "foo", "-e", "VERBOSE=15"],
+    )
+    assert r.exit_code == 0, r.output
+    assert r.output.splitlines()[-1] == (
+        "complete -c foo -l log-level -x -a"
+        " 'CRITICAL DEBUG ERROR INFO NOTSET VERBOSE WARNING'"
+    )
+
+
+def test_cli_extra_invalid() -> None:
+    r = CliRunner().invoke(
+        main, ["completion", "--shell", "fish", "--prog", "foo", "-e", "VERBOSE"]
+    )
+    assert r.exit_code != 0
+    assert "'VERBOSE': expected NAME=VALUE" in r.output
+
+
+def test_cli_from_command() -> None:
+    r = CliRunner().invoke(
+        main,
+        [
+            "completion",
+            "--shell",
+            "fish",
+            "--prog",
+            "foo",
+            "--from",
+            f"{__name__}:cli",
+        ],
+    )
+    assert r.exit_code == 0, r.output
+    assert r.output.splitlines()[2:] == [
+        "complete -c foo -s l -l log-level -x -a"
+        " 'CRITICAL DEBUG ERROR INFO NOTSET VERBOSE WARNING'",
+        "complete -c foo -l sub-level -x -a"
+        " 'CRITICAL DEBUG ERROR INFO NOTICE NOTSET WARNING'",
+    ]
+
+
+def test_cli_from_param_type() -> None:
+    r = CliRunner().invoke(
+        main,
+        [
+            "completion",
+            "--shell",
+            "fish",
+            "--prog",
+            "foo",
+            "-o",
+            "--level",
+            "--from",
+            f"{__name__}:LEVEL_TYPE",
+        ],
+    )
+    assert r.exit_code == 0, r.output
+    assert r.output.splitlines()[-1] == (
+        "complete -c foo -l level -x -a"
+        " 'CRITICAL DEBUG ERROR INFO NOTSET QUIET WARNING'"
+    )
+
+
+def test_cli_from_bad_object() -> None:
+    r = CliRunner().invoke(
+        main,
+        ["completion", "--shell", "fish", "--prog", "foo", "--from", "logging:INFO"],
+    )
+    assert r.exit_code != 0
+    assert "logging:INFO is not a command, LogLevel, or LevelParser" in r.output
+
+
+def test_cli_from_command_option_filter() -> None:
+    r = CliRunner().invoke(
+        main,
+        [
+            "completion",
+            "--shell",
+            "fish",
+            "--prog",
+            "foo",
+            "-o",
+            "--sub-level",
+            "--from",
+            f"{__name__}:cli",
+        ],
+    )
+    assert r.exit_code == 0, r.output
+    assert r.output.splitlines()[2:] == [
+        "complete -c foo -l sub-level -x -a"
+        " 'CRITICAL DEBUG ERROR INFO NOTICE NOTSET WARNING'",
+    ]
@@ -1,6 +1,8 @@
 from __future__ import annotations
+from pathlib import Path
 import pytest
-from click_loglevel.core import LevelParser
+from click_loglevel.core import LevelParser, _usage_order
+from click_loglevel.usage import LevelUsage
 
 
 @pytest.mark.parametrize(
@@ -35,8 +37,8 @@ def test_get_completions(incomplete: str, completions: list[str]) -> None:
         ("info", ["INFO"]),
         ("i", ["INFO"]),
         ("w", ["WARNING"]),
-        ("n", ["NOTSET", "NOTICE"]),
-        ("NOT", ["NOTSET", "NOTICE"]),
+        ("n", ["NOTICE", "NOTSET"]),
+        ("NOT", ["NOTICE", "NOTSET"]),
         ("NOTS", ["NOTSET"]),
         ("NOTI", ["NOTICE"]),
         ("D", ["DEBUG"]),
@@ -50,3 +52,114 @@ def test_get_completions(incomplete: str, completions: list[str]) -> None:
 def test_get_completions_extra(incomplete: str, completions: list[str]) -> None:
     parser = LevelParser(extra={"Verbose": 5, "Notice": 25})
     assert list(parser.get_completions(incomplete)) == completions
+
+
+def test_get_completions_sorted() -> None:
+    parser = LevelParser(extra={f"LEVEL{i}": 100 + i for i in range(1000)})
+    assert list(parser.get_completions("level99")) == [
+        "LEVEL99",
+        "LEVEL990",
+        "LEVEL991",
+        "LEVEL992",
+        "LEVEL993",
+        "LEVEL994",
+        "LEVEL995",
+        "LEVEL996",
+        "LEVEL997",
+        "LEVEL998",
+        "LEVEL999",
+    ]
+    assert list(parser.get_completions("")) == sorted(parser.levels)
+
+
+def test_ranked_completions() -> None:
+    parser = LevelParser(extra={f"LEVEL{i}": 100 + i for i in range(1000)})
+    usage = {"LEVEL500": 3, "LEVEL7": 5, "LEVEL42": 3, "INFO": 9, "LEV": 20}
+    assert list(parser.ranked_completions("", 10, usage)) == [
+        "NOTSET",
+        "DEBUG",
+        "INFO",
+        "WARNING",
+        "ERROR",
+        "CRITICAL",
+        "LEVEL7",
+        "LEVEL42",
+        "LEVEL500",
+        "LEVEL0",
+    ]
+    assert list(parser.ranked_completions("level5", 3, usage)) == [
+        "LEVEL500",
+        "LEVEL5",
+        "LEVEL50",
+    ]
+    assert list(parser.ranked_completions("e", None, {})) == ["ERROR"]
+    assert len(list(parser.ranked_completions("", None, usage))) == 1006
+
+
+def test_ranked_completions_instrument_usage() -> None:
+    from click_loglevel import instrument
+
+    parser = LevelParser(extra={"VERBOSE": 15, "VERY": 17})
+    instrument.reset()
+    instrument.enable()
+    try:
+        list(parser.parse_many(["very", "very", "verbose"]))
+    finally:
+        instrument.disable()
+        assert list(parser.ranked_completions("ve", 1)) == ["VERY"]
+        instrument.reset()
+    assert list(parser.ranked_completions("ve", 1)) == ["VERBOSE"]
+
+
+def test_level_usage(tmp_path: Path) -> None:
+    usage = LevelUsage("prog", tmp_path)
+    assert usage() == {}
+    usage.record("Verbose")
+    usage.record("VERBOSE")
+    usage.record("trace")
+    assert usage() == {"VERBOSE": 2, "TRACE": 1}
+    # Nothing is written until the counts are flushed
+    assert not usage.path.exists()
+    assert LevelUsage("prog", tmp_path)() == {}
+    usage.close()
+    usage.close()
+    assert LevelUsage("prog", tmp_path)() == {"VERBOSE": 2, "TRACE": 1}
+    assert LevelUsage("other", tmp_path)() == {}
+    usage.path.write_text("[")
+    assert usage() == {}
+    parser = LevelParser(extra={"VERBOSE": 15, "VERY": 17, "TRACE": 5})
+    usage.record("very")
+    assert list(parser.ranked_completions("ve", 1, usage())) == ["VERY"]
+    usage.close()
+    assert LevelUsage("prog", tmp_path)() == {"VERY": 1}
+
+
+def test_level_usage_snapshot(tmp_path: Path) -> None:
+    usage = LevelUsage("prog", tmp_path)
+    usage.record("info")
+    counts = usage()
+    assert usage() is counts
+    with pytest.raises(TypeError):
+        counts["INFO"] = 2  # type: ignore[index]
+    usage.record("info")
+    assert usage() == {"INFO": 2}
+    assert counts == {"INFO": 1}
+    usage.close()
+    counts = usage()
+    assert counts == {"INFO": 2}
+    assert usage() is counts
+    other = LevelUsage("prog", tmp_path)
+    other.record("debug")
+    other.close()
+    assert usage() == {"INFO": 2, "DEBUG": 1}
+
+
+def test_ranked_completions_sorts_usage_once() -> None:
+    parser = LevelParser(extra={"VERBOSE": 15, "VERY": 17})
+    usage = {"VERBOSE": 1, "VERY": 2}
+    assert list(parser.ranked_completions("ve", None, usage)) == ["VERY", "VERBOSE"]
+    order = _usage_order(usage)
+    assert order == ["VERY", "VERBOSE"]
+    assert list(parser.ranked_completions("v", None, usage)) == ["VERY", "VERBOSE"]
+    assert _usage_order(usage) is order
+    assert _usage_order(dict(usage)) is not order
@@ -0,0 +1,199 @@
+from __future__ import annotations
+import logging
+import os
+from pathlib import Path
+import shutil
+import click
+from click.testing import CliRunner
+import pytest
+from click_loglevel import LevelConfigFile
+from click_loglevel.config import default_cache_dir, load_level_config
+from click_loglevel.core import LevelParser
+from click_loglevel.loggers import LoggerLevelPlan
+
+DATA_DIR = Path(__file__).with_name("data") / "config"
+
+
+@pytest.mark.parametrize(
+    "filename,levels",
+    [
+        (
+            "levels.toml",
+            (
+                ("", logging.INFO),
+                ("app.db", 15),
+                ("urllib3", logging.WARNING),
+                ("app.web", logging.DEBUG),
+            ),
+        ),
+        (
+            "dictconfig.json",
+            (
+                ("", logging.WARNING),
+                ("app", logging.DEBUG),
+                ("app.db", 15),
+            ),
+        ),
+        (
+            "fileconfig.ini",
+            (
+                ("", logging.INFO),
+                ("app.db", 15),
+                ("App.Worker", logging.ERROR),
+            ),
+        ),
+    ],
+)
+def test_load_level_config(filename: str, levels: tuple[tuple[str, int], ...]) -> None:
+    parser = LevelParser(extra={"VERBOSE": 15})
+    plan = load_level_config(parser, DATA_DIR / filename)
+    assert plan == LoggerLevelPlan(levels)
+
+
+def test_load_level_config_invalid() -> None:
+    path = DATA_DIR / "invalid.json"
+    with pytest.raises(ValueError) as excinfo:
+        load_level_config(LevelParser(), path)
+    assert str(excinfo.value) == (
+        f"{path}: logger 'root': 'LOUD': invalid log level;"
+        " logger 'app': 1.5: invalid log level"
+    )
+
+
+def test_load_level_config_bool(tmp_path: Path) -> None:
+    path = tmp_path / "levels.json"
+    path.write_text('{"levels": {"app": true}}')
+    with pytest.raises(ValueError) as excinfo:
+        load_level_config(LevelParser(), path)
+    assert str(excinfo.value) == f"{path}: logger 'app': True: invalid log level"
+
+
+@pytest.mark.parametrize(
+    "filename,content",
+    [
+        (
+            "levels.toml",
+            "[loggers.app]\n"
+            'level = "INFO"\n'
+            "[loggers.app.db]\n"
+            'level = "DEBUG"\n'
+            "[loggers.app.db.pool]\n"
+            "propagate = false\n"
+            "[loggers.app.db.pool.conn]\n"
+            'level = "ERROR"\n'
+            "[levels]\n"
+            'urllib3.connectionpool = "WARNING"\n'
+            'urllib3.util.retry = "CRITICAL"\n',
+        ),
+        (
+            "levels.json",
+            '{"loggers": {"app": {"level": "INFO", "db": {"level": "DEBUG",'
+            ' "pool": {"propagate": false, "conn": {"level": "ERROR"}}}}},'
+            ' "levels": {"urllib3": {"connectionpool": "WARNING",'
+            ' "util.retry": "CRITICAL"}}}',
+        ),
+    ],
+)
+def test_load_level_config_nested(tmp_path: Path, filename: str, content: str) -> None:
+    path = tmp_path / filename
+    path.write_text(content)
+    plan = load_level_config(LevelParser(), path, None)
+    assert plan == LoggerLevelPlan(
+        (
+            ("app", logging.INFO),
+            ("app.db", logging.DEBUG),
+            ("app.db.pool.conn", logging.ERROR),
+            ("urllib3.connectionpool", logging.WARNING),
+            ("urllib3.util.retry", logging.CRITICAL),
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "filename,content,msg",
+    [
+        ("bad.json", "{", "Expecting property name"),
+        ("bad.json", "[]", "expected a table/object at the top level"),
+        ("bad.toml", "x = ", "Invalid value"),
+        ("bad.ini", "no section", "File contains no section headers"),
+        ("levels.yaml", "root: INFO", "unsupported configuration file type"),
+    ],
+)
+def test_load_level_config_malformed(
+    tmp_path: Path, filename: str, content: str, msg: str
+) -> None:
+    path = tmp_path / filename
+    path.write_text(content)
+    with pytest.raises(ValueError, match=f"^{path}: .*{msg}"):
+        load_level_config(LevelParser(), path)
+
+
+def test_load_level_config_cache(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    path = tmp_path / "levels.json"
+    path.write_text('{"levels": {"app": "INFO"}}')
+    parser = LevelParser()
+    plan = load_level_config(parser, path, cache_dir)
+    assert plan == LoggerLevelPlan((("app", logging.INFO),))
+    assert len(list(cache_dir.glob("*.json"))) == 1
+    # Same size & mtime: the cached result is used without reading the file
+    st = path.stat()
+    path.write_text('{"levels": {"app": "WARN"}}')
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert load_level_config(parser, path, cache_dir) == plan
+    # A different parser does not use the entry:
+    other = LevelParser(aliases={"WARN": "WARNING"})
+    assert load_level_config(other, path, cache_dir) == LoggerLevelPlan(
+        (("app", logging.WARNING),)
+    )
+    # A changed mtime invalidates the entry:
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    with pytest.raises(ValueError, match="'WARN': invalid log level"):
+        load_level_config(parser, path, cache_dir)
+    # Each file has a single entry, which is replaced when the file changes:
+    for i in range(3):
+        path.write_text(f'{{"levels": {{"app": {i}}}}}')
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + i))
+        assert load_level_config(parser, path, cache_dir) == LoggerLevelPlan(
+            (("app", i),)
+        )
+    assert len(list(cache_dir.glob("*.json"))) == 1
+    # A corrupt cache entry is ignored:
+    for f in cache_dir.glob("*.json"):
+        f.write_text("{")
+    path.write_text('{"levels": {"app": "INFO"}}')
+    assert load_level_config(parser, path, cache_dir) == plan
+
+
+def test_default_cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / "click-loglevel"
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / ".cache" / "click-loglevel"
+
+
+def test_level_config_file(tmp_path: Path) -> None:
+    @click.command()
+    @click.option(
+        "--log-config",
+        type=LevelConfigFile(extra={"VERBOSE": 15}, cache_dir=tmp_path / "cache"),
+    )
+    def cmd(log_config: LoggerLevelPlan | None) -> None:
+        click.echo(repr(log_config))
+
+    shutil.copy(DATA_DIR / "dictconfig.json", tmp_path)
+    for _ in range(2):
+        r = CliRunner().invoke(cmd, ["--log-config", str(tmp_path / "dictconfig.json")])
+        assert r.exit_code == 0, r.output
+        assert r.output == (
+            "LoggerLevelPlan(levels=(('', 30), ('app', 10), ('app.db', 15)))\n"
+        )
+    r = CliRunner().invoke(cmd, ["--log-config", str(DATA_DIR / "invalid.json")])
+    assert r.exit_code != 0
+    assert "'LOUD': invalid log level" in r.output
+    r = CliRunner().invoke(cmd, ["--log-config", str(tmp_path / "nonexistent.ini")])
+    assert r.exit_code != 0
+    assert "nonexistent.ini': No such file or directory" in r.output
+    r = CliRunner().invoke(cmd, ["--help"])
+    assert "--log-config FILE" in r.output
@@ -0,0 +1,194 @@
+from __future__ import annotations
+from collections.abc import Iterator
+import logging
+import os
+from pathlib import Path
+import signal
+import socket
+import tempfile
+import threading
+import click
+from click.testing import CliRunner
+import pytest
+from click_loglevel import LogLevel
+from click_loglevel.__main__ import main
+from click_loglevel.control import LevelControl, level_control, send_level
+from click_loglevel.core import LevelParser
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX") or not hasattr(signal, "SIGUSR1"),
+    reason="Requires Unix domain sockets and SIGUSR1",
+)
+
+LOGGER = "click_loglevel_test.control"
+
+
+@pytest.fixture
+def sockpath() -> Iterator[Path]:
+    # pytest's `tmp_path` can be too long for a Unix socket path
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir, "control.sock")
+
+
+@pytest.fixture(autouse=True)
+def restore_level() -> Iterator[None]:
+    logger = logging.getLogger(LOGGER)
+    level = logger.level
+    yield
+    logger.setLevel(level)
+
+
+def test_step() -> None:
+    control = LevelControl(LevelParser(extra={"VERBOSE": 15}), LOGGER)
+    control.set_level(logging.INFO)
+    assert control.step(-1) == 15
+    assert control.step(-1) == logging.DEBUG
+    assert control.step(-1) == logging.DEBUG
+    assert control.step(3) == logging.WARNING
+    assert control.step(10) == logging.CRITICAL
+    assert logging.getLogger(LOGGER).level == logging.CRITICAL
+
+
+def test_step_from_effective_level() -> None:
+    parent = logging.getLogger(LOGGER)
+    parent.setLevel(logging.ERROR)
+    child = logging.getLogger(LOGGER + ".child")
+    assert child.level == logging.NOTSET
+    control = LevelControl(LevelParser(), LOGGER + ".child")
+    assert control.step(-1) == logging.WARNING
+    assert child.level == logging.WARNING
+    child.setLevel(logging.NOTSET)
+
+
+def test_handle_request_custom_names() -> None:
+    # The level is known to the parser but not registered with `logging`
+    control = LevelControl(LevelParser(extra={"Chatty": 13}), LOGGER)
+    assert control.handle_request("chatty") == "Chatty"
+    assert control.handle_request("13") == "Chatty"
+    assert control.handle_request("14") == "Level 14"
+
+
+def test_handle_request() -> None:
+    control = LevelControl(LevelParser(abbrev=True), LOGGER)
+    control.set_level(logging.INFO)
+    assert control.handle_request("") == "INFO"
+    assert control.handle_request("debug\n") == "DEBUG"
+    assert control.handle_request("err") == "ERROR"
+    assert control.handle_request("35") == "Level 35"
+    assert control.handle_request("x") == "error: 'x': invalid log level"
+    assert control.level == 35
+
+
+def test_signals() -> None:
+    before = signal.getsignal(signal.SIGUSR1)
+    with LevelControl(LevelParser(), LOGGER) as control:
+        control.set_level(logging.WARNING)
+        os.kill(os.getpid(), signal.SIGUSR1)
+        assert control.level == logging.INFO
+        os.kill(os.getpid(), signal.SIGUSR2)
+        os.kill(os.getpid(), signal.SIGUSR2)
+        assert control.level == logging.ERROR
+    assert signal.getsignal(signal.SIGUSR1) is before
+
+
+def test_socket(sockpath: Path) -> None:
+    with LevelControl(
+        LevelParser(), LOGGER, socket_path=sockpath, signals=False
+    ) as control:
+        control.set_level(logging.INFO)
+        assert send_level(sockpath) == "INFO"
+        assert send_level(sockpath, "debug") == "DEBUG"
+        assert send_level(sockpath, logging.ERROR) == "ERROR"
+        with pytest.raises(ValueError) as excinfo:
+            send_level(sockpath, "nope")
+        assert str(excinfo.value) == "'nope': invalid log level"
+        assert control.level == logging.ERROR
+    assert not sockpath.exists()
+
+
+def test_socket_replaces_stale(sockpath: Path) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(os.fspath(sockpath))
+    assert sockpath.exists()
+    with LevelControl(LevelParser(), LOGGER, socket_path=sockpath, signals=False):
+        assert send_level(sockpath) == "NOTSET"
+
+
+def test_socket_keeps_other_file(sockpath: Path) -> None:
+    sockpath.write_text("precious\n")
+    before = signal.getsignal(signal.SIGUSR1)
+    control = LevelControl(LevelParser(), LOGGER, socket_path=sockpath)
+    with pytest.raises(FileExistsError):
+        control.start()
+    assert sockpath.read_text() == "precious\n"
+    assert signal.getsignal(signal.SIGUSR1) is before
+
+
+def test_start_off_main_thread(sockpath: Path) -> None:
+    control = LevelControl(LevelParser(), LOGGER, socket_path=sockpath)
+    errors: list[Exception] = []
+
+    def run() -> None:
+        try:
+            control.start()
+        except Exception as e:
+            errors.append(e)
+
+    before = {t.name for t in threading.enumerate()}
+    t = threading.Thread(target=run)
+    t.start()
+    t.join()
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+    assert not sockpath.exists()
+    assert {t.name for t in threading.enumerate()} == before
+    # Without signals, a control can be started from any thread
+    control = LevelControl(LevelParser(), LOGGER, socket_path=sockpath, signals=False)
+    t = threading.Thread(target=control.start)
+    t.start()
+    t.join()
+    try:
+        assert send_level(sockpath, "info") == "INFO"
+    finally:
+        control.stop()
+    assert not sockpath.exists()
+
+
+def test_set_level_command(sockpath: Path) -> None:
+    with LevelControl(LevelParser(), LOGGER, socket_path=sockpath, signals=False):
+        r = CliRunner().invoke(main, ["set-level", str(sockpath), "warning"])
+        assert r.exit_code == 0, r.output
+        assert r.output == "WARNING\n"
+        r = CliRunner().invoke(main, ["set-level", str(sockpath)])
+        assert r.exit_code == 0, r.output
+        assert r.output == "WARNING\n"
+        r = CliRunner().invoke(main, ["set-level", str(sockpath), "nope"])
+        assert r.exit_code == 1
+        assert "Error: 'nope': invalid log level" in r.output
+    r = CliRunner().invoke(main, ["set-level", str(sockpath), "info"])
+    assert r.exit_code == 1
+    assert "Error: Could not connect to" in r.output
+
+
+def test_level_control_option(sockpath: Path) -> None:
+    @click.command()
+    @click.option(
+        "-l",
+        "--log-level",
+        type=LogLevel(),
+        default="INFO",
+        callback=level_control(LOGGER, socket_path=sockpath),
+    )
+    def cmd(log_level: int) -> None:
+        ctx = click.get_current_context()
+        control = ctx.meta["click_loglevel.control"]
+        assert control.level == log_level
+        assert send_level(sockpath, "error") == "ERROR"
+        os.kill(os.getpid(), signal.SIGUSR1)
+        click.echo(logging.getLevelName(logging.getLogger(LOGGER).level))
+
+    before = signal.getsignal(signal.SIGUSR1)
+    r = CliRunner().invoke(cmd, ["-l", "debug"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "WARNING\n"
+    assert not sockpath.exists()
+    assert signal.getsignal(signal.SIGUSR1) is before
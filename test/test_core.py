@@ -0,0 +1,457 @@
+from __future__ import annotations
+from collections.abc import Iterator
+import logging
+import pickle
+import pytest
+from click_loglevel.core import (
+    STANDARD_ALIASES,
+    CacheStats,
+    ConvertCache,
+    LevelInfo,
+    LevelParser,
+    LiveLevelParser,
+    ParseResult,
+    SampledLevel,
+    get_convert_cache,
+    get_level_parser,
+    parse_sampling_rate,
+)
+
+
+def test_levels_immutable() -> None:
+    parser = LevelParser(extra={"VERBOSE": 15})
+    with pytest.raises(TypeError):
+        parser.levels["QUIET"] = 60  # type: ignore[index]
+
+
+@pytest.mark.parametrize(
+    "attr,value",
+    [
+        ("levels", {}),
+        ("sorted_names", ()),
+        ("sorted_values", ()),
+        ("metavar", "[X]"),
+        ("metavar_limit", 3),
+        ("abbrev", True),
+        ("aliases", {}),
+        ("something_new", 1),
+    ],
+)
+def test_parser_attributes_read_only(attr: str, value: object) -> None:
+    parser = LevelParser(aliases={"W": "WARNING"})
+    with pytest.raises(AttributeError):
+        setattr(parser, attr, value)
+    with pytest.raises(TypeError):
+        parser.aliases["X"] = "INFO"  # type: ignore[index]
+
+
+def test_get_level_parser_shared() -> None:
+    p1 = get_level_parser({"VERBOSE": 15, "NOTICE": 25})
+    p2 = get_level_parser({"VERBOSE": 15, "NOTICE": 25})
+    assert p1 is p2
+    assert get_level_parser() is get_level_parser(None)
+    assert get_level_parser({"VERBOSE": 16}) is not p1
+
+
+def test_get_level_parser_names_resolved() -> None:
+    logging.addLevelName(17, "CLTEST_SHARED")
+    p1 = get_level_parser(["CLTEST_SHARED"])
+    assert p1 is get_level_parser(iter(["CLTEST_SHARED"]))
+    assert p1 is get_level_parser({"CLTEST_SHARED": 17})
+    assert p1.parse("cltest_shared") == 17
+    logging.addLevelName(18, "CLTEST_SHARED")
+    p2 = get_level_parser(["CLTEST_SHARED"])
+    assert p2 is not p1
+    assert p2.parse("cltest_shared") == 18
+
+
+@pytest.mark.parametrize(
+    "value,level",
+    [
+        ("INFO", logging.INFO),
+        ("info", logging.INFO),
+        ("Verbose", 15),
+        (42, 42),
+        ("42", 42),
+        (" 42 ", 42),
+        ("+42", 42),
+        ("-3", -3),
+        ("1_000", 1000),
+        ("1__000", None),
+        ("_1", None),
+        ("", None),
+        ("-", None),
+        ("4 2", None),
+        ("x", None),
+        ("logging.INFO", None),
+        (" info ", None),
+    ],
+)
+def test_resolve(value: str | int, level: int | None) -> None:
+    parser = LevelParser(extra={"VERBOSE": 15})
+    assert parser.resolve(value) == level
+
+
+def test_parse_many() -> None:
+    parser = LevelParser(extra={"VERBOSE": 15})
+    values: Iterator[str | int] = iter(["info", "bogus", 42, " 15 ", "verbose", ""])
+    results = parser.parse_many(values)
+    assert next(results) == ParseResult("info", logging.INFO, None)
+    assert next(results) == ParseResult("bogus", None, "'bogus': invalid log level")
+    assert list(results) == [
+        ParseResult(42, 42, None),
+        ParseResult(" 15 ", 15, None),
+        ParseResult("verbose", 15, None),
+        ParseResult("", None, "'': invalid log level"),
+    ]
+    # The input iterator is consumed lazily:
+    assert list(values) == []
+
+
+def test_live_level_parser() -> None:
+    static = LevelParser(extra={"VERBOSE": 15})
+    parser = LiveLevelParser(extra={"VERBOSE": 15})
+    assert parser.resolve("cltest_live") is None
+    logging.addLevelName(23, "CLTEST_LIVE")
+    logging.addLevelName(24, "Cltest_Live_Too")
+    assert parser.resolve("cltest_live") == 23
+    assert parser.parse("CLTEST_LIVE_TOO") == 24
+    assert list(parser.get_completions("cltest_l")) == [
+        "CLTEST_LIVE",
+        "CLTEST_LIVE_TOO",
+    ]
+    # Levels registered by other tests come between the two groups
+    assert parser.metavar.startswith(
+        "[NOTSET|DEBUG|INFO|WARNING|ERROR|CRITICAL|VERBOSE|"
+    )
+    assert parser.metavar.endswith("|CLTEST_LIVE|Cltest_Live_Too]")
+    assert static.resolve("cltest_live") is None
+    # Redefinitions update the existing entry:
+    logging.addLevelName(22, "CLTEST_LIVE")
+    assert parser.resolve("cltest_live") == 22
+    assert list(parser.get_completions("cltest_live")) == [
+        "CLTEST_LIVE",
+        "CLTEST_LIVE_TOO",
+    ]
+
+
+def test_get_level_parser_live() -> None:
+    parser = get_level_parser({"VERBOSE": 15}, live=True)
+    assert isinstance(parser, LiveLevelParser)
+    assert parser is get_level_parser({"VERBOSE": 15}, live=True)
+    assert parser is not get_level_parser({"VERBOSE": 15})
+
+
+def test_metavar_lazy() -> None:
+    parser = LevelParser(extra={"VERBOSE": 15})
+    assert parser._tables.metavar is None
+    assert parser.metavar == "[NOTSET|DEBUG|INFO|WARNING|ERROR|CRITICAL|VERBOSE]"
+    assert parser.metavar is parser.metavar
+
+
+@pytest.mark.parametrize(
+    "limit,metavar",
+    [
+        (None, "[NOTSET|DEBUG|INFO|WARNING|ERROR|CRITICAL|VERBOSE|NOTICE]"),
+        (8, "[NOTSET|DEBUG|INFO|WARNING|ERROR|CRITICAL|VERBOSE|NOTICE]"),
+        (7, "[NOTSET|DEBUG|INFO|WARNING|ERROR|CRITICAL|VERBOSE|... 1 more]"),
+        (6, "[NOTSET|DEBUG|INFO|WARNING|ERROR|CRITICAL|... 2 more]"),
+        (0, "[... 8 more]"),
+    ],
+)
+def test_metavar_limit(limit: int | None, metavar: str) -> None:
+    parser = LevelParser(extra={"VERBOSE": 15, "NOTICE": 25}, metavar_limit=limit)
+    assert parser.metavar == metavar
+
+
+@pytest.mark.parametrize(
+    "value,level",
+    [
+        ("deb", logging.DEBUG),
+        ("D", logging.DEBUG),
+        ("warn", logging.WARNING),
+        ("W", logging.WARNING),
+        ("i", logging.INFO),
+        ("crit", logging.CRITICAL),
+        ("verb", 15),
+        ("notic", 25),
+        ("nots", logging.NOTSET),
+        ("fatal", logging.CRITICAL),
+        ("n", None),
+        ("not", None),
+        ("debugx", None),
+        ("", None),
+    ],
+)
+def test_resolve_abbrev(value: str, level: int | None) -> None:
+    parser = LevelParser(
+        extra={"VERBOSE": 15, "NOTICE": 25}, abbrev=True, aliases=STANDARD_ALIASES
+    )
+    assert parser.resolve(value) == level
+
+
+def test_resolve_no_abbrev() -> None:
+    parser = LevelParser(aliases={"Loud": "debug"})
+    assert parser.resolve("deb") is None
+    assert parser.resolve("loud") == logging.DEBUG
+    assert parser.resolve("lou") is None
+
+
+def test_ambiguous_error_message() -> None:
+    parser = LevelParser(extra={"VERBOSE": 15, "NOTICE": 25}, abbrev=True)
+    assert parser.error_message("no") == (
+        "'no': ambiguous log level; could be NOTICE, NOTSET"
+    )
+    assert parser.error_message("x") == "'x': invalid log level"
+    parser = LevelParser(extra={f"SUB{i}": 100 + i for i in range(20)}, abbrev=True)
+    assert parser.error_message("sub") == (
+        "'sub': ambiguous log level; could be SUB0, SUB1, SUB10, SUB11, SUB12, ..."
+    )
+
+
+def test_unknown_alias_target() -> None:
+    with pytest.raises(ValueError) as excinfo:
+        LevelParser(aliases={"LOUD": "VERBOSE"})
+    assert str(excinfo.value) == "Alias 'LOUD' refers to unknown level 'VERBOSE'"
+
+
+def test_unregistered_extra_name() -> None:
+    with pytest.raises(ValueError) as excinfo:
+        LevelParser(["CLTEST_UNREGISTERED"])
+    assert str(excinfo.value) == (
+        "'CLTEST_UNREGISTERED' is not a registered log level name"
+    )
+    with pytest.raises(ValueError):
+        get_level_parser(["CLTEST_UNREGISTERED"])
+
+
+def test_abbrev_live() -> None:
+    parser = LiveLevelParser(abbrev=True)
+    assert parser.resolve("cltest_abbr") is None
+    logging.addLevelName(33, "CLTEST_ABBREV")
+    assert parser.resolve("cltest_abbr") == 33
+
+
+@pytest.mark.parametrize(
+    "level,steps,result",
+    [
+        (logging.INFO, -1, 15),
+        (logging.INFO, 1, 25),
+        (logging.INFO, 2, logging.WARNING),
+        (logging.INFO, 0, logging.INFO),
+        (logging.DEBUG, -5, logging.NOTSET),
+        (logging.ERROR, 5, logging.CRITICAL),
+        (12, 1, 15),
+        (12, -1, logging.DEBUG),
+        (100, -1, logging.CRITICAL),
+        (-5, 1, logging.NOTSET),
+    ],
+)
+def test_step(level: int, steps: int, result: int) -> None:
+    parser = LevelParser(extra={"VERBOSE": 15, "NOTICE": 25, "TRACE": 15})
+    assert parser.sorted_values == (0, 10, 15, 20, 25, 30, 40, 50)
+    assert parser.step(level, steps) == result
+
+
+def test_live_step() -> None:
+    parser = LiveLevelParser()
+    assert parser.step(logging.INFO, 1) > 21
+    logging.addLevelName(21, "CLTEST_STEP")
+    assert parser.step(logging.INFO, 1) == 21
+
+
+def test_live_preregistered() -> None:
+    logging.addLevelName(25, "CLTEST_NOTICE")
+    parser = LiveLevelParser(extra={"CLTEST_PRE": 26})
+    assert parser.resolve("cltest_notice") == 25
+    assert "CLTEST_NOTICE" in parser.metavar
+    # The aliases that `logging` registers are not levels of their own
+    assert parser.resolve("warn") is None
+    # `extra` wins over a registered level of the same name
+    logging.addLevelName(27, "CLTEST_PRE")
+    assert LiveLevelParser(extra={"CLTEST_PRE": 26}).resolve("cltest_pre") == 26
+
+
+def test_live_tables() -> None:
+    parser = LiveLevelParser()
+    assert not parser.is_name("cltest_tables")
+    logging.addLevelName(26, "CLTEST_TABLES")
+    assert parser.is_name("cltest_tables")
+    assert parser.levels["CLTEST_TABLES"] == 26
+    assert "CLTEST_TABLES" in parser.sorted_names
+    assert 26 in parser.sorted_values
+
+
+def test_level_info() -> None:
+    li = LevelInfo("INFO", 20)
+    assert li == 20
+    assert isinstance(li, int)
+    assert li.name == "INFO"
+    assert li.value == 20
+    assert type(li.value) is int
+    assert li + 5 == 25
+    assert hash(li) == hash(20)
+    assert str(li) == "20"
+    assert repr(li) == "LevelInfo('INFO', 20)"
+    assert logging.getLevelName(li) == "INFO"
+    with pytest.raises(AttributeError):
+        li.name = "DEBUG"  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        del li.name
+    li2 = pickle.loads(pickle.dumps(li))
+    assert li2 == li
+    assert li2.name == "INFO"
+
+
+@pytest.mark.parametrize(
+    "value,name,level",
+    [
+        ("info", "INFO", 20),
+        ("verbose", "Verbose", 15),
+        ("TRACE", "Trace", 15),
+        ("warn", "WARNING", 30),
+        ("crit", "CRITICAL", 50),
+        (20, "INFO", 20),
+        ("15", "Verbose", 15),
+        (17, "Verbose", 17),
+        (" 35 ", "WARNING", 35),
+        (100, "CRITICAL", 100),
+        (-5, "NOTSET", -5),
+    ],
+)
+def test_parser_info(value: str | int, name: str, level: int) -> None:
+    parser = LevelParser(
+        extra={"Verbose": 15, "Trace": 15}, abbrev=True, aliases=STANDARD_ALIASES
+    )
+    li = parser.info(value)
+    assert isinstance(li, LevelInfo)
+    assert li.name == name
+    assert li == level
+    assert parser.info(value) is li
+
+
+def test_parser_info_interned() -> None:
+    parser = LevelParser()
+    li = parser.info("debug")
+    assert li is not None
+    assert parser.info("DEBUG") is li
+    assert parser.info(li) is li
+    assert parser.info(10) is li
+    assert parser.info("10") is li
+    assert parser.info("bogus") is None
+
+
+def test_parser_info_canonical() -> None:
+    parser = LevelParser(abbrev=True, aliases=STANDARD_ALIASES)
+    assert parser.info("warn") is parser.info("WARNING")
+    assert parser.info("deb") is parser.info("DEBUG")
+    assert parser.info(30) is parser.info("warn")
+    assert parser.info(35) is parser.info(35)
+    assert parser.info(35) is not parser.info(30)
+
+
+def test_live_parser_info() -> None:
+    parser = LiveLevelParser()
+    li = parser.info(47)
+    assert li is not None
+    assert li.name == "ERROR"
+    logging.addLevelName(47, "CLTEST_INFO")
+    li = parser.info(47)
+    assert li is not None
+    assert li.name == "CLTEST_INFO"
+    li = parser.info("cltest_info")
+    assert li is not None
+    assert li.name == "CLTEST_INFO"
+
+
+def test_convert_cache() -> None:
+    parser = LevelParser(extra={"VERBOSE": 15})
+    cache = ConvertCache(parser, maxsize=2)
+    assert cache.lookup("verbose") == ParseResult("verbose", 15, None)
+    assert cache.lookup("verbose") == ParseResult("verbose", 15, None)
+    r = cache.lookup("loud")
+    assert not r.ok
+    assert r.error == "'loud': invalid log level"
+    assert cache.lookup("loud") is r
+    assert cache.stats() == CacheStats(hits=2, misses=2, maxsize=2, size=2)
+    cache.lookup("10")
+    assert cache.stats() == CacheStats(hits=2, misses=3, maxsize=2, size=2)
+    cache.clear()
+    assert cache.stats() == CacheStats(hits=2, misses=3, maxsize=2, size=0)
+
+
+def test_convert_cache_level_info() -> None:
+    parser = LevelParser(extra={"VERBOSE": 15, "TRACE": 15})
+    cache = ConvertCache(parser, level_info=True)
+    r = cache.lookup(15)
+    assert isinstance(r.level, LevelInfo)
+    assert r.level.name == "VERBOSE"
+    trace = parser.info("trace")
+    assert trace is not None
+    assert cache.lookup(trace).level is trace
+
+
+def test_get_convert_cache_shared() -> None:
+    parser = get_level_parser({"VERBOSE": 15})
+    cache = get_convert_cache(parser, 64)
+    assert get_convert_cache(parser, 64) is cache
+    assert get_convert_cache(parser, 64, True) is not cache
+    assert get_convert_cache(parser, 32) is not cache
+
+
+def test_convert_cache_live() -> None:
+    cache = ConvertCache(LiveLevelParser())
+    assert not cache.lookup("cltest_cached").ok
+    logging.addLevelName(26, "CLTEST_CACHED")
+    assert cache.lookup("cltest_cached").level == 26
+    assert cache.stats().misses == 2
+
+
+@pytest.mark.parametrize(
+    "rate,frac",
+    [
+        ("1%", (1, 100)),
+        (" 0.5 % ", (1, 200)),
+        ("100%", (1, 1)),
+        ("1/1000", (1, 1000)),
+        ("3/12", (1, 4)),
+        ("0%", None),
+        ("150%", None),
+        ("2/1", None),
+        ("1/0", None),
+        ("-1/2", None),
+        ("x%", None),
+        ("0.01", None),
+        ("", None),
+    ],
+)
+def test_parse_sampling_rate(rate: str, frac: tuple[int, int] | None) -> None:
+    assert parse_sampling_rate(rate) == frac
+
+
+def test_resolve_sampled() -> None:
+    parser = LevelParser(extra={"VERBOSE": 15})
+    sl = parser.resolve_sampled("debug@1%")
+    assert isinstance(sl, SampledLevel)
+    assert sl == logging.DEBUG
+    assert sl.base == 15
+    assert (sl.rate_numerator, sl.rate_denominator) == (1, 100)
+    assert sl.rate == 0.01
+    assert repr(sl) == "SampledLevel(10, base=15, rate='1/100')"
+    assert str(sl) == "10"
+    with pytest.raises(AttributeError):
+        sl.base = 20  # type: ignore[misc]
+    sl2 = pickle.loads(pickle.dumps(sl))
+    assert sl2 == sl
+    assert repr(sl2) == repr(sl)
+    assert parser.resolve_sampled("Verbose @ 1/1000") == SampledLevel(15, 20, 1, 1000)
+    assert parser.resolve_sampled("INFO") == logging.INFO
+    assert type(parser.resolve_sampled("INFO")) is int
+    assert parser.resolve_sampled("loud@1%") is None
+    assert parser.resolve_sampled("debug@") is None
+    # There is no higher level to keep in full:
+    assert parser.resolve_sampled("critical@1%") is None
+    assert parser.resolve_sampled("100@1%") is None
+    assert parser.resolve_sampled("NOTSET@50%") is None
+    assert parser.resolve_sampled("0@50%") is None
+    assert parser.resolve("debug@1%") is None
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import os
+import subprocess
+import sys
+import pytest
+
+
+def importtime(code: str) -> list[tuple[str, int]]:
+    """
+    Run ``code`` in a fresh interpreter under ``-X importtime`` and return
+    ``(name, cumulative)`` pairs for the modules it imported, where ``name``
+    keeps the indentation that marks nested imports and ``cumulative`` is in
+    microseconds
+    """
+    # pytest-cov measures subprocesses by way of these variables, and tracing
+    # the imports would swamp their times
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if not k.startswith(("COV_CORE_", "COVERAGE_"))
+    }
+    r = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+        env=env,
+    )
+    entries = []
+    for line in r.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        # The header line has no numbers
+        if cumulative.strip().isdecimal():
+            entries.append((name.rstrip().removeprefix(" "), int(cumulative)))
+    return entries
+
+
+def imported_modules(code: str) -> dict[str, int]:
+    """
+    Return a mapping from the names of the modules imported by ``code`` to
+    their cumulative import times in microseconds
+    """
+    return {name.strip(): cumulative for name, cumulative in importtime(code)}
+
+
+def import_times(*codes: str, runs: int = 10) -> list[int]:
+    """
+    Return the total times in microseconds spent in imports while running
+    each of ``codes`` in a fresh interpreter.  The runs of the different
+    snippets are interleaved so that they are affected by the load on the
+    machine alike, and the best of ``runs`` runs of each is returned in order
+    to reduce noise.
+    """
+    times: list[list[int]] = [[] for _ in codes]
+    for _ in range(runs):
+        for code, code_times in zip(codes, times):
+            # Nested imports are indented and already included in the
+            # cumulative times of the top-level imports
+            code_times.append(
+                sum(c for name, c in importtime(code) if not name.startswith(" "))
+            )
+    return [min(ts) for ts in times]
+
+
+#: Maximum time that ``import click_loglevel`` may add to interpreter startup,
+#: as a fraction of the import time of a bare interpreter
+IMPORT_BUDGET = 0.5
+
+
+@pytest.mark.skipif(
+    not os.environ.get("CLICK_LOGLEVEL_TIMING_TESTS"),
+    reason="Timing test; set CLICK_LOGLEVEL_TIMING_TESTS=1 to run",
+)
+def test_import_time_budget() -> None:
+    baseline, total = import_times("pass", "import click_loglevel")
+    added = total - baseline
+    assert (
+        added <= IMPORT_BUDGET * baseline
+    ), f"import click_loglevel added {added} us to a baseline of {baseline} us"
+
+
+def test_import_does_not_load_click() -> None:
+    baseline = imported_modules("pass")
+    modules = imported_modules("import click_loglevel")
+    assert "click_loglevel" in modules
+    new = set(modules) - set(baseline)
+    assert not {m for m in new if m.split(".")[0] in {"click", "asyncclick", "typing"}}
+    # Only the package itself (and no submodules) should be loaded
+    assert not {m for m in new if m.startswith("click_loglevel.")}
+
+
+def test_lazy_attributes() -> None:
+    modules = imported_modules("from click_loglevel import LevelParser")
+    assert "click_loglevel.core" in modules
+    assert "click" not in modules
+    modules = imported_modules("from click_loglevel import LogLevel")
+    assert "click" in modules
+    assert "asyncclick" not in modules
@@ -0,0 +1,136 @@
+from __future__ import annotations
+from collections import Counter
+from collections.abc import Iterator
+import logging
+import click
+from click.testing import CliRunner
+import pytest
+from click_loglevel import LogLevel, instrument
+from click_loglevel.core import LevelParser, LiveLevelParser, LogLevelMixin
+
+
+@pytest.fixture(autouse=True)
+def instrumentation() -> Iterator[None]:
+    instrument.reset()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled_by_default() -> None:
+    originals = {
+        (cls, name): cls.__dict__[name]
+        for cls, name in [
+            (LevelParser, "parse"),
+            (LevelParser, "parse_many"),
+            (LevelParser, "get_completions"),
+            (LogLevelMixin, "convert"),
+        ]
+    }
+    instrument.enable()
+    assert instrument.is_enabled()
+    assert LogLevelMixin.__dict__["convert"] is not originals[LogLevelMixin, "convert"]
+    instrument.disable()
+    assert not instrument.is_enabled()
+    for (cls, name), method in originals.items():
+        assert cls.__dict__[name] is method
+    LogLevel().convert("info", None, None)
+    assert instrument.snapshot() == instrument.Stats()
+
+
+def test_counters() -> None:
+    parser = LevelParser(extra={"VERBOSE": 15}, abbrev=True)
+    instrument.enable()
+    results = list(parser.parse_many(["info", "verb", "Info", "15", 42, "bogus"]))
+    assert [r.level for r in results] == [
+        logging.INFO,
+        15,
+        logging.INFO,
+        15,
+        42,
+        None,
+    ]
+    assert parser.parse("debug") == logging.DEBUG
+    with pytest.raises(KeyError):
+        parser.parse("bogus")
+    assert list(parser.get_completions("")) == sorted(parser.levels)
+    assert list(parser.get_completions("v")) == ["VERBOSE"]
+    stats = instrument.snapshot()
+    assert stats.convert_named == 3
+    assert stats.convert_numeric == 2
+    assert stats.convert_failures == 1
+    assert stats.parse_hits == 1
+    assert stats.parse_misses == 1
+    assert stats.names == Counter({"INFO": 2, "VERBOSE": 1, "DEBUG": 1})
+    assert stats.completion_calls == 2
+    assert stats.completion_candidates == 8
+    assert stats.completion_time > 0
+    instrument.reset()
+    assert instrument.snapshot() == instrument.Stats()
+
+
+def test_internal_calls_not_counted() -> None:
+    parser = LevelParser()
+    instrument.enable()
+    assert parser.resolve("info") == logging.INFO
+    assert parser.info("warning") is not None
+    assert parser.resolve_sampled("debug@x") is None
+    assert instrument.snapshot() == instrument.Stats()
+
+
+def test_hook() -> None:
+    events: list[instrument.Event] = []
+    instrument.enable(events.append)
+    parser = LiveLevelParser()
+    list(parser.parse_many(["warning", "nope"]))
+    list(parser.get_completions("e"))
+    assert [(e.kind, e.value, e.result) for e in events] == [
+        ("convert", "warning", logging.WARNING),
+        ("convert", "nope", None),
+        ("complete", "e", ["ERROR"]),
+    ]
+    assert all(e.elapsed >= 0 for e in events)
+
+
+def test_convert() -> None:
+    @click.command()
+    @click.option("-l", "--log-level", type=LogLevel())
+    def cmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    instrument.enable()
+    for value in ["info", "20", "x"]:
+        CliRunner().invoke(cmd, ["-l", value])
+    stats = instrument.snapshot()
+    assert stats.convert_named == 1
+    assert stats.convert_numeric == 1
+    assert stats.convert_failures == 1
+
+
+def test_convert_sampled() -> None:
+    @click.command()
+    @click.option("-l", "--log-level", type=LogLevel(abbrev=True, sampling=True))
+    def cmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    instrument.enable()
+    for value in ["deb@10%", "debug@x", "critical@1%", "warn"]:
+        CliRunner().invoke(cmd, ["-l", value])
+    stats = instrument.snapshot()
+    assert stats.convert_named == 2
+    assert stats.convert_numeric == 0
+    assert stats.convert_failures == 2
+    assert stats.names == Counter({"DEBUG": 1, "WARNING": 1})
+
+
+def test_convert_cached() -> None:
+    lltype = LogLevel(cache_size=4)
+    instrument.enable()
+    for _ in range(3):
+        assert lltype.convert("info", None, None) == logging.INFO
+        with pytest.raises(click.BadParameter):
+            lltype.convert("x", None, None)
+    stats = instrument.snapshot()
+    assert stats.convert_named == 3
+    assert stats.convert_failures == 3
+    assert stats.names == Counter({"INFO": 3})
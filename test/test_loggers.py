@@ -0,0 +1,535 @@
+from __future__ import annotations
+import asyncio
+from collections.abc import Iterator
+import logging
+import click
+from click.testing import CliRunner
+import pytest
+from click_loglevel import LogLevel
+from click_loglevel.core import LevelParser, SampledLevel
+from click_loglevel.loggers import (
+    LevelOverride,
+    LoggerLevelFilter,
+    LoggerLevelPlan,
+    QueueLogging,
+    SamplingFilter,
+    apply_level,
+    complete_logger_levels,
+    current_override,
+    parse_logger_levels,
+    prime_logger_caches,
+    set_level_floor,
+)
+
+
+@pytest.fixture
+def restore_levels() -> Iterator[None]:
+    names = ["", "cltest", "cltest.db", "cltest.web"]
+    saved = {name: logging.getLogger(name or None).level for name in names}
+    yield
+    for name, level in saved.items():
+        logging.getLogger(name or None).setLevel(level)
+
+
+@pytest.mark.parametrize(
+    "spec,levels",
+    [
+        ("", ()),
+        ("INFO", (("", logging.INFO),)),
+        ("root=info", (("", logging.INFO),)),
+        (
+            "root=INFO, sqlalchemy=warning,app.db=DEBUG,",
+            (
+                ("", logging.INFO),
+                ("sqlalchemy", logging.WARNING),
+                ("app.db", logging.DEBUG),
+            ),
+        ),
+        ("app=verbose,app=5", (("app", 5),)),
+        ("app=DEBUG,root=INFO,app=verbose", (("", logging.INFO), ("app", 15))),
+    ],
+)
+def test_parse_logger_levels(spec: str, levels: tuple[tuple[str, int], ...]) -> None:
+    parser = LevelParser(extra={"VERBOSE": 15})
+    assert parse_logger_levels(parser, spec) == LoggerLevelPlan(levels)
+
+
+def test_parse_logger_levels_errors() -> None:
+    with pytest.raises(ValueError) as excinfo:
+        parse_logger_levels(LevelParser(), "a=INFO,b=LOUD,=DEBUG,c=")
+    assert str(excinfo.value) == (
+        "'LOUD': invalid log level; '=DEBUG': missing logger name;"
+        " '': invalid log level"
+    )
+
+
+@pytest.mark.usefixtures("restore_levels")
+def test_apply() -> None:
+    db = logging.getLogger("cltest.db")
+    web = logging.getLogger("cltest.web")
+    logging.getLogger("cltest").setLevel(logging.WARNING)
+    assert not db.isEnabledFor(logging.DEBUG)
+    assert not web.isEnabledFor(logging.INFO)
+    plan = parse_logger_levels(LevelParser(), "cltest.db=DEBUG,cltest=INFO")
+    plan.apply()
+    assert db.level == logging.DEBUG
+    assert db.isEnabledFor(logging.DEBUG)
+    assert web.isEnabledFor(logging.INFO)
+    assert not web.isEnabledFor(logging.DEBUG)
+
+
+@pytest.mark.parametrize(
+    "incomplete,completions",
+    [
+        ("", []),
+        ("app", []),
+        (
+            "app=",
+            [
+                "app=CRITICAL",
+                "app=DEBUG",
+                "app=ERROR",
+                "app=INFO",
+                "app=NOTSET",
+                "app=WARNING",
+            ],
+        ),
+        ("app=in", ["app=INFO"]),
+        ("root=INFO,app.db=d", ["root=INFO,app.db=DEBUG"]),
+        ("app=INFO,d", []),
+    ],
+)
+def test_complete_logger_levels(incomplete: str, completions: list[str]) -> None:
+    assert list(complete_logger_levels(LevelParser(), incomplete)) == completions
+
+
+@pytest.fixture
+def restore_floor() -> Iterator[None]:
+    saved = logging.root.manager.disable
+    yield
+    logging.disable(saved)
+
+
+@pytest.mark.usefixtures("restore_floor", "restore_levels")
+def test_set_level_floor() -> None:
+    logger = logging.getLogger("cltest.db")
+    logger.setLevel(logging.DEBUG)
+    set_level_floor(logging.WARNING)
+    assert not logger.isEnabledFor(logging.INFO)
+    assert logger.isEnabledFor(logging.WARNING)
+    set_level_floor(logging.NOTSET)
+    assert logger.isEnabledFor(logging.DEBUG)
+
+
+@pytest.mark.usefixtures("restore_levels")
+def test_prime_logger_caches() -> None:
+    logger = logging.getLogger("cltest.web")
+    logger.setLevel(logging.INFO)
+    assert logger._cache == {}  # type: ignore[attr-defined]
+    n = prime_logger_caches([logging.DEBUG, logging.INFO])
+    assert n >= 2
+    assert logger._cache == {  # type: ignore[attr-defined]
+        logging.DEBUG: False,
+        logging.INFO: True,
+    }
+    assert logging.getLogger()._cache.keys() >= {  # type: ignore[attr-defined]
+        logging.DEBUG,
+        logging.INFO,
+    }
+
+
+@pytest.mark.usefixtures("restore_floor", "restore_levels")
+def test_apply_level() -> None:
+    @click.command()
+    @click.option(
+        "-l",
+        "--log-level",
+        type=LogLevel(extra={"VERBOSE": 15}),
+        callback=apply_level("cltest"),
+    )
+    def cmd(log_level: int | None) -> None:
+        click.echo(repr(log_level))
+
+    logger = logging.getLogger("cltest.db")
+    r = CliRunner().invoke(cmd, ["-l", "verbose"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "15\n"
+    assert logging.getLogger("cltest").level == 15
+    # The floor would affect every logger, not just "cltest"
+    assert logging.root.manager.disable == logging.NOTSET
+    assert logger._cache == {  # type: ignore[attr-defined]
+        lv: lv >= 15 for lv in [0, 10, 15, 20, 30, 40, 50]
+    }
+    logging.disable(logging.NOTSET)
+    r = CliRunner().invoke(cmd, [])
+    assert r.exit_code == 0, r.output
+    assert r.output == "None\n"
+    assert logging.root.manager.disable == logging.NOTSET
+
+
+@pytest.mark.usefixtures("restore_floor", "restore_levels")
+@pytest.mark.parametrize(
+    "logger,floor,disable",
+    [
+        ("", None, logging.INFO - 1),
+        ("", False, logging.NOTSET),
+        ("cltest", None, logging.NOTSET),
+        ("cltest", True, logging.INFO - 1),
+    ],
+)
+def test_apply_level_floor(logger: str, floor: bool | None, disable: int) -> None:
+    @click.command()
+    @click.option(
+        "-l",
+        "--log-level",
+        type=LogLevel(),
+        callback=apply_level(logger, floor=floor, prime=False),
+    )
+    def cmd(log_level: int | None) -> None:
+        click.echo(repr(log_level))
+
+    r = CliRunner().invoke(cmd, ["-l", "info"])
+    assert r.exit_code == 0, r.output
+    assert logging.getLogger(logger or None).level == logging.INFO
+    assert logging.root.manager.disable == disable
+
+
+def make_record(name: str, level: int) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "msg", None, None)
+
+
+@pytest.mark.parametrize(
+    "name,threshold",
+    [
+        ("urllib3", logging.WARNING),
+        ("urllib3.connectionpool", logging.WARNING),
+        ("urllib3x", logging.INFO),
+        ("app", logging.DEBUG),
+        ("app.db", logging.DEBUG),
+        ("app.db.pool", logging.ERROR),
+        ("app.db.pool.conn", logging.ERROR),
+        ("app.dbx", logging.DEBUG),
+        ("root", logging.INFO),
+        ("", logging.INFO),
+        ("other.thing", logging.INFO),
+    ],
+)
+def test_logger_level_filter(name: str, threshold: int) -> None:
+    flt = LoggerLevelFilter(
+        {
+            "": logging.INFO,
+            "urllib3": logging.WARNING,
+            "app": logging.DEBUG,
+            "app.db.pool": logging.ERROR,
+        }
+    )
+    assert flt.threshold(name) == threshold
+    assert flt.threshold(name) == threshold
+    assert flt.filter(make_record(name, threshold))
+    assert not flt.filter(make_record(name, threshold - 1))
+
+
+def test_logger_level_filter_no_root_rule() -> None:
+    flt = LoggerLevelFilter({"app.web": logging.ERROR})
+    assert flt.threshold("app") == logging.NOTSET
+    assert flt.filter(make_record("app", 1))
+    assert not flt.filter(make_record("app.web.views", logging.WARNING))
+
+
+def test_plan_filter() -> None:
+    parser = LevelParser()
+    plan = parse_logger_levels(parser, "root=info,cltest.db=warning")
+    flt = plan.filter()
+    assert isinstance(flt, LoggerLevelFilter)
+    assert flt.threshold("cltest") == logging.INFO
+    assert flt.threshold("cltest.db.x") == logging.WARNING
+    handler = logging.Handler()
+    handler.addFilter(flt)
+    assert not handler.filter(make_record("cltest.db", logging.INFO))
+    assert handler.filter(make_record("cltest.web", logging.INFO))
+    assert logging.getLogger("cltest.db").level == logging.NOTSET
+
+
+def test_queue_logging_moves_handlers(restore_levels: None) -> None:  # noqa: U100
+    logger = logging.getLogger("cltest.web")
+    records: list[logging.LogRecord] = []
+    handler = logging.Handler()
+    handler.emit = records.append  # type: ignore[assignment]
+    logger.addHandler(handler)
+    try:
+        with QueueLogging("cltest.web", level=logging.WARNING) as ql:
+            assert logger.level == logging.WARNING
+            assert handler not in logger.handlers
+            assert len(logger.handlers) == 1
+            logger.info("dropped")
+            for i in range(100):
+                logger.error("record %d", i)
+            ql.stop()
+            assert logger.handlers == [handler]
+        assert [r.getMessage() for r in records] == [f"record {i}" for i in range(100)]
+        assert logger.handlers == [handler]
+    finally:
+        logger.removeHandler(handler)
+
+
+def test_queue_logging_default_handler() -> None:
+    saved = logging.root.handlers[:]
+    for h in saved:
+        logging.root.removeHandler(h)
+    try:
+        ql = QueueLogging()
+        ql.start()
+        ql.start()
+        try:
+            assert len(logging.root.handlers) == 1
+            listener = ql._listener
+            assert listener is not None
+            assert [type(h) for h in listener.handlers] == [logging.StreamHandler]
+        finally:
+            ql.stop()
+        assert logging.root.handlers == []
+    finally:
+        for h in saved:
+            logging.root.addHandler(h)
+
+
+def test_queue_logging_propagates(cltest_records: list[str]) -> None:
+    logger = logging.getLogger("cltest.nohandlers")
+    with QueueLogging("cltest.nohandlers", level=logging.WARNING) as ql:
+        assert logger.handlers == []
+        assert logger.level == logging.WARNING
+        assert ql._listener is None
+        logger.info("dropped")
+        logger.warning("once")
+    assert logger.handlers == []
+    assert cltest_records == ["cltest.nohandlers:once"]
+    logger.setLevel(logging.NOTSET)
+
+
+@pytest.fixture
+def cltest_records(restore_levels: None) -> Iterator[list[str]]:  # noqa: U100
+    logger = logging.getLogger("cltest")
+    logger.setLevel(logging.INFO)
+    records: list[str] = []
+    handler = logging.Handler()
+    handler.emit = lambda r: records.append(f"{r.name}:{r.getMessage()}")  # type: ignore
+    logger.addHandler(handler)
+    try:
+        yield records
+    finally:
+        logger.removeHandler(handler)
+
+
+def test_level_override(cltest_records: list[str]) -> None:
+    db = logging.getLogger("cltest.db")
+    web = logging.getLogger("cltest.web")
+    db.debug("before")
+    assert current_override() is None
+    with LevelOverride(logging.DEBUG, "cltest.db"):
+        assert current_override() == (logging.DEBUG, "cltest.db")
+        db.debug("inside")
+        web.debug("other logger")
+        with LevelOverride(5):
+            web.log(5, "nested")
+        assert current_override() == (logging.DEBUG, "cltest.db")
+        logging.getLogger("cltest.dbx").debug("not a child")
+    db.debug("after")
+    assert current_override() is None
+    assert cltest_records == ["cltest.db:inside", "cltest.web:nested"]
+
+
+def test_level_override_hook_removed(cltest_records: list[str]) -> None:
+    original = logging.Logger.isEnabledFor
+    with LevelOverride(logging.DEBUG):
+        assert logging.Logger.isEnabledFor is not original
+        with LevelOverride(logging.DEBUG, "cltest.db"):
+            pass
+        assert logging.Logger.isEnabledFor is not original
+        logging.getLogger("cltest.web").debug("inside")
+    assert logging.Logger.isEnabledFor is original
+    logging.getLogger("cltest.web").debug("after")
+    assert cltest_records == ["cltest.web:inside"]
+
+
+def test_level_override_named_hooks_only_covered(
+    cltest_records: list[str],
+) -> None:
+    original = logging.Logger.isEnabledFor
+    get_logger = logging.Manager.getLogger
+    db = logging.getLogger("cltest.db")
+    web = logging.getLogger("cltest.web")
+    with LevelOverride(logging.DEBUG, "cltest.db"):
+        assert logging.Logger.isEnabledFor is original
+        assert "isEnabledFor" in vars(db)
+        assert "isEnabledFor" not in vars(web)
+        # Loggers created during the override are covered as well
+        pool = logging.getLogger("cltest.db.pool.new")
+        assert "isEnabledFor" in vars(pool)
+        assert "isEnabledFor" not in vars(logging.getLogger("cltest.dbnew"))
+        with LevelOverride(logging.DEBUG, "cltest.db"):
+            pass
+        pool.debug("inside")
+        web.debug("other logger")
+    assert "isEnabledFor" not in vars(db)
+    assert "isEnabledFor" not in vars(pool)
+    assert logging.Manager.getLogger is get_logger
+    pool.debug("after")
+    assert cltest_records == ["cltest.db.pool.new:inside"]
+
+
+def test_level_override_beats_floor(cltest_records: list[str]) -> None:
+    set_level_floor(logging.INFO)
+    try:
+        with LevelOverride(logging.DEBUG):
+            logging.getLogger("cltest.web").debug("shown")
+        logging.getLogger("cltest.web").debug("hidden")
+    finally:
+        set_level_floor(logging.NOTSET)
+    assert cltest_records == ["cltest.web:shown"]
+
+
+def test_level_override_decorator(cltest_records: list[str]) -> None:
+    logger = logging.getLogger("cltest.web")
+
+    @LevelOverride(logging.DEBUG, "cltest")
+    def debugged(msg: str) -> str:
+        logger.debug(msg)
+        return msg
+
+    assert debugged("sync") == "sync"
+
+    @LevelOverride(logging.DEBUG)
+    async def handle_debugged(i: int) -> None:
+        await asyncio.sleep(0)
+        logger.debug("debugged %d", i)
+
+    async def handle(i: int) -> None:
+        await asyncio.sleep(0)
+        logger.debug("normal %d", i)
+
+    async def serve() -> None:
+        await asyncio.gather(
+            *(handle_debugged(i) if i % 2 else handle(i) for i in range(6))
+        )
+
+    asyncio.run(serve())
+    logger.debug("after")
+    assert cltest_records == [
+        "cltest.web:sync",
+        "cltest.web:debugged 1",
+        "cltest.web:debugged 3",
+        "cltest.web:debugged 5",
+    ]
+
+
+@pytest.mark.parametrize(
+    "numerator,denominator", [(1, 100), (3, 10), (1, 1), (7, 20_000)]
+)
+def test_sampling_filter(numerator: int, denominator: int) -> None:
+    flt = SamplingFilter(logging.DEBUG, logging.INFO, numerator, denominator)
+    kept = [
+        i
+        for i in range(10 * denominator)
+        if flt.filter(make_record("cltest", logging.DEBUG))
+    ]
+    assert len(kept) == 10 * numerator
+    assert kept[0] == 0
+    for level in [logging.INFO, logging.ERROR, 5]:
+        assert all(flt.filter(make_record("cltest", level)) for _ in range(10))
+
+
+def test_sampling_filter_per_logger() -> None:
+    flt = SamplingFilter(logging.DEBUG, logging.INFO, 1, 2)
+    kept = [
+        name
+        for _ in range(4)
+        for name in ["cltest.a", "cltest.b"]
+        if flt.filter(make_record(name, logging.DEBUG))
+    ]
+    assert kept == ["cltest.a", "cltest.b", "cltest.a", "cltest.b"]
+
+
+def test_apply_level_sampled(cltest_records: list[str]) -> None:
+    logger = logging.getLogger("cltest")
+    (handler,) = logger.handlers
+
+    @click.command()
+    @click.option(
+        "-l",
+        "--log-level",
+        type=LogLevel(sampling=True),
+        callback=apply_level("cltest", floor=False),
+    )
+    def cmd(log_level: int) -> None:
+        assert isinstance(log_level, SampledLevel)
+        assert logger.level == logging.DEBUG
+        for i in range(8):
+            logging.getLogger("cltest.db").debug("debug %d", i)
+            logger.info("info %d", i)
+
+    try:
+        r = CliRunner().invoke(cmd, ["-l", "debug@25%"])
+        assert r.exit_code == 0, r.output
+    finally:
+        handler.filters.clear()
+    assert cltest_records == [
+        "cltest.db:debug 0",
+        *(f"cltest:info {i}" for i in range(4)),
+        "cltest.db:debug 4",
+        *(f"cltest:info {i}" for i in range(4, 8)),
+    ]
+
+
+def test_apply_level_sampled_descendant(cltest_records: list[str]) -> None:
+    # `cltest.db` has no handlers of its own, so its records are sampled at
+    # the handler of `cltest`, where records from `cltest.web` pass unchanged
+    (handler,) = logging.getLogger("cltest").handlers
+    db = logging.getLogger("cltest.db")
+    web = logging.getLogger("cltest.web")
+
+    @click.command()
+    @click.option(
+        "-l",
+        "--log-level",
+        type=LogLevel(sampling=True),
+        callback=apply_level("cltest.db", floor=False),
+    )
+    def cmd(log_level: int) -> None:  # noqa: U100
+        for i in range(4):
+            db.debug("db %d", i)
+            logging.getLogger("cltest.db.pool").debug("pool %d", i)
+            web.info("web %d", i)
+
+    try:
+        for args in [["-l", "debug@50%"], ["-l", "debug@1/4"]]:
+            r = CliRunner().invoke(cmd, args)
+            assert r.exit_code == 0, r.output
+        # Each run replaces the filter of the previous one:
+        assert len(handler.filters) == 1
+        r = CliRunner().invoke(cmd, ["-l", "info"])
+        assert r.exit_code == 0, r.output
+        assert handler.filters == []
+    finally:
+        handler.filters.clear()
+        db.setLevel(logging.NOTSET)
+    assert cltest_records == [
+        # 50%: every other record from each of `cltest.db` and its
+        # descendants, counted separately for each logger
+        "cltest.db:db 0",
+        "cltest.db.pool:pool 0",
+        "cltest.web:web 0",
+        "cltest.web:web 1",
+        "cltest.db:db 2",
+        "cltest.db.pool:pool 2",
+        "cltest.web:web 2",
+        "cltest.web:web 3",
+        # 1/4:
+        "cltest.db:db 0",
+        "cltest.db.pool:pool 0",
+        "cltest.web:web 0",
+        "cltest.web:web 1",
+        "cltest.web:web 2",
+        "cltest.web:web 3",
+        # INFO:
+        *(f"cltest.web:web {i}" for i in range(4)),
+    ]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from collections.abc import Iterator
+import importlib
+import logging
+import os
+from pathlib import Path
+import sys
+import click
+from click.testing import CliRunner
+import pytest
+from click_loglevel import LogLevel
+from click_loglevel.core import _cached_parser, get_level_parser
+from click_loglevel.plugins import PluginLevelParser, discover_levels
+
+GROUP = "click_loglevel_test.levels"
+
+PLUGIN_MODULE = """\
+import logging
+
+logging.addLevelName(5, "Trace")
+"""
+
+VALUES_MODULE = """\
+LOUD = 45
+"""
+
+ENTRY_POINTS = f"""\
+[{GROUP}]
+Trace = cl_test_trace_plugin
+LOUD = cl_test_values_plugin:LOUD
+"""
+
+
+@pytest.fixture
+def plugin_path(
+    tmp_path: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[Path]:
+    (tmp_path / "cl_test_trace_plugin.py").write_text(PLUGIN_MODULE)
+    (tmp_path / "cl_test_values_plugin.py").write_text(VALUES_MODULE)
+    dist_info = tmp_path / "cl_test_plugins-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: cl-test-plugins\nVersion: 1.0\n"
+    )
+    (dist_info / "entry_points.txt").write_text(ENTRY_POINTS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+    # Keep the default index cache out of the home directory
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+    yield tmp_path
+    # Don't let other tests reuse parsers that have loaded the plugins
+    _cached_parser.cache_clear()
+    for mod in ["cl_test_trace_plugin", "cl_test_values_plugin"]:
+        sys.modules.pop(mod, None)
+
+
+def test_discover_levels(plugin_path: Path) -> None:  # noqa: U100
+    assert discover_levels(GROUP) == {
+        "TRACE": ("Trace", "cl_test_trace_plugin"),
+        "LOUD": ("LOUD", "cl_test_values_plugin:LOUD"),
+    }
+
+
+def test_discover_levels_cached(
+    plugin_path: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # The cache must not be in a directory on `sys.path`, as writing to it
+    # would change the cache key
+    cache_dir = tmp_path_factory.mktemp("cache")
+    index = discover_levels(GROUP, cache_dir)
+    assert len(list((cache_dir / "plugins").iterdir())) == 1
+    # A change to `sys.path` replaces the entry rather than adding another:
+    st = plugin_path.stat()
+    os.utime(plugin_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert discover_levels(GROUP, cache_dir) == index
+    assert len(list((cache_dir / "plugins").iterdir())) == 1
+
+    def fail(**_kwargs: object) -> None:
+        raise AssertionError("entry points scanned despite cache")
+
+    monkeypatch.setattr("importlib.metadata.entry_points", fail)
+    assert discover_levels(GROUP, cache_dir) == index
+
+
+def test_plugins_loaded_lazily(plugin_path: Path) -> None:  # noqa: U100
+    parser = PluginLevelParser(GROUP, cache_dir=False)
+    assert parser.resolve("INFO") == logging.INFO
+    assert parser.resolve("bogus") is None
+    assert "cl_test_trace_plugin" not in sys.modules
+    assert list(parser.get_completions("t")) == ["TRACE"]
+    # Leave out the levels registered by other tests:
+    assert [c for c in parser.get_completions("") if "CLTEST" not in c] == [
+        "CRITICAL",
+        "DEBUG",
+        "ERROR",
+        "INFO",
+        "LOUD",
+        "NOTSET",
+        "TRACE",
+        "WARNING",
+    ]
+    assert "cl_test_trace_plugin" not in sys.modules
+    assert parser.resolve("trace") == 5
+    assert "cl_test_trace_plugin" in sys.modules
+    assert "cl_test_values_plugin" not in sys.modules
+    assert parser.metavar.startswith("[NOTSET|DEBUG|INFO|WARNING|ERROR|CRITICAL|")
+    assert parser.metavar.endswith("|Trace]")
+    # Loaded levels are not completed twice
+    assert list(parser.get_completions("t")) == ["TRACE"]
+
+
+def test_plugin_value(plugin_path: Path) -> None:  # noqa: U100
+    parser = PluginLevelParser(GROUP, cache_dir=False)
+    assert parser.parse("Loud") == 45
+    assert parser.levels["LOUD"] == 45
+    info = parser.info("loud")
+    assert info is not None
+    assert info.name == "LOUD"
+    with pytest.raises(KeyError):
+        parser.parse("bogus")
+
+
+def test_get_level_parser_plugins(plugin_path: Path) -> None:  # noqa: U100
+    parser = get_level_parser(plugin_group=GROUP)
+    assert isinstance(parser, PluginLevelParser)
+    assert parser.group == GROUP
+    assert get_level_parser(plugin_group=GROUP) is parser
+    assert get_level_parser() is not parser
+
+
+def test_log_level_plugins(plugin_path: Path) -> None:  # noqa: U100
+    @click.command()
+    @click.option("-l", "--log-level", type=LogLevel(plugin_group=GROUP))
+    def lvlcmd(log_level: int | None) -> None:
+        click.echo(repr(log_level))
+
+    r = CliRunner().invoke(lvlcmd, ["-l", "loud"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "45\n"
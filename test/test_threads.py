@@ -0,0 +1,74 @@
+"""
+Stress tests for sharing parsers between threads.  These are most meaningful
+on free-threaded builds of Python, but they run on all builds.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+from click_loglevel import LogLevel
+from click_loglevel.core import LevelInfo, LiveLevelParser
+
+THREADS = 8
+ROUNDS = 2000
+
+
+def run_threads(func: Callable[[int], None]) -> None:
+    barrier = threading.Barrier(THREADS)
+
+    def worker(n: int) -> None:
+        barrier.wait()
+        func(n)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        for fut in [pool.submit(worker, n) for n in range(THREADS)]:
+            fut.result()
+
+
+def test_shared_loglevel() -> None:
+    lltype = LogLevel(extra={"VERBOSE": 15, "NOTICE": 25}, abbrev=True)
+    parser = lltype.parser
+    infos: list[list[LevelInfo | None]] = [[] for _ in range(THREADS)]
+
+    def work(n: int) -> None:
+        for i in range(ROUNDS):
+            assert lltype.convert("verbose", None, None) == 15
+            assert lltype.convert(str(i), None, None) == i
+            assert parser.parse("noti") == 25
+            assert parser.resolve("bogus") is None
+            assert list(parser.get_completions("n")) == ["NOTICE", "NOTSET"]
+            assert parser.metavar == (
+                "[NOTSET|DEBUG|INFO|WARNING|ERROR|CRITICAL|VERBOSE|NOTICE]"
+            )
+            infos[n].append(parser.info("warning"))
+            infos[n].append(parser.info(i % 60))
+
+    run_threads(work)
+    # Every thread got the same `LevelInfo` for the same level:
+    for n in range(1, THREADS):
+        assert all(a is b for a, b in zip(infos[0], infos[n]))
+
+
+def test_live_parser_concurrent_registration() -> None:
+    parser = LiveLevelParser()
+    names = [f"CLTEST_THREAD_{i}" for i in range(200)]
+
+    def work(n: int) -> None:
+        if n == 0:
+            for i, name in enumerate(names):
+                logging.addLevelName(100 + i, name)
+        else:
+            seen = 0
+            for _ in range(ROUNDS):
+                # Names registered so far must be recognized consistently:
+                completions = list(parser.get_completions("cltest_thread_"))
+                assert len(completions) >= seen
+                seen = len(completions)
+                for c in completions[:5]:
+                    assert parser.resolve(c) == 100 + int(c.rpartition("_")[2])
+                assert parser.resolve("info") == logging.INFO
+
+    run_threads(work)
+    assert sorted(parser.get_completions("cltest_thread_")) == sorted(names)
@@ -3,10 +3,20 @@ import logging
 from pathlib import Path
 import subprocess
 import sys
+import threading
 import asyncclick as click
 from asyncclick.testing import CliRunner
 import pytest
-from click_loglevel.asyncclick import AsyncLogLevel
+from click_loglevel import LogLevel
+from click_loglevel.asyncclick import (
+    AsyncLevelConfigFile,
+    AsyncLoggerLevels,
+    AsyncLogLevel,
+    queue_logging,
+    verbosity_options,
+)
+from click_loglevel.core import LevelInfo
+from click_loglevel.loggers import LoggerLevelPlan
 
 DATA_DIR = Path(__file__).with_name("data")
 
@@ -225,3 +235,212 @@ def test_invalid_loglevel_extra_nonupper(value: str, script: str) -> None:
     )
     assert r.returncode != 0
     assert f"{value!r}: invalid log level" in r.stderr
+
+
+def test_parse_many() -> None:
+    results = list(
+        AsyncLogLevel(extra={"VERBOSE": 15}).parse_many(["verbose", "x", "10"])
+    )
+    assert [r.level for r in results] == [15, None, 10]
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[1].error == "'x': invalid log level"
+
+
+@click.command()
+@click.option("--log", type=AsyncLoggerLevels(extra={"VERBOSE": 15}))
+async def loggerscmd(log: LoggerLevelPlan | None) -> None:
+    click.echo(repr(log))
+
+
+@pytest.mark.anyio
+async def test_logger_levels() -> None:
+    r = await CliRunner().invoke(loggerscmd, ["--log", "root=info,app.db=verbose"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "LoggerLevelPlan(levels=(('', 20), ('app.db', 15)))\n"
+
+
+@pytest.mark.anyio
+async def test_logger_levels_invalid() -> None:
+    r = await CliRunner().invoke(loggerscmd, ["--log", "app=LOUD"])
+    assert r.exit_code != 0, r.output
+    assert "'LOUD': invalid log level" in r.output
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[tuple[str, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((threading.current_thread().name, record.getMessage()))
+
+
+@pytest.mark.anyio
+async def test_queue_logging() -> None:
+    handler = ListHandler()
+    logger = logging.getLogger("cltest.queue")
+    level = logger.level
+
+    @click.command()
+    @click.option(
+        "-l",
+        "--log-level",
+        type=AsyncLogLevel(),
+        callback=queue_logging("cltest.queue", [handler]),
+    )
+    async def cmd(log_level: int | None) -> None:
+        if log_level is None:
+            assert logger.handlers == []
+            return
+        assert logger.level == log_level
+        assert len(logger.handlers) == 1
+        logger.debug("hidden")
+        logger.info("shown %d", 42)
+
+    try:
+        r = await CliRunner().invoke(cmd, ["-l", "info"])
+        assert r.exit_code == 0, r.output
+        assert logger.handlers == []
+        assert [msg for _, msg in handler.records] == ["shown 42"]
+        assert handler.records[0][0] != threading.current_thread().name
+        r = await CliRunner().invoke(cmd, [])
+        assert r.exit_code == 0, r.output
+        assert logger.handlers == []
+    finally:
+        logger.setLevel(level)
+
+
+@pytest.mark.anyio
+async def test_loglevel_level_info() -> None:
+    @click.command()
+    @click.option("-l", "--log-level", type=AsyncLogLevel(level_info=True))
+    async def infocmd(log_level: LevelInfo) -> None:
+        click.echo(repr(log_level))
+
+    r = await CliRunner().invoke(infocmd, ["-l", "debug"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "LevelInfo('DEBUG', 10)\n"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "args,output",
+    [([], "None\n"), (["-vv"], "15\n"), (["-l", "verbose", "-q"], "20\n")],
+)
+async def test_verbosity_options(args: list[str], output: str) -> None:
+    @click.command()
+    @click.option("-l", "--log-level", type=AsyncLogLevel(extra={"VERBOSE": 15}))
+    @verbosity_options()
+    async def verbositycmd(log_level: int | None) -> None:
+        click.echo(repr(log_level))
+
+    r = await CliRunner().invoke(verbositycmd, args)
+    assert r.exit_code == 0, r.output
+    assert r.output == output
+
+
+def test_loglevel_cache_shared() -> None:
+    atype = AsyncLogLevel(cache_size=8)
+    assert atype.cache is not None
+    assert LogLevel(cache_size=8).cache is atype.cache
+    assert atype.convert("info", None, None) == logging.INFO
+    with pytest.raises(click.BadParameter, match="'x': invalid log level"):
+        atype.convert("x", None, None)
+
+
+@pytest.mark.anyio
+async def test_level_config_file(tmp_path: Path) -> None:
+    @click.command()
+    @click.option("--log-config", type=AsyncLevelConfigFile(cache_dir=False))
+    async def cmd(log_config: LoggerLevelPlan) -> None:
+        click.echo(repr(log_config))
+
+    path = tmp_path / "levels.toml"
+    path.write_text('[levels]\nroot = "info"\n')
+    r = await CliRunner().invoke(cmd, ["--log-config", str(path)])
+    assert r.exit_code == 0, r.output
+    assert r.output == "LoggerLevelPlan(levels=(('', 20),))\n"
+    assert not (tmp_path / "cache").exists()
+
+
+def test_loglevel_completion_limit() -> None:
+    lltype = AsyncLogLevel(
+        extra={f"SUBSYS{i:04d}": 100 + i for i in range(5000)},
+        completion_limit=8,
+        completion_help=True,
+    )
+    items = lltype.shell_complete(None, None, "")  # type: ignore[arg-type]
+    assert [(c.value, c.help) for c in items] == [
+        ("NOTSET", "0"),
+        ("DEBUG", "10"),
+        ("INFO", "20"),
+        ("WARNING", "30"),
+        ("ERROR", "40"),
+        ("CRITICAL", "50"),
+        ("SUBSYS0000", "100"),
+        ("SUBSYS0001", "101"),
+    ]
+    items = AsyncLogLevel().shell_complete(None, None, "")  # type: ignore[arg-type]
+    assert [c.value for c in items] == sorted(c.value for c in items)
+    assert all(c.help is None for c in items)
+
+
+@pytest.mark.anyio
+async def test_loglevel_override() -> None:
+    atype = AsyncLogLevel(extra={"VERBOSE": 15})
+    logger = logging.getLogger("cltest.override")
+    records: list[str] = []
+    handler = logging.Handler()
+    handler.emit = lambda r: records.append(r.getMessage())  # type: ignore
+    logger.addHandler(handler)
+
+    @click.command()
+    @click.option("--task-level", type=atype)
+    async def cmd(task_level: int | None) -> None:
+        async def handle(i: int) -> None:
+            logger.log(15, "request %d", i)
+
+        traced = handle if task_level is None else atype.override(task_level)(handle)
+        for i in range(2):
+            await traced(i)
+        await handle(2)
+
+    try:
+        logger.setLevel(logging.INFO)
+        r = await CliRunner().invoke(cmd, ["--task-level", "verbose"])
+        assert r.exit_code == 0, r.output
+        r = await CliRunner().invoke(cmd, [])
+        assert r.exit_code == 0, r.output
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
+    assert records == ["request 0", "request 1"]
+    with pytest.raises(ValueError, match="'loud': invalid log level"):
+        atype.override("loud")
+
+
+@pytest.mark.anyio
+async def test_loglevel_sampling() -> None:
+    @click.command()
+    @click.option("-l", "--log-level", type=AsyncLogLevel(sampling=True, cache_size=8))
+    async def cmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    r = await CliRunner().invoke(cmd, ["-l", "debug@1/1000"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "SampledLevel(10, base=20, rate='1/1000')\n"
+    r = await CliRunner().invoke(cmd, ["-l", "info"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "20\n"
+    r = await CliRunner().invoke(cmd, ["-l", "debug@2"])
+    assert r.exit_code != 0, r.output
+    assert (
+        "'debug@2': invalid sampled log level; expected LEVEL@N% or LEVEL@N/M"
+        in r.output
+    )
+    r = await CliRunner().invoke(cmd, ["-l", "critical@1%"])
+    assert r.exit_code != 0, r.output
+    assert "'critical@1%': no higher log level to keep in full" in r.output
+    r = await CliRunner().invoke(lvlcmd, ["-l", "debug@1%"])
+    assert r.exit_code != 0, r.output
+    assert "'debug@1%': invalid log level" in r.output
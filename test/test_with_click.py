@@ -6,7 +6,10 @@ import sys
 import click
 from click.testing import CliRunner
 import pytest
-from click_loglevel import LogLevel
+from click_loglevel import LevelInfo, LoggerLevelPlan, LoggerLevels, LogLevel
+from click_loglevel.click import verbosity_options
+from click_loglevel.core import STANDARD_ALIASES
+from click_loglevel.usage import LevelUsage
 
 DATA_DIR = Path(__file__).with_name("data")
 
@@ -220,3 +223,276 @@ def test_invalid_loglevel_extra_nonupper(value: str, script: str) -> None:
     )
     assert r.returncode != 0
     assert f"{value!r}: invalid log level" in r.stderr
+
+
+def test_parse_many() -> None:
+    results = list(LogLevel(extra={"VERBOSE": 15}).parse_many(["verbose", "x", "10"]))
+    assert [r.level for r in results] == [15, None, 10]
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[1].error == "'x': invalid log level"
+
+
+@click.command()
+@click.option("--log", type=LoggerLevels(extra={"VERBOSE": 15}))
+def loggerscmd(log: LoggerLevelPlan | None) -> None:
+    click.echo(repr(log))
+
+
+def test_logger_levels() -> None:
+    r = CliRunner().invoke(loggerscmd, ["--log", "root=info,app.db=verbose"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "LoggerLevelPlan(levels=(('', 20), ('app.db', 15)))\n"
+
+
+def test_logger_levels_invalid() -> None:
+    r = CliRunner().invoke(loggerscmd, ["--log", "app=LOUD"])
+    assert r.exit_code != 0, r.output
+    assert "'LOUD': invalid log level" in r.output
+
+
+def test_loglevel_live() -> None:
+    @click.command()
+    @click.option("-l", "--log-level", type=LogLevel(live=True))
+    def livecmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    r = CliRunner().invoke(livecmd, ["-l", "cltest_click_live"])
+    assert r.exit_code != 0, r.output
+    logging.addLevelName(27, "CLTEST_CLICK_LIVE")
+    r = CliRunner().invoke(livecmd, ["-l", "cltest_click_live"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "27\n"
+
+
+def test_loglevel_help_metavar_limit() -> None:
+    @click.command()
+    @click.option(
+        "-l",
+        "--log-level",
+        type=LogLevel(extra={f"LEVEL{i}": i for i in range(1000)}, metavar_limit=6),
+    )
+    def bigcmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    r = CliRunner().invoke(bigcmd, ["--help"])
+    assert r.exit_code == 0, r.output
+    assert (
+        "--log-level [NOTSET|DEBUG|INFO|WARNING|ERROR|CRITICAL|... 1000 more]"
+        in r.output
+    )
+
+
+@pytest.mark.parametrize(
+    "value,output",
+    [("deb", "10\n"), ("warn", "30\n"), ("FATAL", "50\n")],
+)
+def test_loglevel_abbrev(value: str, output: str) -> None:
+    @click.command()
+    @click.option(
+        "-l", "--log-level", type=LogLevel(abbrev=True, aliases=STANDARD_ALIASES)
+    )
+    def abbrevcmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    r = CliRunner().invoke(abbrevcmd, ["-l", value])
+    assert r.exit_code == 0, r.output
+    assert r.output == output
+
+
+def test_loglevel_abbrev_ambiguous() -> None:
+    @click.command()
+    @click.option("-l", "--log-level", type=LogLevel({"NOTICE": 25}, abbrev=True))
+    def abbrevcmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    r = CliRunner().invoke(abbrevcmd, ["-l", "not"])
+    assert r.exit_code != 0, r.output
+    assert "'not': ambiguous log level; could be NOTICE, NOTSET" in r.output
+
+
+@pytest.mark.parametrize(
+    "args,output",
+    [
+        (["-l", "warn"], "LevelInfo('WARNING', 30)\n"),
+        (["-l", "25"], "LevelInfo('INFO', 25)\n"),
+        ([], "LevelInfo('INFO', 20)\n"),
+    ],
+)
+def test_loglevel_level_info(args: list[str], output: str) -> None:
+    @click.command()
+    @click.option(
+        "-l",
+        "--log-level",
+        type=LogLevel(aliases=STANDARD_ALIASES, level_info=True),
+        default="INFO",
+    )
+    def infocmd(log_level: LevelInfo) -> None:
+        click.echo(repr(log_level))
+
+    r = CliRunner().invoke(infocmd, args)
+    assert r.exit_code == 0, r.output
+    assert r.output == output
+
+
+@click.command()
+@click.option("-l", "--log-level", type=LogLevel(extra={"VERBOSE": 15, "NOTICE": 25}))
+@verbosity_options()
+def verbositycmd(log_level: int | None) -> None:
+    click.echo(repr(log_level))
+
+
+@pytest.mark.parametrize(
+    "args,output",
+    [
+        ([], "None\n"),
+        (["-v"], "25\n"),
+        (["-vv"], "20\n"),
+        (["-v", "--verbose", "-v"], "15\n"),
+        (["-vvvvvvv"], "0\n"),
+        (["-q"], "40\n"),
+        (["-qqqq"], "50\n"),
+        (["-vq"], "None\n"),
+        (["-l", "info", "-v"], "15\n"),
+        (["-v", "--log-level", "notice", "-q"], "25\n"),
+        (["-l", "info", "-qq"], "30\n"),
+        (["-l", "22", "-v"], "20\n"),
+    ],
+)
+def test_verbosity_options(args: list[str], output: str) -> None:
+    r = CliRunner().invoke(verbositycmd, args)
+    assert r.exit_code == 0, r.output
+    assert r.output == output
+
+
+def test_verbosity_options_level_info() -> None:
+    @click.command()
+    @click.option(
+        "--level", type=LogLevel(level_info=True), default="error", show_default=True
+    )
+    @verbosity_options("level", default=logging.INFO, verbose=["--louder"])
+    def cmd(level: LevelInfo) -> None:
+        click.echo(repr(level))
+
+    r = CliRunner().invoke(cmd, ["--louder", "--louder"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "LevelInfo('INFO', 20)\n"
+    r = CliRunner().invoke(cmd, ["--help"])
+    assert "--louder" in r.output
+    assert "-q, --quiet" in r.output
+
+
+def test_verbosity_options_no_param() -> None:
+    @click.command()
+    @verbosity_options()
+    def cmd() -> None:
+        pass
+
+    r = CliRunner().invoke(cmd, ["-v"])
+    assert isinstance(r.exception, ValueError)
+    assert str(r.exception) == "Command has no log level parameter named 'log_level'"
+
+
+def test_loglevel_cache() -> None:
+    lltype = LogLevel(extra={"VERBOSE": 15}, cache_size=16)
+
+    @click.command()
+    @click.option("-l", "--log-level", type=lltype)
+    def cachecmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    assert lltype.cache is not None
+    before = lltype.cache.stats()
+    for _ in range(3):
+        r = CliRunner().invoke(cachecmd, ["-l", "verbose"])
+        assert r.exit_code == 0, r.output
+        assert r.output == "15\n"
+        r = CliRunner().invoke(cachecmd, ["-l", "loud"])
+        assert r.exit_code != 0, r.output
+        assert "'loud': invalid log level" in r.output
+    stats = lltype.cache.stats()
+    # Valid values bypass the cache
+    assert stats.misses - before.misses == 1
+    assert stats.hits - before.hits == 2
+    assert LogLevel(extra={"VERBOSE": 15}, cache_size=16).cache is lltype.cache
+    assert LogLevel(extra={"VERBOSE": 15}).cache is None
+
+
+def test_loglevel_completion_limit() -> None:
+    lltype = LogLevel(
+        extra={f"SUBSYS{i:04d}": 100 + i for i in range(5000)},
+        completion_limit=8,
+        completion_help=True,
+    )
+    items = lltype.shell_complete(None, None, "")  # type: ignore[arg-type]
+    assert [(c.value, c.help) for c in items] == [
+        ("NOTSET", "0"),
+        ("DEBUG", "10"),
+        ("INFO", "20"),
+        ("WARNING", "30"),
+        ("ERROR", "40"),
+        ("CRITICAL", "50"),
+        ("SUBSYS0000", "100"),
+        ("SUBSYS0001", "101"),
+    ]
+    items = LogLevel().shell_complete(None, None, "")  # type: ignore[arg-type]
+    assert [c.value for c in items] == sorted(c.value for c in items)
+    assert all(c.help is None for c in items)
+
+
+def test_loglevel_completion_usage(tmp_path: Path) -> None:
+    usage = LevelUsage("test", tmp_path)
+    extra = {"VERBOSE": 15, "VERY": 17}
+
+    @click.command()
+    @click.option(
+        "-l",
+        "--log-level",
+        type=LogLevel(extra=extra, completion_limit=1, completion_usage=usage),
+        default="VERBOSE",
+    )
+    def cmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    def complete() -> list[str]:
+        ctx = click.Context(cmd)
+        items = cmd.params[0].type.shell_complete(ctx, cmd.params[0], "ve")
+        return [c.value for c in items]
+
+    assert complete() == ["VERBOSE"]
+    for args in [["-l", "very"], ["-l", "Very"], [], ["-l", "15"]]:
+        r = CliRunner().invoke(cmd, args)
+        assert r.exit_code == 0, r.output
+    # Defaults & numbers are not counted:
+    assert usage() == {"VERY": 2}
+    assert complete() == ["VERY"]
+    usage.close()
+    assert LevelUsage("test", tmp_path)() == {"VERY": 2}
+
+
+def test_loglevel_sampling() -> None:
+    @click.command()
+    @click.option("-l", "--log-level", type=LogLevel(sampling=True, cache_size=8))
+    def cmd(log_level: int) -> None:
+        click.echo(repr(log_level))
+
+    r = CliRunner().invoke(cmd, ["-l", "debug@1/1000"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "SampledLevel(10, base=20, rate='1/1000')\n"
+    r = CliRunner().invoke(cmd, ["-l", "info"])
+    assert r.exit_code == 0, r.output
+    assert r.output == "20\n"
+    r = CliRunner().invoke(cmd, ["-l", "debug@2"])
+    assert r.exit_code != 0, r.output
+    assert (
+        "'debug@2': invalid sampled log level; expected LEVEL@N% or LEVEL@N/M"
+        in r.output
+    )
+    r = CliRunner().invoke(cmd, ["-l", "critical@1%"])
+    assert r.exit_code != 0, r.output
+    assert "'critical@1%': no higher log level to keep in full" in r.output
+    r = CliRunner().invoke(cmd, ["-l", "notset@50%"])
+    assert r.exit_code != 0, r.output
+    assert "'notset@50%': NOTSET cannot be sampled" in r.output
+    r = CliRunner().invoke(lvlcmd, ["-l", "debug@1%"])
+    assert r.exit_code != 0, r.output
+    assert "'debug@1%': invalid log level" in r.output